@@ -0,0 +1,355 @@
+# alarms.py
+"""
+AOS / TCA / LOS alarms with lead times, from a heap-based timer queue
+Every (pass event, alarm) pair is one heap entry keyed by its firing time;
+the engine thread sleeps until the top of the heap is due (or until it is
+told that something changed), so thousands of pending alarms cost nothing
+between events. The pass table is refilled window by window ahead of the
+loaded horizon, in a background thread, and only the new entries are pushed.
+
+Callbacks are called in the engine thread (the GUI forwards them through a
+queued Qt signal, like the event core's).
+
+Usage: python alarms.py "ISS (ZARYA)" "NOAA 19" --category stations --lead 300
+"""
+
+import argparse
+import heapq
+import itertools
+import sys
+import threading
+import time
+from config import (MIN_ELEVATION, ALARM_WINDOW_DAYS, ALARM_REFILL_MARGIN_S, ALARM_PASS_OVERLAP_S,
+                    ALARM_AOS_LEAD_S)
+from event_core import AOS, LOS
+from propagation import DAY_S
+from instrumentation import record_error
+
+TCA = 'tca'  # Time of closest approach (maximum elevation)
+
+EVENT_TIMES = {AOS: 'rise_time', TCA: 'max_time', LOS: 'set_time'}
+
+
+class Alarm:
+    """A callback fired `lead_s` seconds before AOS, TCA or LOS of every (selected) pass"""
+
+    def __init__(self, kind, callback, lead_s=0, satellites=None):
+        if kind not in EVENT_TIMES:
+            raise ValueError(f"Unknown alarm kind '{kind}' (use {', '.join(EVENT_TIMES)})")
+        self.kind = kind
+        self.callback = callback
+        self.lead_s = lead_s
+        self.satellites = set(satellites) if satellites is not None else None
+        self.active = True  # Removed alarms stay in the heap until popped
+
+
+def pass_source(predictor, names=None, min_elevation=MIN_ELEVATION):
+    """Pass table source for AlarmEngine: source(start_jd, end_jd) -> {name: [pass, ...]}
+
+    names=None searches every satellite the predictor's tracker tracks at
+    the time of each refill.
+    """
+    ts = predictor.ts
+
+    def source(start_jd, end_jd):
+        start = ts.tt_jd(start_jd)
+        selected = names if names is not None else predictor.tracker.satellite_names()
+        return {name: predictor.find_passes(name, end_jd - start_jd, min_elevation, start)
+                for name in selected}
+    return source
+
+
+class AlarmEngine:
+    """Fires alarms from a pass table kept in a priority queue
+
+    The pass table comes either from `source` (refilled automatically when
+    the clock gets within `refill_margin_s` of the loaded horizon) or from
+    set_passes(). Follows a SimulationClock when given one, forward only:
+    clock_changed() must be called after a jump, a speed change or a pause.
+    Alarms whose time went by during a jump are not fired.
+    """
+
+    def __init__(self, ts, clock=None, source=None, window_days=ALARM_WINDOW_DAYS,
+                 refill_margin_s=ALARM_REFILL_MARGIN_S, overlap_s=ALARM_PASS_OVERLAP_S):
+        self.ts = ts
+        self.clock = clock
+        self.source = source
+        self.window_days = window_days
+        self.refill_margin_s = refill_margin_s
+        self.overlap_s = overlap_s
+        self.alarms = []
+        self.passes = []     # (name, pass) of the loaded table
+        self.table_start = None  # TT Julian dates covered by the loaded table
+        self.horizon = None
+        self._heap = []      # (fire TT Julian date, seq, alarm, name, pass)
+        self._seq = itertools.count()  # Tie-breaker: entries never compare alarms or passes
+        self._cond = threading.Condition()
+        self._generation = 0  # Bumped on resets, so stale refills are dropped
+        self._refilling = False
+        self._running = False
+        self._thread = None
+
+    def now(self):
+        return self.clock.now() if self.clock is not None else self.ts.now()
+
+    def _speed(self):
+        """Speed factor of the clock; clocks without a speed (FixedClock) are stopped"""
+        if self.clock is None or getattr(self.clock, 'live', False):
+            return 1.0
+        if getattr(self.clock, 'paused', False):
+            return 0.0
+        return getattr(self.clock, 'speed', 0.0)
+
+    # Thread-safe API
+
+    def start(self):
+        """Start the engine thread"""
+        if self._thread is not None:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name='alarms', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._thread is None:
+            return
+        with self._cond:
+            self._running = False
+            self._cond.notify()
+        self._thread.join(timeout=2)
+        self._thread = None
+
+    def add_alarm(self, kind, callback, lead_s=0, satellites=None):
+        """Fire callback(event) lead_s seconds before every AOS, TCA or LOS
+
+        event: {'kind', 'satellite', 'time' (of the pass event), 'lead_s', 'pass'}
+        """
+        alarm = Alarm(kind, callback, lead_s, satellites)
+        with self._cond:
+            self.alarms.append(alarm)
+            self._push(self.passes, [alarm], self.now().tt)
+            self._cond.notify()
+        return alarm
+
+    def remove_alarm(self, alarm):
+        with self._cond:
+            alarm.active = False
+            if alarm in self.alarms:
+                self.alarms.remove(alarm)
+
+    def set_passes(self, passes_by_satellite, start_jd, end_jd):
+        """Replace the pass table by {name: [pass, ...]} covering [start_jd, end_jd] (TT)"""
+        with self._cond:
+            self._generation += 1
+            self.passes, self._heap = [], []
+            self.table_start, self.horizon = start_jd, end_jd
+            self._extend(passes_by_satellite, None, self.now().tt)
+            self._cond.notify()
+
+    def clock_changed(self):
+        """The simulation clock jumped, changed speed or was paused/resumed"""
+        with self._cond:
+            jd = self.now().tt
+            if self.horizon is not None and not self.table_start <= jd < self.horizon:
+                # Outside the loaded table: a new one is needed from this time
+                self._generation += 1
+                self.passes, self.table_start, self.horizon = [], None, None
+            self._rebuild(jd)
+            self._cond.notify()
+
+    def clock_advanced(self):
+        """The clock moved forward without a jump (FixedClock.advance): fire the
+        alarms that became due, where clock_changed() would skip them"""
+        with self._cond:
+            self._cond.notify()
+
+    def pending(self):
+        """Number of queued alarm entries"""
+        with self._cond:
+            return len(self._heap)
+
+    def next_alarm(self):
+        """(fire TT Julian date, kind, satellite) of the next alarm, or None"""
+        with self._cond:
+            while self._heap and not self._heap[0][2].active:
+                heapq.heappop(self._heap)
+            if not self._heap:
+                return None
+            fire_jd, seq, alarm, name, p = self._heap[0]
+            return fire_jd, alarm.kind, name
+
+    # Queue maintenance (called with the condition held)
+
+    def _entries(self, passes, alarms, jd):
+        for alarm in alarms:
+            lead = alarm.lead_s / DAY_S
+            key = EVENT_TIMES[alarm.kind]
+            for name, p in passes:
+                if alarm.satellites is not None and name not in alarm.satellites:
+                    continue
+                fire_jd = p[key].tt - lead
+                if fire_jd >= jd:
+                    yield fire_jd, next(self._seq), alarm, name, p
+
+    def _push(self, passes, alarms, jd):
+        entries = list(self._entries(passes, alarms, jd))
+        if len(entries) > len(self._heap):
+            self._heap.extend(entries)
+            heapq.heapify(self._heap)
+        else:
+            for entry in entries:
+                heapq.heappush(self._heap, entry)
+
+    def _extend(self, passes_by_satellite, after_jd, jd):
+        """Add the passes setting after after_jd (the others are already loaded)"""
+        new = [(name, p) for name, passes in passes_by_satellite.items() for p in passes
+               if after_jd is None or p['set_time'].tt > after_jd]
+        # Forget the passes that are over
+        self.passes = [(name, p) for name, p in self.passes if p['set_time'].tt >= jd] + new
+        self._push(new, self.alarms, jd)
+
+    def _rebuild(self, jd):
+        self._heap = list(self._entries(self.passes, self.alarms, jd))
+        heapq.heapify(self._heap)
+
+    def _refill_due(self, jd):
+        if self.source is None or self._refilling:
+            return False
+        return self.horizon is None or jd >= self.horizon - self.refill_margin_s / DAY_S
+
+    def _start_refill(self, jd):
+        """Search the next window in a background thread (pass searches can take seconds)"""
+        after = self.horizon
+        # Start before the horizon so that passes across it come out complete
+        start = (after if after is not None else jd) - self.overlap_s / DAY_S
+        end = max(after if after is not None else jd, jd) + self.window_days
+        self._refilling = True
+        threading.Thread(target=self._refill, args=(self._generation, start, end, after),
+                         name='alarms-refill', daemon=True).start()
+
+    def _refill(self, generation, start_jd, end_jd, after_jd):
+        try:
+            passes = self.source(start_jd, end_jd)
+        except Exception as e:
+            record_error('alarm_refill', e)
+            print(f"✗ Error computing the pass table: {e}")
+            passes = None
+        with self._cond:
+            self._refilling = False
+            if passes is not None and generation == self._generation:
+                if self.table_start is None:
+                    self.table_start = self.now().tt
+                self.horizon = end_jd
+                self._extend(passes, after_jd, self.now().tt)
+            self._cond.notify()
+
+    # Engine thread
+
+    def _run(self):
+        while True:
+            with self._cond:
+                if not self._running:
+                    return
+                jd = self.now().tt
+                due = []
+                while self._heap and self._heap[0][0] <= jd:
+                    entry = heapq.heappop(self._heap)
+                    if entry[2].active:
+                        due.append(entry)
+                if self._refill_due(jd):
+                    self._start_refill(jd)
+                if not due:
+                    # Sleep until the next alarm or refill, or until notified
+                    self._cond.wait(self._delay(jd))
+                    continue
+            for fire_jd, seq, alarm, name, p in due:
+                self._fire(alarm, name, p)
+
+    def _delay(self, jd):
+        """Seconds until the next deadline at the clock's speed (None: none)"""
+        speed = self._speed()
+        if speed <= 0:
+            return None
+        deadlines = []
+        if self._heap:
+            deadlines.append(self._heap[0][0])
+        if self.source is not None and self.horizon is not None and not self._refilling:
+            deadlines.append(self.horizon - self.refill_margin_s / DAY_S)
+        if not deadlines:
+            return None
+        return max((min(deadlines) - jd) * DAY_S / speed, 0.0) + 1e-3
+
+    def _fire(self, alarm, name, p):
+        try:
+            alarm.callback({'kind': alarm.kind, 'satellite': name, 'time': p[EVENT_TIMES[alarm.kind]],
+                            'lead_s': alarm.lead_s, 'pass': p})
+        except Exception as e:
+            record_error('alarm', e)
+            print(f"✗ Error in {alarm.kind} alarm: {e}")
+
+
+def describe(event):
+    """One-line text of an alarm event"""
+    p = event['pass']
+    label = {AOS: 'AOS', TCA: 'TCA', LOS: 'LOS'}[event['kind']]
+    lead = f" in {event['lead_s'] / 60:g} min" if event['lead_s'] else ''
+    return (f"{label}{lead:<10} {event['satellite']:<24} at {event['time'].utc_iso()}  "
+            f"max {p['max_elevation']:.1f}°")
+
+
+def main():
+    from tle_manager import TLEManager
+    from tracker import SatelliteTracker
+    from predictor import PassPredictor
+
+    parser = argparse.ArgumentParser(description='Print AOS/TCA/LOS alarms of upcoming passes')
+    parser.add_argument('satellites', nargs='*', help='Satellite names (default: whole category)')
+    parser.add_argument('--category', default='stations', help='TLE category (default: stations)')
+    parser.add_argument('--lead', type=float, default=ALARM_AOS_LEAD_S,
+                        help=f'Warning this many seconds before AOS (default: {ALARM_AOS_LEAD_S})')
+    parser.add_argument('--min-elevation', type=float, default=MIN_ELEVATION,
+                        help=f'Minimum pass elevation in degrees (default: {MIN_ELEVATION})')
+    args = parser.parse_args()
+
+    tle_mgr = TLEManager()
+    catalog = tle_mgr.load_catalog(args.category)
+    if catalog is None:
+        tle_mgr.get_tles(args.category)
+        catalog = tle_mgr.load_catalog(args.category)
+    if catalog is None:
+        print(f"✗ No TLEs for category '{args.category}'")
+        sys.exit(1)
+
+    tracker = SatelliteTracker()
+    tracker.load_catalog(catalog)
+    tracker.use_history(tle_mgr.history)
+    names = None
+    if args.satellites:
+        names = []
+        for name in args.satellites:
+            index = catalog.find(name)
+            if index is None:
+                print(f"✗ Satellite not found: {name}")
+            else:
+                names.append(catalog.names[index])
+        if not names:
+            sys.exit(1)
+
+    engine = AlarmEngine(tracker.ts, source=pass_source(PassPredictor(tracker), names, args.min_elevation))
+    write = lambda event: print(f"{tracker.ts.now().utc_iso()}  {describe(event)}", flush=True)
+    if args.lead:
+        engine.add_alarm(AOS, write, lead_s=args.lead)
+    for kind in (AOS, TCA, LOS):
+        engine.add_alarm(kind, write)
+
+    engine.start()
+    print(f"✓ Alarms for {len(names) if names else len(catalog)} satellites")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        engine.stop()
+
+
+if __name__ == "__main__":
+    main()
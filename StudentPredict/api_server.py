@@ -0,0 +1,373 @@
+# api_server.py
+"""
+HTTP/WebSocket tracking API for remote clients (needs aiohttp)
+Every client reads positions from one shared PositionFeed: the satellites
+asked for by all clients are propagated together, at most once per
+API_CACHE_S, so the SGP4 work does not grow with the number of clients.
+
+Endpoints (JSON):
+    GET /api/status
+    GET /api/catalog?q=NOAA&limit=20
+    GET /api/positions?names=ISS (ZARYA),NOAA 19
+    GET /api/positions/batch?names=...&start=2026-10-16T12:00:00&duration=3600&step=10
+    GET /api/passes?name=ISS (ZARYA)&days=2
+    GET /api/stream?names=...&interval=1   (WebSocket; send {"names": [...], "interval": 2} to change)
+
+Usage: python api_server.py --category stations --port 8080
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import sys
+import time
+from collections import Counter
+from datetime import datetime, timezone
+import numpy as np
+from config import (API_HOST, API_PORT, API_CACHE_S, API_MIN_INTERVAL_S, API_MAX_BATCH_ROWS,
+                    API_PASS_CACHE_S, MIN_ELEVATION)
+from sim_clock import compute_frames
+from export import iter_ephemeris
+from instrumentation import record_error
+
+
+def _default(value):
+    if isinstance(value, np.ndarray):
+        if value.dtype.kind == 'f':
+            # NaN (failed propagation) is not valid JSON: null instead
+            value = np.where(np.isnan(value), None, value)
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    if hasattr(value, 'utc_iso'):  # Skyfield Time
+        return value.utc_iso()
+    raise TypeError(f"Not JSON serializable: {type(value).__name__}")
+
+
+def to_json(data):
+    return json.dumps(data, default=_default)
+
+
+class PositionFeed:
+    """Current positions shared by every client
+
+    A snapshot younger than max_age_s that covers the requested satellites is
+    reused; otherwise one propagation runs (in a worker thread) for the
+    union of the requested and streamed satellites, and concurrent requests
+    wait for that same computation.
+    """
+
+    def __init__(self, tracker, max_age_s=API_CACHE_S):
+        self.tracker = tracker
+        self.max_age_s = max_age_s
+        self.streamed = Counter()  # Satellites of the open WebSocket streams
+        self.computations = 0
+        self._snapshot = (0.0, None, {}, frozenset())  # (monotonic stamp, time, positions, names)
+        self._pending = None
+
+    def add_stream(self, names):
+        self.streamed.update(names)
+
+    def remove_stream(self, names):
+        self.streamed.subtract(names)
+        self.streamed += Counter()  # Drops names nobody streams any more
+
+    async def get(self, names):
+        """(time, {name: position}) for the given satellite names"""
+        names = frozenset(names)
+        while True:
+            stamp, t, positions, covered = self._snapshot
+            if time.monotonic() - stamp <= self.max_age_s and names <= covered:
+                return t, {name: positions[name] for name in names if name in positions}
+            if self._pending is None:
+                self._pending = asyncio.ensure_future(self._compute(names | set(self.streamed)))
+            await asyncio.shield(self._pending)
+
+    async def _compute(self, names):
+        try:
+            loop = asyncio.get_running_loop()
+            self._snapshot = await loop.run_in_executor(None, self._propagate, sorted(names))
+        finally:
+            self._pending = None
+
+    def _propagate(self, names):
+        t = self.tracker.now()
+        found, satrecs = [], []
+        for name in names:
+            satellite = self.tracker.satellite_for_time(name, t)
+            if satellite is not None:
+                found.append(name)
+                satrecs.append(satellite.model)
+        positions = {}
+        if found:
+            positions = compute_frames(self.tracker.ts, found, satrecs, t.tt, 1, 1).positions(t.tt, t.utc_iso())
+        self.computations += 1
+        # Unknown names count as covered, so they do not force a new computation each time
+        return time.monotonic(), t, positions, frozenset(names)
+
+
+class TrackingAPI:
+    """aiohttp request handlers around a tracker (and a predictor for passes)"""
+
+    def __init__(self, tracker, predictor=None, feed=None):
+        try:
+            from aiohttp import web
+        except ImportError:
+            raise ImportError("The API server needs aiohttp (pip install aiohttp)") from None
+        self.web = web
+        self.tracker = tracker
+        self.predictor = predictor
+        self.feed = feed or PositionFeed(tracker)
+        self.clients = 0
+        self._passes = {}  # (name, days, min_elevation) -> (monotonic stamp, passes)
+
+    def make_app(self):
+        web = self.web
+        app = web.Application()
+        app.add_routes([
+            web.get('/api/status', self.status),
+            web.get('/api/catalog', self.catalog),
+            web.get('/api/positions', self.positions),
+            web.get('/api/positions/batch', self.batch_positions),
+            web.get('/api/passes', self.passes),
+            web.get('/api/stream', self.stream),
+        ])
+        return app
+
+    def _json(self, data, status=200):
+        return self.web.json_response(data, status=status, dumps=to_json)
+
+    def _error(self, message, status=400):
+        return self._json({'error': message}, status)
+
+    @staticmethod
+    def _number(request, name, default):
+        """Finite float query parameter (ValueError with a message for the client)"""
+        value = request.query.get(name)
+        if value is None:
+            return default
+        try:
+            number = float(value)
+        except ValueError:
+            raise ValueError(f'{name} must be a number, not {value!r}') from None
+        if not math.isfinite(number):
+            raise ValueError(f'{name} must be finite')
+        return number
+
+    def resolve(self, names):
+        """Exact tracked names for the requested ones (exact, or contained in the
+        name, like catalog.find); returns (found, unknown)"""
+        known = set(self.tracker.satellite_names())
+        found, unknown = [], []
+        for name in names:
+            name = name.strip()
+            if not name:
+                continue
+            if name in known:
+                found.append(name)
+                continue
+            catalog = self.tracker.catalog
+            index = catalog.find(name) if catalog is not None else None
+            if index is not None:
+                found.append(catalog.names[index])
+            else:
+                unknown.append(name)
+        return list(dict.fromkeys(found)), unknown
+
+    def _names_param(self, request):
+        return self.resolve(request.query.get('names', '').split(','))
+
+    async def status(self, request):
+        return self._json({
+            'satellites': len(self.tracker.satellite_names()),
+            'clients': self.clients,
+            'streamed_satellites': len(self.feed.streamed),
+            'computations': self.feed.computations,
+            'time': self.tracker.now(),
+        })
+
+    async def catalog(self, request):
+        query = request.query.get('q', '').upper()
+        try:
+            limit = int(request.query.get('limit', 50))
+        except ValueError:
+            limit = 0
+        if limit < 1:
+            return self._error('limit must be a positive integer')
+        catalog = self.tracker.catalog
+        results = []
+        for name in self.tracker.satellite_names():
+            if query not in name.upper():
+                continue
+            index = catalog.index_of(name) if catalog is not None else None
+            norad_id = int(catalog.records['norad_id'][index]) if index is not None else None
+            results.append({'name': name, 'norad_id': norad_id})
+            if len(results) >= limit:
+                break
+        return self._json({'results': results})
+
+    async def positions(self, request):
+        names, unknown = self._names_param(request)
+        if not names:
+            return self._error('No known satellite in names', 404)
+        t, positions = await self.feed.get(names)
+        return self._json({'time': t, 'positions': positions, 'unknown': unknown})
+
+    async def batch_positions(self, request):
+        names, unknown = self._names_param(request)
+        if not names:
+            return self._error('No known satellite in names', 404)
+        try:
+            duration = self._number(request, 'duration', 3600)
+            step = self._number(request, 'step', 60)
+            start = self._parse_time(request.query.get('start'))
+        except ValueError as e:
+            return self._error(str(e))
+        if step <= 0 or duration < 0:
+            return self._error('step must be positive and duration not negative')
+        rows = (int(duration // step) + 1) * len(names)
+        if rows > API_MAX_BATCH_ROWS:
+            return self._error(f'{rows} rows requested, at most {API_MAX_BATCH_ROWS}')
+
+        def compute():
+            chunks = list(iter_ephemeris(self.tracker, names, start, duration, step))
+            columns = {key: np.concatenate([chunk[key] for chunk in chunks]) for key in chunks[0]}
+            columns['time'] = np.char.add(np.datetime_as_string(columns['time'], unit='ms'), 'Z')
+            return columns
+
+        columns = await asyncio.get_running_loop().run_in_executor(None, compute)
+        return self._json({'columns': columns, 'unknown': unknown})
+
+    def _parse_time(self, value):
+        if not value:
+            return self.tracker.now()
+        moment = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        if moment.tzinfo is None:
+            moment = moment.replace(tzinfo=timezone.utc)
+        return self.tracker.ts.from_datetime(moment)
+
+    async def passes(self, request):
+        if self.predictor is None:
+            return self._error('Pass prediction not available', 503)
+        names, unknown = self.resolve([request.query.get('name', '')])
+        if not names:
+            return self._error('Unknown satellite', 404)
+        try:
+            days = min(self._number(request, 'days', 1), 7)
+            min_elevation = self._number(request, 'min_elevation', MIN_ELEVATION)
+        except ValueError as e:
+            return self._error(str(e))
+        if days <= 0 or not -90 <= min_elevation <= 90:
+            return self._error('days must be positive and min_elevation between -90 and 90')
+
+        # Pass tables change slowly: shared by every client for a few minutes
+        key = (names[0], days, min_elevation)
+        cached = self._passes.get(key)
+        if cached is None or time.monotonic() - cached[0] > API_PASS_CACHE_S:
+            passes = await asyncio.get_running_loop().run_in_executor(
+                None, lambda: self.predictor.find_visible_passes(names, days, min_elevation)[names[0]])
+            cached = self._passes[key] = (time.monotonic(), passes)
+        return self._json({'satellite': names[0], 'passes': cached[1]})
+
+    async def stream(self, request):
+        """WebSocket: positions pushed every `interval` seconds"""
+        web = self.web
+        try:
+            interval = self._interval(request.query.get('interval', 1))
+        except ValueError as e:
+            return self._error(str(e))  # Plain HTTP error: the upgrade has not happened yet
+        ws = web.WebSocketResponse(heartbeat=30)
+        await ws.prepare(request)
+
+        names, unknown = self._names_param(request)
+        state = {'names': names, 'interval': interval}
+        self.feed.add_stream(names)
+        self.clients += 1
+        sender = asyncio.ensure_future(self._send_positions(ws, state))
+        try:
+            async for message in ws:
+                if message.type != web.WSMsgType.TEXT:
+                    continue
+                try:
+                    update = json.loads(message.data)
+                    interval = self._interval(update.get('interval', state['interval']))
+                    if 'names' in update and not (isinstance(update['names'], list)
+                                                  and all(isinstance(n, str) for n in update['names'])):
+                        raise ValueError('names must be a list of strings')
+                except (ValueError, AttributeError):
+                    await ws.send_str(to_json({'error': 'Expected {"names": [...], "interval": seconds}'}))
+                    continue
+                if 'names' in update:
+                    names, unknown = self.resolve(update['names'])
+                    self.feed.remove_stream(state['names'])
+                    self.feed.add_stream(names)
+                    state['names'] = names
+                    if unknown:
+                        await ws.send_str(to_json({'unknown': unknown}))
+                state['interval'] = interval
+        finally:
+            sender.cancel()
+            self.feed.remove_stream(state['names'])
+            self.clients -= 1
+        return ws
+
+    def _interval(self, value):
+        """Stream interval in seconds, at least API_MIN_INTERVAL_S (ValueError if not a finite number)"""
+        try:
+            interval = float(value)
+        except (TypeError, ValueError):
+            raise ValueError(f'interval must be a number of seconds, not {value!r}') from None
+        if not math.isfinite(interval):
+            raise ValueError('interval must be finite')
+        return max(interval, API_MIN_INTERVAL_S)
+
+    async def _send_positions(self, ws, state):
+        try:
+            while not ws.closed:
+                if state['names']:
+                    t, positions = await self.feed.get(state['names'])
+                    await ws.send_str(to_json({'time': t, 'positions': positions}))
+                await asyncio.sleep(state['interval'])
+        except (ConnectionResetError, asyncio.CancelledError):
+            pass
+        except Exception as e:
+            record_error('api_stream', e)
+            print(f"✗ Error in position stream: {e}")
+
+
+def main():
+    from tle_manager import TLEManager
+    from tracker import SatelliteTracker
+    from predictor import PassPredictor
+
+    parser = argparse.ArgumentParser(description='Serve positions and passes over HTTP/WebSocket')
+    parser.add_argument('--category', default='stations', help='TLE category (default: stations)')
+    parser.add_argument('--host', default=API_HOST, help=f'Listen address (default: {API_HOST})')
+    parser.add_argument('--port', type=int, default=API_PORT, help=f'Port (default: {API_PORT})')
+    args = parser.parse_args()
+
+    tle_mgr = TLEManager()
+    catalog = tle_mgr.load_catalog(args.category)
+    if catalog is None:
+        tle_mgr.get_tles(args.category)
+        catalog = tle_mgr.load_catalog(args.category)
+    if catalog is None:
+        print(f"✗ No TLEs for category '{args.category}'")
+        sys.exit(1)
+
+    tracker = SatelliteTracker()
+    tracker.load_catalog(catalog)
+    tracker.use_history(tle_mgr.history)
+
+    try:
+        api = TrackingAPI(tracker, PassPredictor(tracker))
+    except ImportError as e:
+        print(f"✗ {e}")
+        sys.exit(1)
+    print(f"✓ Serving {len(catalog)} satellites on http://{args.host}:{args.port}/api/status")
+    api.web.run_app(api.make_app(), host=args.host, port=args.port, print=None)
+
+
+if __name__ == "__main__":
+    main()
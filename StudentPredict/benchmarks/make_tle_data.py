@@ -0,0 +1,83 @@
+# benchmarks/make_tle_data.py
+"""
+Generates the fixed TLE files used by the benchmarks (benchmarks/data/)
+The catalog is synthetic but deterministic: same seed, same file.
+Mix of orbits close to CelesTrak's 'active' group (mostly LEO, some MEO, HEO and GEO).
+
+Usage: python benchmarks/make_tle_data.py
+"""
+
+import os
+import random
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+
+ISS_TLE = """ISS (ZARYA)
+1 25544U 98067A   26288.50000000  .00016717  00000-0  30118-3 0  9999
+2 25544  51.6416 247.4627 0006703 130.5360 325.0288 15.50125391563533"""
+
+
+def checksum(line):
+    """Append the modulo-10 checksum to the first 68 characters of a TLE line"""
+    total = sum(int(c) if c.isdigit() else (1 if c == '-' else 0) for c in line[:68])
+    return line[:68] + str(total % 10)
+
+
+def implied_decimal(value):
+    """Format a value in the TLE implied-decimal notation (' 12345-3')"""
+    if value == 0:
+        return ' 00000-0'
+    sign = '-' if value < 0 else ' '
+    value = abs(value)
+    exponent = 0
+    while value >= 1:
+        value /= 10
+        exponent += 1
+    while value < 0.1:
+        value *= 10
+        exponent -= 1
+    mantissa = int(round(value * 1e5))
+    if mantissa >= 100000:
+        mantissa //= 10
+        exponent += 1
+    return f"{sign}{mantissa:05d}{'-' if exponent < 0 else '+'}{abs(exponent)}"
+
+
+def make_tle(rng, index):
+    norad_id = 60000 + index
+    kind = rng.random()
+    if kind < 0.80:    # LEO
+        mean_motion, ecc, inc = rng.uniform(13.5, 16.2), rng.uniform(0, 0.02), rng.uniform(0, 105)
+    elif kind < 0.90:  # MEO (navigation)
+        mean_motion, ecc, inc = rng.uniform(1.8, 2.2), rng.uniform(0, 0.02), rng.uniform(50, 65)
+    elif kind < 0.95:  # HEO (Molniya)
+        mean_motion, ecc, inc = rng.uniform(2.0, 3.0), rng.uniform(0.6, 0.74), 63.4
+    else:              # GEO
+        mean_motion, ecc, inc = rng.uniform(1.0025, 1.0030), rng.uniform(0, 0.001), rng.uniform(0, 5)
+
+    ndot = f"{rng.uniform(-1e-4, 1e-4):.8f}".replace('0.', '.', 1).rjust(10)
+    line1 = (f"1 {norad_id:05d}U 24{index % 1000:03d}A   26{rng.uniform(280, 292):012.8f} "
+             f"{ndot} {implied_decimal(0)} {implied_decimal(rng.uniform(1e-5, 5e-4))} 0  999")
+    line2 = (f"2 {norad_id:05d} {inc:8.4f} {rng.uniform(0, 360):8.4f} {int(ecc * 1e7):07d} "
+             f"{rng.uniform(0, 360):8.4f} {rng.uniform(0, 360):8.4f} {mean_motion:11.8f}"
+             f"{rng.randint(0, 99999):5d}")
+    return f"SAT-{norad_id}\n{checksum(line1.ljust(68))}\n{checksum(line2.ljust(68))}"
+
+
+def write_catalog(filename, count, seed):
+    rng = random.Random(seed)
+    tles = [ISS_TLE] + [make_tle(rng, i) for i in range(count - 1)]
+    with open(os.path.join(DATA_DIR, filename), 'w', newline='\n') as f:
+        f.write('\n'.join(tles) + '\n')
+    print(f"✓ {filename}: {count} satellites")
+
+
+def main():
+    if not os.path.exists(DATA_DIR):
+        os.makedirs(DATA_DIR)
+    write_catalog('stations.tle', 12, seed=1)
+    write_catalog('active.tle', 10000, seed=2)
+
+
+if __name__ == "__main__":
+    main()
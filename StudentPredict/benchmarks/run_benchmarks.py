@@ -0,0 +1,219 @@
+# benchmarks/run_benchmarks.py
+"""
+Propagation and pass-search benchmarks
+Runs offline on the fixed TLE files in benchmarks/data/ at a fixed time,
+and stores results as JSON so runs can be compared between commits.
+
+Usage:
+    python benchmarks/run_benchmarks.py                    # run all, save results/<commit>.json
+    python benchmarks/run_benchmarks.py -k find_passes     # only matching benchmarks
+    python benchmarks/run_benchmarks.py --compare OLD.json NEW.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_DIR = os.path.dirname(BENCH_DIR)
+DATA_DIR = os.path.join(BENCH_DIR, 'data')
+RESULTS_DIR = os.path.join(BENCH_DIR, 'results')
+sys.path.insert(0, PROJECT_DIR)
+
+# All benchmarks run at this instant (close to the epochs of the fixed TLEs)
+BENCH_TIME = (2026, 10, 16, 12, 0, 0)
+REGRESSION_THRESHOLD = 1.10  # Flag benchmarks more than 10% slower
+
+
+def read_tle(filename):
+    with open(os.path.join(DATA_DIR, filename)) as f:
+        return f.read()
+
+
+def measure(func, repeat, min_time):
+    """Best/mean seconds per call, calibrating the number of calls per round"""
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time or number >= 1000:
+            break
+        number *= 10 if elapsed < min_time / 10 else 2
+
+    rounds = [elapsed / number]
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        rounds.append((time.perf_counter() - start) / number)
+
+    return {
+        'min': min(rounds),
+        'mean': statistics.mean(rounds),
+        'stdev': statistics.stdev(rounds) if len(rounds) > 1 else 0.0,
+        'rounds': len(rounds),
+        'number': number,
+    }
+
+
+def make_tracker(catalog, count):
+    from tracker import SatelliteTracker
+    from sim_clock import FixedClock
+    tracker = SatelliteTracker()
+    # Fixed time: default-time calls give the same results on every run
+    tracker.clock = FixedClock(tracker.ts.utc(*BENCH_TIME))
+    tracker.load_catalog(catalog.subset(slice(0, count)))
+    # Materialize up front so benchmarks measure propagation, not model setup
+    for name in tracker.catalog.names:
+        tracker.get_satellite(name)
+    return tracker
+
+
+def ready(func):
+    """Setup for benchmarks that need none"""
+    return lambda: func
+
+
+def collect_benchmarks():
+    """(name, setup) pairs; setup() returns the function to time, so filtered
+    out benchmarks never pay for their setup"""
+    from catalog import TLECatalog
+    from tle_manager import TLEManager
+    from predictor import PassPredictor
+    from satellite_db import get_satellite_info
+
+    active_text = read_tle('active.tle')
+    catalog = TLECatalog.from_tle_text(active_text)
+    tracker = make_tracker(catalog, 1)
+    t = tracker.ts.utc(*BENCH_TIME)
+    iss = catalog.names[0]
+
+    yield 'get_position', ready(lambda: tracker.get_position(iss, t))
+
+    for count in (10, 100, 1000, 10000):
+        def setup(count=count):
+            many = make_tracker(catalog, count)
+            return lambda: many.get_all_positions(t)
+        yield f'get_all_positions[{count}]', setup
+
+    predictor = PassPredictor(tracker)
+    for days in (1, 3, 7):
+        yield f'find_passes[{days}d]', ready(lambda days=days: predictor.find_passes(iss, days, start_time=t))
+
+    from sim_clock import FixedClock
+    # parse_tle only, no data folder needed; epoch ages checked at the benchmark time
+    manager = TLEManager.parser(FixedClock(t))
+    yield 'parse_tle[active]', ready(lambda: manager.parse_tle(active_text))
+    yield 'TLECatalog.from_tle_text[active]', ready(lambda: TLECatalog.from_tle_text(active_text))
+
+    lookups = ['ISS (ZARYA)', 'NOAA 19 [+]', 'METEOR-M2 2', 'SAT-60042']
+    yield 'get_satellite_info', ready(lambda: [get_satellite_info(name) for name in lookups])
+
+    yield 'update_satellites[agg]', lambda: setup_update_satellites(make_tracker(catalog, 100), t)
+
+
+_qt_app = None
+
+
+def setup_update_satellites(tracker, t):
+    """One full map render on the offscreen Qt platform (Agg rasterizer)"""
+    global _qt_app
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    from PyQt6.QtWidgets import QApplication
+    _qt_app = QApplication.instance() or QApplication(sys.argv)
+    from gui_app import InteractiveEarthMapWidget
+
+    earth_map = InteractiveEarthMapWidget(tracker=tracker)
+    earth_map.init_map()
+    positions = tracker.get_all_positions(t)
+    selected = next(iter(positions))
+    return lambda: earth_map.update_satellites(positions, selected)
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=PROJECT_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def run(args):
+    results = {
+        'commit': git_commit(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'benchmarks': {},
+    }
+
+    print("=" * 60)
+    print(f"BENCHMARKS @ {results['commit']}")
+    print("=" * 60)
+
+    for name, setup in collect_benchmarks():
+        if args.k and args.k not in name:
+            continue
+        try:
+            stats = measure(setup(), args.repeat, args.min_time)
+        except ImportError as e:
+            print(f"   {name:<36} skipped ({e})")
+            continue
+        except Exception as e:
+            # One broken benchmark must not abort the whole run
+            print(f"✗  {name:<35} failed ({type(e).__name__}: {e})")
+            continue
+        results['benchmarks'][name] = stats
+        print(f"   {name:<36} {stats['min'] * 1e3:10.3f} ms  (±{stats['stdev'] * 1e3:.3f}, "
+              f"{stats['rounds']}x{stats['number']})")
+
+    output = args.output or os.path.join(RESULTS_DIR, f"{results['commit']}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"\n✓ Results saved to {output}")
+
+
+def compare(old_file, new_file):
+    with open(old_file) as f:
+        old = json.load(f)
+    with open(new_file) as f:
+        new = json.load(f)
+
+    print(f"{'benchmark':<36} {old['commit']:>12} {new['commit']:>12}   ratio")
+    print("-" * 72)
+    regressions = 0
+    for name, stats in new['benchmarks'].items():
+        if name not in old['benchmarks']:
+            continue
+        before = old['benchmarks'][name]['min']
+        ratio = stats['min'] / before
+        flag = '  ✗ slower' if ratio > REGRESSION_THRESHOLD else ''
+        regressions += bool(flag)
+        print(f"{name:<36} {before * 1e3:10.3f}ms {stats['min'] * 1e3:10.3f}ms  {ratio:6.2f}x{flag}")
+    return 1 if regressions else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Propagation and pass-search benchmarks')
+    parser.add_argument('-k', help='Only run benchmarks whose name contains this')
+    parser.add_argument('--repeat', type=int, default=5, help='Timed rounds per benchmark')
+    parser.add_argument('--min-time', type=float, default=0.2, help='Minimum seconds per round')
+    parser.add_argument('--output', help='JSON file (default: benchmarks/results/<commit>.json)')
+    parser.add_argument('--compare', nargs=2, metavar=('OLD', 'NEW'), help='Compare two result files')
+    args = parser.parse_args()
+
+    if args.compare:
+        sys.exit(compare(*args.compare))
+    run(args)
+
+
+if __name__ == "__main__":
+    main()
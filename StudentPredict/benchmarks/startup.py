@@ -0,0 +1,111 @@
+# benchmarks/startup.py
+"""
+Startup benchmark - time to first position and time to first map frame
+Each measurement runs in a fresh interpreter so import costs are included.
+
+Usage: python benchmarks/startup.py [--tle benchmarks/data/stations.tle] [--runs 3] [--json]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def child_first_position(tle_file):
+    """Import, load the catalog and compute one position"""
+    marks = {}
+    from tracker import SatelliteTracker
+    from catalog import TLECatalog
+    marks['imports'] = time.time()
+
+    with open(tle_file) as f:
+        catalog = TLECatalog.from_tle_text(f.read())
+    tracker = SatelliteTracker()
+    tracker.load_catalog(catalog)
+    marks['catalog'] = time.time()
+
+    name = catalog.names[0]
+    position = tracker.get_position(name)
+    marks['first_position'] = time.time()
+    return marks, tracker, {name: position}
+
+
+def child_first_map_frame(tle_file):
+    """Same as above, then render the map widget once (offscreen Qt)"""
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    from PyQt6.QtWidgets import QApplication
+    app = QApplication(sys.argv)
+
+    marks, tracker, positions = child_first_position(tle_file)
+    from gui_app import InteractiveEarthMapWidget
+    marks['gui_imports'] = time.time()
+
+    earth_map = InteractiveEarthMapWidget(tracker=tracker)
+    earth_map.init_map()
+    earth_map.update_satellites(positions, next(iter(positions)))
+    marks['first_map_frame'] = time.time()
+    app.quit()
+    return marks
+
+
+def run_child(mode, tle_file):
+    """Run one measurement in a new interpreter, times relative to process launch"""
+    launched = time.time()
+    result = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), '--child', mode, '--tle', tle_file],
+        cwd=PROJECT_DIR, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr else mode)
+    marks = json.loads(result.stdout.strip().splitlines()[-1])
+    return {name: mark - launched for name, mark in marks.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Startup benchmark')
+    parser.add_argument('--tle', default=os.path.join('benchmarks', 'data', 'stations.tle'))
+    parser.add_argument('--runs', type=int, default=3)
+    parser.add_argument('--json', action='store_true', help='Print results as JSON')
+    parser.add_argument('--child', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        sys.path.insert(0, PROJECT_DIR)
+        if args.child == 'position':
+            marks = child_first_position(args.tle)[0]
+        else:
+            marks = child_first_map_frame(args.tle)
+        print(json.dumps(marks))
+        return
+
+    results = {}
+    for mode in ['position', 'map']:
+        try:
+            runs = [run_child(mode, args.tle) for _ in range(args.runs)]
+        except RuntimeError as e:
+            print(f"✗ {mode}: {e}")
+            continue
+        # Best of N: the least disturbed run
+        results[mode] = {name: min(r[name] for r in runs) for name in runs[0]}
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print("=" * 60)
+    print("STARTUP BENCHMARK (seconds since process launch, best of "
+          f"{args.runs})")
+    print("=" * 60)
+    for mode, marks in results.items():
+        print(f"\n{mode}:")
+        for name, seconds in marks.items():
+            print(f"   {name:<16} {seconds:8.3f} s")
+
+
+if __name__ == "__main__":
+    main()
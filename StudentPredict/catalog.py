@@ -0,0 +1,490 @@
+# catalog.py
+"""
+Compact array-backed TLE catalog
+Parsed orbital elements live in one NumPy structured array, EarthSatellite
+objects are only built when a satellite is actually used. Overlapping TLE
+groups merge into a UnifiedCatalog (one record per NORAD ID), and each group
+becomes a CatalogView over its shared records.
+"""
+
+import os
+import struct
+import sys
+import numpy as np
+from sgp4.api import Satrec, WGS72
+
+# One fixed-width record per satellite (little-endian, no padding)
+TLE_DTYPE = np.dtype([
+    ('name', 'S24'),
+    ('norad_id', '<u4'),
+    ('classification', 'S1'),
+    ('intl_designator', 'S8'),
+    ('epoch_jd', '<f8'),        # Julian date of epoch, whole part (x.5)
+    ('epoch_fraction', '<f8'),  # Fraction of day
+    ('ndot', '<f8'),            # First derivative of mean motion / 2 (rev/day²)
+    ('nddot', '<f8'),           # Second derivative of mean motion / 6 (rev/day³)
+    ('bstar', '<f8'),           # Drag term (1/earth radii)
+    ('element_number', '<u2'),
+    ('inclination', '<f8'),     # degrees
+    ('raan', '<f8'),            # degrees
+    ('eccentricity', '<f8'),
+    ('arg_perigee', '<f8'),     # degrees
+    ('mean_anomaly', '<f8'),    # degrees
+    ('mean_motion', '<f8'),     # rev/day
+    ('rev_number', '<u4'),
+])
+
+TLE_LINE_LENGTH = 69
+XPDOTP = 1440.0 / (2.0 * np.pi)  # rev/day -> rad/min
+SGP4_EPOCH_JD = 2433281.5        # 1949 December 31 00:00 UT
+ALPHA5_LETTERS = 'ABCDEFGHJKLMNPQRSTUVWXYZ'
+
+# Binary snapshot: 64-byte header followed by `count` TLE_DTYPE records.
+# Bump SNAPSHOT_VERSION whenever TLE_DTYPE changes.
+SNAPSHOT_MAGIC = b'SGSTLE\x00\x00'
+SNAPSHOT_VERSION = 1
+SNAPSHOT_HEADER = struct.Struct('<8sHHIQqd24x')  # magic, version, record size, count,
+SNAPSHOT_HEADER_SIZE = SNAPSHOT_HEADER.size      # source size, source mtime (ns), created
+
+# Cached validation flags: 32-byte header followed by `count` uint8 flags
+FLAGS_MAGIC = b'SGSFLG\x00\x00'
+FLAGS_HEADER = struct.Struct('<8sIQqd')  # magic, count, source size, source mtime (ns), checked at (JD)
+
+
+def _column(chars, start, stop):
+    """Extract a fixed-width column from an (N, 69) array of characters"""
+    width = stop - start
+    return np.ascontiguousarray(chars[:, start:stop]).view(f'S{width}').ravel()
+
+
+def _implied_decimal(chars, start):
+    """Parse TLE fields like ' 12345-3' (meaning 0.12345e-3)"""
+    mantissa = _column(chars, start, start + 6).astype(np.int64)
+    exponent = _column(chars, start + 6, start + 8).astype(np.int64)
+    return mantissa * 1e-5 * 10.0 ** exponent
+
+
+def _decode_satnum(field):
+    """Decode a catalog number, including the Alpha-5 format (e.g. 'A0001')"""
+    field = field.decode('ascii').strip()
+    if field and field[0].isalpha():
+        return (ALPHA5_LETTERS.index(field[0].upper()) + 10) * 10000 + int(field[1:])
+    return int(field)
+
+
+def _satnums(field):
+    try:
+        return field.astype(np.uint32)
+    except ValueError:
+        return np.array([_decode_satnum(f) for f in field], dtype=np.uint32)
+
+
+def epoch_to_jd(two_digit_year, day_of_year):
+    """Convert TLE epochs to Julian dates (whole, fraction), vectorized"""
+    year = np.where(two_digit_year < 57, two_digit_year + 2000, two_digit_year + 1900)
+    # Julian date of January 0, 00:00 UT of each year (same formula as sgp4.api.jday)
+    jan0 = 367.0 * year - np.floor(7 * year * 0.25) + np.floor(275 / 9.0) + 1721013.5
+    whole_days = np.floor(day_of_year)
+    return jan0 + whole_days, day_of_year - whole_days
+
+
+def tle_line_arrays(tle_data):
+    """Split TLE text into names and two (N, 69) arrays of line characters"""
+    lines = tle_data.strip().split('\n')
+    count = len(lines) // 3
+    names = [line.strip().encode('utf-8')[:24] for line in lines[0:3 * count:3]]
+    line1 = [line.strip().ljust(TLE_LINE_LENGTH) for line in lines[1:3 * count:3]]
+    line2 = [line.strip().ljust(TLE_LINE_LENGTH) for line in lines[2:3 * count:3]]
+
+    chars1 = np.array(line1, dtype=f'S{TLE_LINE_LENGTH}').view('S1').reshape(count, TLE_LINE_LENGTH)
+    chars2 = np.array(line2, dtype=f'S{TLE_LINE_LENGTH}').view('S1').reshape(count, TLE_LINE_LENGTH)
+    return names, chars1, chars2
+
+
+def parse_tle_records(tle_data):
+    """Parse TLE text (name + 2 lines per satellite) into a structured array"""
+    return records_from_arrays(*tle_line_arrays(tle_data))
+
+
+def records_from_arrays(names, chars1, chars2):
+    """Parse the output of tle_line_arrays() into a structured array"""
+    count = len(names)
+    records = np.zeros(count, dtype=TLE_DTYPE)
+    if count == 0:
+        return records
+
+    records['name'] = names
+    records['norad_id'] = _satnums(_column(chars1, 2, 7))
+    records['classification'] = _column(chars1, 7, 8)
+    records['intl_designator'] = np.char.strip(_column(chars1, 9, 17))
+
+    year = _column(chars1, 18, 20).astype(np.int64)
+    day = _column(chars1, 20, 32).astype(np.float64)
+    records['epoch_jd'], records['epoch_fraction'] = epoch_to_jd(year, day)
+
+    records['ndot'] = _column(chars1, 33, 43).astype(np.float64)
+    records['nddot'] = _implied_decimal(chars1, 44)
+    records['bstar'] = _implied_decimal(chars1, 53)
+    records['element_number'] = np.char.strip(_column(chars1, 64, 68)).astype(np.uint16)
+
+    records['inclination'] = _column(chars2, 8, 16).astype(np.float64)
+    records['raan'] = _column(chars2, 17, 25).astype(np.float64)
+    records['eccentricity'] = _column(chars2, 26, 33).astype(np.int64) * 1e-7
+    records['arg_perigee'] = _column(chars2, 34, 42).astype(np.float64)
+    records['mean_anomaly'] = _column(chars2, 43, 51).astype(np.float64)
+    records['mean_motion'] = _column(chars2, 52, 63).astype(np.float64)
+    records['rev_number'] = np.char.strip(_column(chars2, 63, 68)).astype(np.uint32)
+
+    return records
+
+
+def _source_stamp(source_path):
+    """Size and mtime of the text file a snapshot was built from"""
+    if source_path is None or not os.path.exists(source_path):
+        return 0, 0
+    stat = os.stat(source_path)
+    return stat.st_size, stat.st_mtime_ns
+
+
+def save_snapshot(records, path, source_path=None):
+    """Write parsed records to a binary snapshot file"""
+    import time
+    size, mtime = _source_stamp(source_path)
+    header = SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, TLE_DTYPE.itemsize,
+                                  len(records), size, mtime, time.time())
+
+    # Write to a temporary file first so readers never see a half-written snapshot
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(header)
+        f.write(np.ascontiguousarray(records, dtype=TLE_DTYPE).tobytes())
+    os.replace(tmp_path, path)
+
+
+def load_snapshot(path, source_path=None):
+    """Memory-map a binary snapshot, or return None if missing, invalid or stale"""
+    if not os.path.exists(path):
+        return None
+
+    with open(path, 'rb') as f:
+        header = f.read(SNAPSHOT_HEADER_SIZE)
+    if len(header) < SNAPSHOT_HEADER_SIZE:
+        return None
+
+    magic, version, record_size, count, size, mtime, created = SNAPSHOT_HEADER.unpack(header)
+    if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION or record_size != TLE_DTYPE.itemsize:
+        return None
+    if source_path is not None and (size, mtime) != _source_stamp(source_path):
+        return None
+    if os.path.getsize(path) != SNAPSHOT_HEADER_SIZE + count * record_size:
+        return None
+
+    if count == 0:
+        return np.zeros(0, dtype=TLE_DTYPE)
+    return np.memmap(path, dtype=TLE_DTYPE, mode='r', offset=SNAPSHOT_HEADER_SIZE, shape=(count,))
+
+
+def save_flags(flags, jd, path, source_path=None):
+    """Write validation flags computed at Julian date jd, next to a snapshot"""
+    size, mtime = _source_stamp(source_path)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(FLAGS_HEADER.pack(FLAGS_MAGIC, len(flags), size, mtime, jd))
+        f.write(np.ascontiguousarray(flags, dtype=np.uint8).tobytes())
+    os.replace(tmp_path, path)
+
+
+def load_flags(path, source_path=None, count=None):
+    """(flags, Julian date they were computed at), or (None, None) if missing or stale"""
+    if not os.path.exists(path):
+        return None, None
+    with open(path, 'rb') as f:
+        data = f.read()
+    if len(data) < FLAGS_HEADER.size:
+        return None, None
+    magic, stored, size, mtime, jd = FLAGS_HEADER.unpack_from(data)
+    if magic != FLAGS_MAGIC or len(data) != FLAGS_HEADER.size + stored:
+        return None, None
+    if (source_path is not None and (size, mtime) != _source_stamp(source_path)) or \
+            (count is not None and stored != count):
+        return None, None
+    return np.frombuffer(data, dtype=np.uint8, offset=FLAGS_HEADER.size).copy(), jd
+
+
+def satrec_from_record(record):
+    """Initialize an SGP4 model directly from parsed elements"""
+    satrec = Satrec()
+    epoch = (record['epoch_jd'] - SGP4_EPOCH_JD) + record['epoch_fraction']
+    satrec.sgp4init(
+        WGS72, 'i', int(record['norad_id']), epoch,
+        float(record['bstar']),
+        float(record['ndot']) / (XPDOTP * 1440.0),
+        float(record['nddot']) / (XPDOTP * 1440.0 * 1440.0),
+        float(record['eccentricity']),
+        np.radians(record['arg_perigee']),
+        np.radians(record['inclination']),
+        np.radians(record['mean_anomaly']),
+        float(record['mean_motion']) / XPDOTP,
+        np.radians(record['raan']),
+    )
+    return satrec
+
+
+class TLECatalog:
+    """Array-backed satellite catalog with lazy EarthSatellite creation"""
+
+    def __init__(self, records, ts=None):
+        self.records = records
+        self.ts = ts
+        self._names = None
+        self._name_index = None
+        self._satellites = {}
+        self.flags = None  # Per-record tle_validation flags, when validated
+
+    @classmethod
+    def from_tle_text(cls, tle_data, ts=None):
+        """Build a catalog from raw TLE text"""
+        return cls(parse_tle_records(tle_data), ts)
+
+    @classmethod
+    def from_snapshot(cls, path, source_path=None, ts=None):
+        """Load a catalog from a binary snapshot (zero-copy), or None if unusable"""
+        records = load_snapshot(path, source_path)
+        if records is None:
+            return None
+        return cls(records, ts)
+
+    def save_snapshot(self, path, source_path=None):
+        """Write this catalog as a binary snapshot"""
+        save_snapshot(self.records, path, source_path)
+
+    @classmethod
+    def from_satellites(cls, satellites, ts=None):
+        """Build a catalog from TLEManager's list of {'name', 'line1', 'line2'} dicts"""
+        text = '\n'.join(f"{s['name']}\n{s['line1']}\n{s['line2']}" for s in satellites)
+        return cls.from_tle_text(text, ts)
+
+    def __len__(self):
+        return len(self.records)
+
+    def __contains__(self, name):
+        return self.index_of(name) is not None
+
+    def __iter__(self):
+        return iter(self.names)
+
+    @property
+    def names(self):
+        """Satellite names (interned, decoded once)"""
+        if self._names is None:
+            self._names = [sys.intern(n.decode('utf-8', 'ignore'))
+                           for n in self.records['name'].tolist()]
+        return self._names
+
+    def index_of(self, name):
+        """Index of a satellite by exact name, or None"""
+        if self._name_index is None:
+            self._name_index = {}
+            for i, n in enumerate(self.names):
+                self._name_index.setdefault(n, i)
+        return self._name_index.get(name)
+
+    def find(self, name):
+        """Index of the first satellite whose name contains `name` (case insensitive)"""
+        index = self.index_of(name)
+        if index is not None:
+            return index
+        query = name.upper().encode('utf-8')
+        matches = np.flatnonzero(np.char.find(np.char.upper(self.records['name']), query) >= 0)
+        return int(matches[0]) if len(matches) else None
+
+    def get_satellite(self, key):
+        """EarthSatellite for a name or index, created on first use"""
+        index = key if isinstance(key, (int, np.integer)) else self.index_of(key)
+        if index is None:
+            return None
+        index = int(index)
+
+        satellite = self._satellites.get(index)
+        if satellite is None:
+            from skyfield.api import EarthSatellite
+            if self.ts is None:
+                from skyfield_data import get_timescale
+                self.ts = get_timescale()
+            satellite = EarthSatellite.from_satrec(satrec_from_record(self.records[index]), self.ts)
+            satellite.name = self.names[index]
+            self._satellites[index] = satellite
+        return satellite
+
+    def subset(self, selection):
+        """New catalog with the records selected by a boolean mask or index array"""
+        subset = TLECatalog(self.records[selection], self.ts)
+        if self.flags is not None:
+            subset.flags = self.flags[selection]
+        return subset
+
+    def memory_usage(self):
+        """Approximate memory footprint in bytes"""
+        names = self._names or []
+        usage = {
+            'satellites': len(self),
+            'records_bytes': self.records.nbytes,
+            'names_bytes': sys.getsizeof(names) + sum(sys.getsizeof(n) for n in names),
+            'index_bytes': sys.getsizeof(self._name_index) if self._name_index else 0,
+            'materialized': len(self._satellites),
+            # EarthSatellite + Satrec is roughly 2 kB per object
+            'materialized_bytes': len(self._satellites) * 2048,
+        }
+        usage['total_bytes'] = (usage['records_bytes'] + usage['names_bytes'] +
+                                usage['index_bytes'] + usage['materialized_bytes'])
+        return usage
+
+
+def merge_records(groups, bits=None):
+    """Merge record arrays that may share objects, keeping the newest epoch per NORAD ID
+
+    Returns (records sorted by NORAD ID, membership, chosen): membership has
+    bit bits[i] (default i) set for the objects present in groups[i], chosen
+    is the index of each kept record in the concatenation of the groups.
+    """
+    groups = list(groups)
+    bits = np.arange(len(groups)) if bits is None else np.asarray(bits)
+    if len(bits) and bits.max() >= 32:
+        raise ValueError("Membership bits must be below 32 (uint32 bitmask)")
+    merged = np.concatenate(groups) if groups else np.zeros(0, dtype=TLE_DTYPE)
+    source = np.repeat(bits.astype(np.uint32), [len(g) for g in groups])
+
+    epoch = merged['epoch_jd'] + merged['epoch_fraction']
+    order = np.lexsort((-epoch, merged['norad_id']))  # By NORAD ID, newest epoch first
+    ids = merged['norad_id'][order]
+    first = np.ones(len(ids), dtype=bool)
+    first[1:] = ids[1:] != ids[:-1]
+
+    membership = np.zeros(int(first.sum()), dtype=np.uint32)
+    np.bitwise_or.at(membership, np.cumsum(first) - 1, np.uint32(1) << source[order])
+    chosen = order[first]
+    return merged[chosen], membership, chosen
+
+
+class UnifiedCatalog(TLECatalog):
+    """One record per NORAD ID across several categories (TLE groups)
+
+    Category membership is a bitmask per record (bit i = categories[i]);
+    view(category) gives a CatalogView over the shared records, so an object
+    listed in several groups is parsed, stored and materialized only once.
+    """
+
+    def __init__(self, records, membership, categories, ts=None):
+        super().__init__(records, ts)
+        self.membership = membership
+        self.categories = list(categories)
+
+    @classmethod
+    def merge(cls, catalogs, categories=None, ts=None):
+        """Merge {category: TLECatalog}; categories fixes the bit order (default: dict order)"""
+        categories = list(categories if categories is not None else catalogs)
+        present = [c for c in categories if catalogs.get(c) is not None]
+        # Bits follow `categories`, including the categories without a catalog
+        records, membership, chosen = merge_records([catalogs[c].records for c in present],
+                                                    [categories.index(c) for c in present])
+        unified = cls(records, membership, categories, ts)
+        if present and all(catalogs[c].flags is not None for c in present):
+            unified.flags = np.concatenate([catalogs[c].flags for c in present])[chosen]
+        return unified
+
+    def category_mask(self, category):
+        """Boolean mask of the records belonging to a category"""
+        bit = np.uint32(1) << np.uint32(self.categories.index(category))
+        return (self.membership & bit) != 0
+
+    def categories_of(self, key):
+        """Categories of a satellite (name or index)"""
+        index = key if isinstance(key, (int, np.integer)) else self.index_of(key)
+        if index is None:
+            return []
+        mask = int(self.membership[index])
+        return [c for i, c in enumerate(self.categories) if mask >> i & 1]
+
+    def view(self, category):
+        """CatalogView of one category (indices into the shared records)"""
+        return CatalogView(self, np.flatnonzero(self.category_mask(category)), category)
+
+    def subset(self, selection):
+        subset = UnifiedCatalog(self.records[selection], self.membership[selection], self.categories, self.ts)
+        if self.flags is not None:
+            subset.flags = self.flags[selection]
+        return subset
+
+
+class CatalogView:
+    """Read-only filter over a parent catalog: only an index array is stored
+
+    Names, EarthSatellite objects and the timescale are the parent's;
+    records and flags are gathered from the parent's arrays when accessed.
+    """
+
+    def __init__(self, parent, indices, category=None):
+        self.parent = parent
+        self.indices = np.asarray(indices, dtype=np.intp)  # Sorted parent indices
+        self.category = category
+        self._names = None
+
+    @property
+    def ts(self):
+        return self.parent.ts
+
+    @ts.setter
+    def ts(self, ts):
+        self.parent.ts = ts
+
+    @property
+    def records(self):
+        return self.parent.records[self.indices]
+
+    @property
+    def flags(self):
+        return self.parent.flags[self.indices] if self.parent.flags is not None else None
+
+    @property
+    def names(self):
+        if self._names is None:
+            names = self.parent.names
+            self._names = [names[i] for i in self.indices.tolist()]
+        return self._names
+
+    def __len__(self):
+        return len(self.indices)
+
+    def __contains__(self, name):
+        return self.index_of(name) is not None
+
+    def __iter__(self):
+        return iter(self.names)
+
+    def _local(self, parent_index):
+        """Position in this view of a parent index, or None if filtered out"""
+        if parent_index is None:
+            return None
+        i = int(np.searchsorted(self.indices, parent_index))
+        return i if i < len(self.indices) and self.indices[i] == parent_index else None
+
+    def index_of(self, name):
+        return self._local(self.parent.index_of(name))
+
+    def find(self, name):
+        index = self.index_of(name)
+        if index is not None:
+            return index
+        query = name.upper().encode('utf-8')
+        names = np.char.upper(self.parent.records['name'][self.indices])
+        matches = np.flatnonzero(np.char.find(names, query) >= 0)
+        return int(matches[0]) if len(matches) else None
+
+    def get_satellite(self, key):
+        index = key if isinstance(key, (int, np.integer)) else self.index_of(key)
+        if index is None:
+            return None
+        return self.parent.get_satellite(int(self.indices[index]))
+
+    def subset(self, selection):
+        return CatalogView(self.parent, self.indices[selection], self.category)
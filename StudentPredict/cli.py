@@ -0,0 +1,395 @@
+# cli.py
+"""
+Command-line interface for scripts and cron jobs
+Results go to stdout (or -o FILE) as JSON Lines or CSV, written as soon as
+they are computed: a pass search over a large catalog produces its first
+rows after the first satellites, and the output pipes cleanly into other
+tools. Progress and diagnostics go to stderr.
+
+Usage:
+    python cli.py fetch stations weather
+    python cli.py positions -c stations --name ISS
+    python cli.py passes -c active --days 2 --min-elevation 20 --workers 4 > passes.jsonl
+    python cli.py passes -c weather --norad 33591 --norad 28654 --format csv
+    python cli.py export -c stations --name ISS --days 7 --step 10 -o iss.parquet
+    python cli.py bench -k find_passes
+"""
+
+import argparse
+import contextlib
+import csv
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+import numpy as np
+from config import TLE_SOURCES, TLE_CACHE_HOURS, MIN_ELEVATION, PREDICTION_DAYS, CLI_PASS_CHUNK
+from propagation import DAY_S
+
+FORMATS = ('jsonl', 'csv')
+
+PASS_FIELDS = (
+    'satellite', 'norad_id', 'rise_time', 'rise_az', 'max_time', 'max_elevation', 'max_azimuth',
+    'set_time', 'set_az', 'duration_s', 'visibility', 'visible_start', 'visible_end', 'visible_s',
+)
+
+
+class JSONLinesWriter:
+    """One JSON object per line"""
+
+    def __init__(self, stream, fields):
+        self.stream = stream
+
+    def write(self, rows):
+        self.stream.write(''.join(json.dumps(row) + '\n' for row in rows))
+        self.stream.flush()
+
+
+class CSVRowWriter:
+    """CSV with a header line, empty cells for missing values"""
+
+    def __init__(self, stream, fields):
+        self.stream = stream
+        self.writer = csv.DictWriter(stream, fields, extrasaction='ignore')
+        self.writer.writeheader()
+
+    def write(self, rows):
+        self.writer.writerows(rows)
+        self.stream.flush()
+
+
+WRITERS = {'jsonl': JSONLinesWriter, 'csv': CSVRowWriter}
+
+
+def parse_time(ts, value):
+    """Skyfield Time from an ISO UTC string like 2026-10-16T12:00:00"""
+    from datetime import datetime, timezone
+    moment = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return ts.from_datetime(moment)
+
+
+def select(catalog, names=None, norad_ids=None):
+    """Boolean mask of the records matching any name (case-insensitive substring) or NORAD ID
+
+    Without filters every record is selected.
+    """
+    records = catalog.records
+    if not names and not norad_ids:
+        return np.ones(len(records), dtype=bool)
+    mask = np.zeros(len(records), dtype=bool)
+    if names:
+        upper = np.char.upper(records['name'])
+        for name in names:
+            mask |= np.char.find(upper, name.upper().encode('utf-8')) >= 0
+    if norad_ids:
+        mask |= np.isin(records['norad_id'], np.asarray(norad_ids, dtype=np.uint32))
+    return mask
+
+
+def load_selection(args):
+    """(TLEManager, catalog of the selected satellites) from the category and filter options"""
+    from tle_manager import TLEManager
+    from sim_clock import FixedClock
+    from skyfield_data import get_timescale
+    # Epoch ages checked at --start: the same files give the same selection on every run
+    tle_mgr = TLEManager(FixedClock(start_time(get_timescale(), args)) if args.start else None)
+    categories = args.category or ['stations']
+    for category in categories:
+        tle_mgr.ensure_tles(category, args.max_age)
+
+    unified = tle_mgr.load_unified()
+    mask = np.zeros(len(unified), dtype=bool)
+    for category in categories:
+        if tle_mgr.load_catalog(category) is not None:
+            mask |= unified.category_mask(category)
+    mask &= select(unified, args.name, args.norad)
+    catalog = unified.subset(mask)
+    print(f"✓ {len(catalog)} satellites selected from {', '.join(categories)}")
+    return tle_mgr, catalog
+
+
+def make_tracker(catalog, history=None):
+    from tracker import SatelliteTracker
+    tracker = SatelliteTracker()
+    tracker.load_catalog(catalog)
+    if history is not None:
+        tracker.use_history(history)
+    return tracker
+
+
+def start_time(ts, args):
+    return parse_time(ts, args.start) if args.start else ts.now()
+
+
+def pass_row(name, norad_id, p):
+    """Flat, JSON-serializable row of a pass dict"""
+    return {
+        'satellite': name,
+        'norad_id': norad_id,
+        'rise_time': p['rise_time_str'],
+        'rise_az': round(float(p['rise_az']), 2),
+        'max_time': p['max_time_str'],
+        'max_elevation': round(float(p['max_elevation']), 2),
+        'max_azimuth': round(float(p['max_azimuth']), 2),
+        'set_time': p['set_time_str'],
+        'set_az': round(float(p['set_az']), 2),
+        'duration_s': round(p['duration_seconds'], 1),
+        'visibility': p.get('visibility'),
+        'visible_start': p.get('visible_start_str'),
+        'visible_end': p.get('visible_end_str'),
+        'visible_s': p.get('visible_seconds'),
+    }
+
+
+class PassJob:
+    """Pass search over catalog satellites, run in this process or in a worker process"""
+
+    def __init__(self, records, start, days, min_elevation):
+        from catalog import TLECatalog
+        from predictor import PassPredictor
+        from tle_history import TLEHistory
+        self.catalog = TLECatalog(records)
+        self.tracker = make_tracker(self.catalog, TLEHistory())
+        self.predictor = PassPredictor(self.tracker)
+        self.start = self.tracker.ts.tt_jd(*start)
+        self.days = days
+        self.min_elevation = min_elevation
+
+    def rows(self, indices):
+        """(pass rows, names always above min_elevation) of the satellites at these
+        catalog indices; rows carry their visibility"""
+        from predictor import ALWAYS
+        names = [self.catalog.names[i] for i in indices]
+        passes = self.predictor.find_visible_passes(names, self.days, self.min_elevation, self.start)
+        rows = []
+        for i, name in zip(indices, names):
+            norad_id = int(self.catalog.records['norad_id'][i])
+            rows += [pass_row(name, norad_id, p) for p in passes.get(name, [])]
+        always_up = [name for name in names if self.predictor.screened.get(name) == ALWAYS]
+        return rows, always_up
+
+
+_job = None  # PassJob of a worker process
+
+
+def _start_worker(records, start, days, min_elevation):
+    global _job
+    sys.stdout = sys.stderr  # Library messages must not end up in the results
+    _job = PassJob(records, start, days, min_elevation)
+
+
+def _worker_rows(indices):
+    return _job.rows(indices)
+
+
+def iter_pass_rows(catalog, start, days, min_elevation, workers=1, chunk=CLI_PASS_CHUNK, ordered=False):
+    """Yield (pass rows, names always above min_elevation), one per chunk of
+    satellites as soon as it is done
+
+    With several workers, chunks are searched in worker processes and come
+    out in completion order (catalog order with ordered=True).
+    """
+    records = np.array(catalog.records)
+    start = (float(start.whole), float(start.tt_fraction))
+    chunks = [list(range(i, min(i + chunk, len(records)))) for i in range(0, len(records), chunk)]
+    if workers <= 1:
+        job = PassJob(records, start, days, min_elevation)
+        for indices in chunks:
+            yield job.rows(indices)
+        return
+
+    pool = ProcessPoolExecutor(workers, initializer=_start_worker,
+                               initargs=(records, start, days, min_elevation))
+    try:
+        if ordered:
+            yield from pool.map(_worker_rows, chunks)
+        else:
+            futures = [pool.submit(_worker_rows, indices) for indices in chunks]
+            for future in as_completed(futures):
+                yield future.result()
+    finally:
+        # Stopped early (broken pipe, Ctrl-C): do not search the remaining chunks
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def position_rows(chunk):
+    """Rows of an export.iter_ephemeris chunk (failed propagations give nulls)"""
+    from export import COLUMNS
+    times = np.char.add(np.datetime_as_string(chunk['time'], unit='ms'), 'Z')
+    columns = [times.tolist()]
+    for c in COLUMNS[1:]:
+        values = chunk[c].tolist()
+        if chunk[c].dtype.kind == 'f':
+            values = [None if v != v else v for v in values]
+        columns.append(values)
+    return [dict(zip(COLUMNS, row)) for row in zip(*columns)]
+
+
+def cmd_fetch(args, out):
+    from tle_manager import TLEManager
+    tle_mgr = TLEManager()
+    categories = args.categories or list(TLE_SOURCES)
+    unknown = [c for c in categories if c not in TLE_SOURCES]
+    if unknown:
+        print(f"✗ Unknown categories: {', '.join(unknown)} (use {', '.join(TLE_SOURCES)})")
+        return 1
+
+    def fetch(category):
+        if args.force:
+            tle_mgr.download_tles(category)
+        else:
+            tle_mgr.ensure_tles(category, args.max_age)
+        return category
+
+    writer = WRITERS[args.format](out, ('category', 'satellites', 'age_hours'))
+    failed = 0
+    with ThreadPoolExecutor(max_workers=max(1, args.workers)) as pool:
+        for category in pool.map(fetch, categories):
+            catalog = tle_mgr.load_catalog(category)
+            age_hours = tle_mgr.file_age_hours(category)
+            failed += catalog is None
+            writer.write([{
+                'category': category,
+                'satellites': len(catalog) if catalog is not None else 0,
+                'age_hours': round(age_hours, 2) if age_hours is not None else None,
+            }])
+    return 1 if failed else 0
+
+
+def cmd_positions(args, out):
+    from export import COLUMNS, iter_ephemeris
+    tle_mgr, catalog = load_selection(args)
+    if not len(catalog):
+        return 1
+    tracker = make_tracker(catalog, tle_mgr.history)
+    writer = WRITERS[args.format](out, COLUMNS)
+    for chunk in iter_ephemeris(tracker, catalog.names, start_time(tracker.ts, args),
+                                args.days * DAY_S, args.step):
+        writer.write(position_rows(chunk))
+    return 0
+
+
+def cmd_passes(args, out):
+    tle_mgr, catalog = load_selection(args)
+    if not len(catalog):
+        return 1
+    from skyfield_data import get_timescale
+    start = start_time(get_timescale(), args)
+    writer = WRITERS[args.format](out, PASS_FIELDS)
+    count = 0
+    always_up = []
+    for rows, always in iter_pass_rows(catalog, start, args.days, args.min_elevation,
+                                       args.workers, ordered=args.ordered):
+        writer.write(rows)
+        count += len(rows)
+        always_up += always
+    print(f"✓ {count} passes of {len(catalog)} satellites")
+    if always_up:
+        # No rise or set to report: these never show up as rows
+        more = f" (+{len(always_up) - 5})" if len(always_up) > 5 else ""
+        print(f"   {len(always_up)} always above {args.min_elevation}°: {', '.join(always_up[:5])}{more}")
+    return 0
+
+
+def cmd_export(args, out):
+    from export import export_ephemeris
+    tle_mgr, catalog = load_selection(args)
+    if not len(catalog):
+        return 1
+    tracker = make_tracker(catalog, tle_mgr.history)
+    try:
+        rows = export_ephemeris(tracker, catalog.names, args.output, start_time(tracker.ts, args),
+                                args.days * DAY_S, args.step, args.export_format)
+    except (ImportError, ValueError) as e:
+        print(f"✗ {e}")
+        return 1
+    print(f"✓ Exported {rows} rows ({len(catalog)} satellites) to {args.output}")
+    return 0
+
+
+def cmd_bench(args, out):
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmarks'))
+    import run_benchmarks
+    sys.argv = ['run_benchmarks.py'] + args.options
+    run_benchmarks.main()
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description='Satellite tracker command-line interface')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    output = argparse.ArgumentParser(add_help=False)
+    output.add_argument('--format', choices=FORMATS, default='jsonl', help='Output format (default: jsonl)')
+    output.add_argument('-o', '--output', help='Output file (default: stdout)')
+
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('-c', '--category', action='append', choices=sorted(TLE_SOURCES),
+                        help='TLE category, repeatable (default: stations)')
+    common.add_argument('--name', action='append', help='Satellites whose name contains this, repeatable')
+    common.add_argument('--norad', action='append', type=int, help='Satellite NORAD ID, repeatable')
+    common.add_argument('--start', help='Start time, ISO UTC like 2026-10-16T12:00:00 (default: now)')
+    common.add_argument('--max-age', type=float, default=TLE_CACHE_HOURS,
+                        help=f'Download TLE files older than this, in hours (default: {TLE_CACHE_HOURS})')
+
+    fetch = commands.add_parser('fetch', parents=[output], help='Download TLE categories')
+    fetch.add_argument('categories', nargs='*', help='Categories (default: all)')
+    fetch.add_argument('--force', action='store_true', help='Download even recent files')
+    fetch.add_argument('--max-age', type=float, default=TLE_CACHE_HOURS, help='Download files older than this (hours)')
+    fetch.add_argument('--workers', type=int, default=3, help='Parallel downloads (default: 3)')
+    fetch.set_defaults(func=cmd_fetch)
+
+    positions = commands.add_parser('positions', parents=[common, output], help='Positions and look angles')
+    positions.add_argument('--days', type=float, default=0, help='Time range in days (default: 0, start only)')
+    positions.add_argument('--step', type=float, default=60, help='Step in seconds (default: 60)')
+    positions.set_defaults(func=cmd_positions)
+
+    passes = commands.add_parser('passes', parents=[common, output], help='Pass predictions')
+    passes.add_argument('--days', type=float, default=PREDICTION_DAYS,
+                        help=f'Search window in days (default: {PREDICTION_DAYS})')
+    passes.add_argument('--min-elevation', type=float, default=MIN_ELEVATION,
+                        help=f'Minimum elevation in degrees (default: {MIN_ELEVATION})')
+    passes.add_argument('--workers', type=int, default=1, help='Worker processes (default: 1)')
+    passes.add_argument('--ordered', action='store_true',
+                        help='Write satellites in catalog order instead of as soon as they are done')
+    passes.set_defaults(func=cmd_passes)
+
+    export = commands.add_parser('export', parents=[common], help='Ephemeris file (CSV, Parquet, NumPy)')
+    export.add_argument('--days', type=float, default=1, help='Duration in days (default: 1)')
+    export.add_argument('--step', type=float, default=60, help='Step in seconds (default: 60)')
+    export.add_argument('--format', dest='export_format', choices=('csv', 'parquet', 'npz'),
+                        help='File format (default: from extension)')
+    export.add_argument('-o', '--output', required=True, help='Output file (.csv, .parquet or .npz)')
+    export.set_defaults(func=cmd_export)
+
+    bench = commands.add_parser('bench', help='Run benchmarks/run_benchmarks.py with these options')
+    bench.add_argument('options', nargs=argparse.REMAINDER, help='Options of run_benchmarks.py')
+    bench.set_defaults(func=cmd_bench)
+    return parser
+
+
+def main():
+    args = build_parser().parse_args()
+    out = sys.stdout
+    if getattr(args, 'format', None) in FORMATS and args.output:
+        out = open(args.output, 'w', newline='')
+    try:
+        # Library messages (✓ / ✗) go to stderr, stdout only carries results
+        with contextlib.redirect_stdout(sys.stderr):
+            status = args.func(args, out)
+    except BrokenPipeError:
+        # Reader went away (| head): silence the flush of the closed pipe at exit
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        status = 1
+    except KeyboardInterrupt:
+        status = 130
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    sys.exit(status)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,11 +3,29 @@
 Configuration file - EDIT YOUR LOCATION HERE
 """
 
+import os
+
 # YOUR OBSERVER LOCATION (Change these!)
 OBSERVER_LAT = 48.11704  #  latitude
 OBSERVER_LON = -1.64126  #  longitude  
 OBSERVER_ELEVATION = 37  # meters above sea level
 
+# Ground stations for multi-station tracking (first one = the observer above)
+# Add your other stations here: {'name': ..., 'lat': ..., 'lon': ..., 'elevation': ...}
+STATIONS = [
+    {'name': 'Rennes', 'lat': OBSERVER_LAT, 'lon': OBSERVER_LON, 'elevation': OBSERVER_ELEVATION},
+]
+
+# Antenna rotator (Yaesu GS-5500: 450° azimuth with overlap, 180° elevation)
+ROTATOR = {
+    'az_min': 0, 'az_max': 450,  # Use 360 for rotators without overlap
+    'el_min': 0, 'el_max': 180,  # Use 90 to disable flip mode
+    'az_rate': 6.0, 'el_rate': 2.7,  # Slew rates (degrees per second)
+    'flip_elevation': 75,  # Consider flip mode for passes higher than this
+    'park': (0, 0),  # Position between passes (az, el)
+}
+ROTATOR_STEP_S = 1  # Time between rotator commands (seconds)
+
 # TLE Sources
 TLE_SOURCES = {
     'active': 'https://celestrak.org/NORAD/elements/gp.php?GROUP=active&FORMAT=tle',
@@ -20,6 +38,98 @@ TLE_SOURCES = {
 # Prediction settings
 MIN_ELEVATION = 10  # Minimum elevation for pass predictions (degrees)
 PREDICTION_DAYS = 7  # How many days ahead to predict
+TLE_CACHE_HOURS = 6  # Reuse downloaded TLE files younger than this instead of downloading again
+SUN_ALTITUDE_DARK = -6  # Observer is in darkness below this Sun altitude (civil twilight, degrees)
+VISIBILITY_STEP_S = 10  # Time step for pass visibility labelling (seconds)
+
+# Orbit classes for the pass search (predictor.py)
+LEO_MIN_MEAN_MOTION = 11.25  # rev/day (period under 128 min)
+GEO_MEAN_MOTION = (0.9, 1.1)  # rev/day, near-circular orbits in this range are geosynchronous
+HEO_MIN_ECCENTRICITY = 0.25
+# Coarse search step per class, as a fraction of the orbital period (at most 6 h);
+# LEO passes use Skyfield's EarthSatellite.find_events and its own 0.05
+PASS_SEARCH_STEP = {'LEO': 0.05, 'MEO': 0.1, 'HEO': 0.02, 'GEO': 0.1}
+PASS_MIN_DIP_S = 30  # Shortest dip below the minimum elevation that splits two HEO passes (seconds)
+GEO_CHECK_STEP_S = 1800  # Elevation sampling of geostationary objects (seconds)
+ORBIT_SCREEN_MARGIN_DEG = 1.0  # Safety margin of the never/always visible tests (degrees)
+
+# TLE ingest checks
+TLE_STALE_DAYS = 7  # Flag element sets older than this (still used)
+TLE_EXPIRED_DAYS = 30  # Drop element sets older than this
+TLE_MEAN_MOTION_JUMP = 0.01  # Flag mean motion changes between downloads beyond drag (rev/day)
+TLE_RECHECK_DAYS = 1  # Reuse the cached SGP4 checks of a snapshot computed less than this far from the load time
+
+# Conjunction screening
+CONJUNCTION_THRESHOLD_KM = 10  # Report approaches closer than this
+CONJUNCTION_STEP_S = 60  # Coarse screening step (seconds)
 
 # Data folder
-DATA_FOLDER = 'data'
\ No newline at end of file
+DATA_FOLDER = 'data'
+
+# TLE history archive
+HISTORY_FOLDER = os.path.join(DATA_FOLDER, 'history')
+HISTORY_EPOCH_THRESHOLD_DAYS = 3  # Use archived TLEs when the requested time is further than this from the latest epoch
+
+# Simulation clock (time travel / accelerated time in the GUI)
+SIM_SPEEDS = [1, 10, 60, 100, 1000]  # Speed factors offered in the GUI
+SIM_PRECOMPUTE_SPEED = 10  # From this speed factor on, the whole category is drawn from the precomputed keyframes
+SIM_FRAME_INTERVAL_MS = 200  # Display refresh when precomputed frames are used
+SIM_BATCH_FRAMES = 600  # Frames per background batch (look-ahead window = half a batch)
+SIM_CACHE_FRAMES = 3000  # Maximum frames kept in memory
+ANIM_KEYFRAME_S = 30  # Simulated seconds between propagated keyframes (positions interpolated in between)
+ANIM_FPS = 25  # Map animation frame rate (markers only, blitted over the cached background)
+ANIM_REDRAW_S = 3  # Full map redraw (direction arrow, background) at most this often otherwise
+
+# Event core (AOS/LOS scheduling and position updates)
+EVENT_PASS_DAYS = 1  # Pass table horizon for AOS/LOS events (days)
+EVENT_DISPLAY_INTERVAL_S = 3  # Map and sky view refresh while a satellite is above the horizon
+EVENT_INFO_INTERVAL_S = 2  # Coordinates refresh while a satellite is above the horizon
+EVENT_IDLE_INTERVAL_S = 30  # GUI refresh when nothing is above the horizon
+
+# Pass table and satellite list (gui_models.py)
+GUI_PASS_TABLE_CHUNK = 16  # Satellites per incremental update of the pass table
+GUI_PASS_PERIODS_H = [1, 6, 24]  # Time filters offered for the pass table (hours from the clock)
+GUI_FREQUENCY_BANDS = {  # Downlink bands offered as filters (MHz)
+    'VHF': (136.0, 174.0),
+    'UHF': (400.0, 470.0),
+    'L': (1000.0, 2000.0),
+    'S': (2000.0, 4000.0),
+}
+
+# AOS/TCA/LOS alarms (alarms.py)
+ALARM_AOS_LEAD_S = 300  # Warning this long before AOS (seconds)
+ALARM_WINDOW_DAYS = 1  # Pass table searched per refill (days)
+ALARM_REFILL_MARGIN_S = 3 * 3600  # Search the next window this long before the loaded one ends
+ALARM_PASS_OVERLAP_S = 3600  # Windows overlap this much so passes across their boundary are complete
+
+# SDR recording of passes (recording.py)
+# Recorder command, split like a shell would; placeholders: {frequency_hz}, {frequency_mhz},
+# {satellite}, {output} (file path without extension), {duration_s}, {doppler_port}
+RECORDER_COMMAND = 'rtl_fm -f {frequency_hz} -M fm -s 48k -E deemp -F 9 {output}.raw'
+RECORDING_FOLDER = os.path.join(DATA_FOLDER, 'recordings')
+RECORDING_PADDING_S = 30  # Start this long before AOS, stop this long after LOS
+RECORDER_STOP_TIMEOUT_S = 5  # SIGKILL the recorder if it has not exited this long after SIGTERM
+DOPPLER_HOST = '127.0.0.1'  # Doppler corrections are sent as JSON datagrams to this UDP address
+DOPPLER_PORT = 7355
+DOPPLER_STEP_S = 1  # Time between Doppler updates (seconds)
+
+# Shared-memory position feed (position_feed.py)
+FEED_NAME = 'sgs_positions'  # Shared-memory block name
+FEED_SLOTS = 4  # Frames kept in the ring (readers copy the latest while the next one is written)
+FEED_INTERVAL_S = 1  # Time between published frames (seconds)
+FEED_READ_TIMEOUT_S = 1  # Readers give up on a slot left half-written this long (seconds)
+
+# Tracking API server (api_server.py)
+API_HOST = '127.0.0.1'  # Listen on localhost only; use 0.0.0.0 to accept remote clients
+API_PORT = 8080
+API_CACHE_S = 0.5  # Positions computed at most this often, whatever the number of clients
+API_MIN_INTERVAL_S = 0.2  # Fastest WebSocket update rate a client can ask for
+API_MAX_BATCH_ROWS = 100_000  # Rows (satellites x steps) per batch positions request
+API_PASS_CACHE_S = 300  # Pass tables shared between clients for this long
+
+# Coverage and revisit-time grid (coverage.py)
+COVERAGE_GRID_DEG = 2  # Latitude/longitude grid step (degrees)
+COVERAGE_STEP_S = 30  # Time step of the footprint tests (seconds)
+
+# Command-line interface (cli.py)
+CLI_PASS_CHUNK = 8  # Satellites per pass-search task (results are written after each task)
@@ -0,0 +1,270 @@
+# conjunction.py
+"""
+Conjunction screening: close approaches between loaded satellites
+All objects are propagated together on a coarse time grid. At each step a
+spatial index (scipy's k-d tree when available, uniform grid hashing
+otherwise) gives the pairs close enough to possibly approach within the
+threshold before the next step; only those pairs are refined to the time of
+closest approach (TCA) with SGP4.
+
+Usage:
+    python conjunction.py --category active --hours 24 --threshold 5
+    python conjunction.py --category stations --primary "ISS (ZARYA)"
+"""
+
+import argparse
+import sys
+import numpy as np
+from config import CONJUNCTION_THRESHOLD_KM, CONJUNCTION_STEP_S
+from propagation import DAY_S, sgp4_times, propagate_teme
+
+CHUNK_POINTS = 2_000_000  # Positions (objects x steps) propagated per batch
+MAX_ACCELERATION = 0.02  # km/s², bound on relative acceleration (2 x surface gravity)
+REFINE_ITERATIONS = 8
+
+
+def _pairs_kdtree(points, radius):
+    from scipy.spatial import cKDTree
+    # Unbalanced, non-compacted trees build several times faster; one tree is built per step
+    tree = cKDTree(points, balanced_tree=False, compact_nodes=False)
+    return tree.query_pairs(radius, output_type='ndarray')
+
+
+# Half of the 27 neighbouring cells (plus the cell itself): each pair of cells is visited once
+_OFFSETS = np.array([(dx, dy, dz) for dx in (-1, 0, 1) for dy in (-1, 0, 1) for dz in (-1, 0, 1)
+                     if (dx, dy, dz) >= (0, 0, 0)])
+
+
+def _pairs_grid(points, radius):
+    """Pairs (i < j) closer than radius, by hashing points into cubic cells of that size"""
+    cells = np.floor(points / radius).astype(np.int64)
+    cells -= cells.min(axis=0)
+    dims = cells.max(axis=0) + 2
+    keys = (cells[:, 0] * dims[1] + cells[:, 1]) * dims[2] + cells[:, 2]
+    order = np.argsort(keys, kind='stable')
+    sorted_keys = keys[order]
+
+    pairs = []
+    for offset in _OFFSETS:
+        neighbour = keys + (offset[0] * dims[1] + offset[1]) * dims[2] + offset[2]
+        lo = np.searchsorted(sorted_keys, neighbour, side='left')
+        hi = np.searchsorted(sorted_keys, neighbour, side='right')
+        counts = hi - lo
+        if not counts.any():
+            continue
+        i = np.repeat(np.arange(len(points)), counts)
+        j = order[np.repeat(lo - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())]
+        keep = i != j if not offset.any() else np.ones(len(i), dtype=bool)
+        pairs.append(np.stack([i[keep], j[keep]], axis=1))
+
+    if not pairs:
+        return np.empty((0, 2), dtype=np.int64)
+    pairs = np.concatenate(pairs)
+    pairs = np.sort(pairs, axis=1)
+    pairs = np.unique(pairs, axis=0)
+    distance = np.linalg.norm(points[pairs[:, 0]] - points[pairs[:, 1]], axis=1)
+    return pairs[distance <= radius]
+
+
+def find_pairs(points, radius):
+    """Index pairs (i < j) of points closer than radius"""
+    try:
+        return _pairs_kdtree(points, radius)
+    except ImportError:
+        return _pairs_grid(points, radius)
+
+
+def linear_approach(dr, dv, half_step):
+    """Closest approach of straight-line relative motion within ±half_step seconds
+
+    Returns the time offset (s) and the distance (km) at that offset.
+    """
+    speed2 = np.einsum('ij,ij->i', dv, dv)
+    tau = -np.einsum('ij,ij->i', dr, dv) / np.where(speed2 > 0, speed2, 1.0)
+    tau = np.clip(tau, -half_step, half_step)
+    return tau, np.linalg.norm(dr + dv * tau[:, None], axis=1)
+
+
+def candidates(satrecs, ts, start, duration_s, step_s, threshold_km, primary=None):
+    """Coarse screening: (i, j, step time as TT Julian date, offset s, linear miss km)
+
+    At each grid step, objects within threshold + v_max * step of each other
+    are found with the spatial index, then kept when their straight-line
+    relative motion passes within threshold + curvature margin.
+    """
+    steps = int(duration_s // step_s) + 1
+    chunk = max(1, CHUNK_POINTS // len(satrecs))
+    half_step = step_s / 2
+    margin = 0.5 * MAX_ACCELERATION * half_step ** 2
+    found = []
+
+    for first in range(0, steps, chunk):
+        offsets = np.arange(first, min(first + chunk, steps)) * step_s
+        t = ts.tt_jd(start.whole, start.tt_fraction + offsets / DAY_S)
+        r, v, errors = propagate_teme(satrecs, t)
+        # Step-major copies: each step's positions become one contiguous (N, 3) block
+        r = np.ascontiguousarray(r.transpose(1, 0, 2))
+        v = np.ascontiguousarray(v.transpose(1, 0, 2))
+        jd = np.atleast_1d(t.tt)
+
+        for k in range(len(offsets)):
+            points, velocities = r[k], v[k]
+            ok = np.flatnonzero(~np.isnan(points[:, 0]))
+            if len(ok) < 2:
+                continue
+            v_max = np.sqrt(np.einsum('ij,ij->i', velocities[ok], velocities[ok]).max())
+            radius = threshold_km + margin + v_max * step_s
+
+            pairs = ok[find_pairs(points[ok], radius)]
+            if primary is not None:
+                pairs = pairs[primary[pairs[:, 0]] | primary[pairs[:, 1]]]
+            if not len(pairs):
+                continue
+
+            i, j = pairs[:, 0], pairs[:, 1]
+            tau, miss = linear_approach(points[j] - points[i], velocities[j] - velocities[i], half_step)
+            close = miss <= threshold_km + margin
+            found.append(np.rec.fromarrays(
+                [i[close], j[close], np.full(close.sum(), jd[k]), tau[close], miss[close]],
+                names='i,j,jd,offset,miss'))
+
+    if not found:
+        return np.rec.fromarrays([np.empty(0, int)] * 2 + [np.empty(0)] * 3, names='i,j,jd,offset,miss')
+    return np.concatenate(found).view(np.recarray)
+
+
+def _states(satrecs, index, tt_jd, ts):
+    """SGP4 positions and velocities (M, 3) of satellites satrecs[index] at their own times
+
+    One sgp4_array call per distinct satellite. Failed propagations are NaN.
+    """
+    jd, fraction = sgp4_times(ts.tt_jd(tt_jd))
+    r = np.full((len(index), 3), np.nan)
+    v = np.full((len(index), 3), np.nan)
+    order = np.argsort(index, kind='stable')
+    starts = np.flatnonzero(np.concatenate([[True], np.diff(index[order]) != 0]))
+    for rows in np.split(order, starts[1:]):
+        errors, pos, vel = satrecs[index[rows[0]]].sgp4_array(jd[rows], fraction[rows])
+        ok = errors == 0
+        r[rows[ok]], v[rows[ok]] = pos[ok], vel[ok]
+    return r, v
+
+
+def refine(satrecs, ts, i, j, tca_jd):
+    """Newton iterations on d|dr|²/dt = 0 with SGP4, from the coarse TCA guesses
+
+    All approaches are iterated together. Returns the refined TCA (TT Julian
+    dates), miss distances (km) and relative speeds (km/s); NaN where SGP4
+    failed.
+    """
+    tca = np.array(tca_jd, dtype=float)
+    miss = np.full(len(tca), np.nan)
+    speed = np.full(len(tca), np.nan)
+    active = np.arange(len(tca))
+    for _ in range(REFINE_ITERATIONS):
+        if not len(active):
+            break
+        count = len(active)
+        r, v = _states(satrecs, np.concatenate([i[active], j[active]]),
+                       np.concatenate([tca[active], tca[active]]), ts)
+        dr, dv = r[count:] - r[:count], v[count:] - v[:count]
+        speed2 = np.einsum('ij,ij->i', dv, dv)
+        dt = -np.einsum('ij,ij->i', dr, dv) / np.where(speed2 > 0, speed2, 1.0)
+        tca[active] += np.nan_to_num(dt) / DAY_S
+        miss[active] = np.linalg.norm(dr + dv * dt[:, None], axis=1)
+        speed[active] = np.sqrt(speed2)
+        active = active[np.abs(dt) >= 1e-3]  # NaN (failed) compares False and stops too
+    return tca, miss, speed
+
+
+def screen(tracker, sat_names=None, start_time=None, duration_s=DAY_S, step_s=CONJUNCTION_STEP_S,
+           threshold_km=CONJUNCTION_THRESHOLD_KM, primary=None):
+    """Close approaches closer than threshold_km between the given (default: all) satellites
+
+    primary: optional list of names (e.g. ['ISS (ZARYA)']); only approaches
+    involving one of them are reported.
+    Returns events sorted by miss distance: satellite_1, satellite_2, tca,
+    tca_str, miss_distance_km, relative_speed_km_s.
+    """
+    if sat_names is None:
+        sat_names = tracker.satellite_names()
+    start = start_time if start_time is not None else tracker.now()
+
+    names, satrecs = [], []
+    for name in sat_names:
+        satellite = tracker.satellite_for_time(name, start)
+        if satellite is not None:
+            names.append(name)
+            satrecs.append(satellite.model)
+    if len(satrecs) < 2:
+        return []
+
+    is_primary = None
+    if primary is not None:
+        is_primary = np.isin(np.array(names, dtype=object), list(primary))
+
+    ts = tracker.ts
+    coarse = candidates(satrecs, ts, start, duration_s, step_s, threshold_km, is_primary)
+    if not len(coarse):
+        return []
+
+    # One refinement per approach: consecutive steps of the same pair are the same approach
+    order = np.lexsort((coarse.jd, coarse.j, coarse.i))
+    coarse = coarse[order]
+    new_pair = (np.diff(coarse.i) != 0) | (np.diff(coarse.j) != 0)
+    gap = np.diff(coarse.jd) * DAY_S > step_s * 1.5
+    group = np.concatenate([[0], np.cumsum(new_pair | gap)])
+    by_group = np.lexsort((coarse.miss, group))
+    coarse = coarse[by_group[np.concatenate([[True], np.diff(group[by_group]) != 0])]]
+
+    tca, miss, speed = refine(satrecs, ts, coarse.i, coarse.j, coarse.jd + coarse.offset / DAY_S)
+    close = np.flatnonzero(miss <= threshold_km)
+    events = []
+    for n in close[np.argsort(miss[close])]:
+        t = ts.tt_jd(tca[n])
+        events.append({
+            'satellite_1': names[coarse.i[n]],
+            'satellite_2': names[coarse.j[n]],
+            'tca': t,
+            'tca_str': t.utc_iso(),
+            'miss_distance_km': float(miss[n]),
+            'relative_speed_km_s': float(speed[n]),
+        })
+    return events
+
+
+def main():
+    from tle_manager import TLEManager
+    from tracker import SatelliteTracker
+
+    parser = argparse.ArgumentParser(description='Screen a TLE category for close approaches')
+    parser.add_argument('--category', default='active', help='TLE category (default: active)')
+    parser.add_argument('--hours', type=float, default=24, help='Screening window (default: 24 h)')
+    parser.add_argument('--threshold', type=float, default=CONJUNCTION_THRESHOLD_KM,
+                        help=f'Distance threshold in km (default: {CONJUNCTION_THRESHOLD_KM})')
+    parser.add_argument('--step', type=float, default=CONJUNCTION_STEP_S, help='Coarse step in seconds')
+    parser.add_argument('--primary', action='append', help='Only approaches involving this satellite')
+    args = parser.parse_args()
+
+    tle_mgr = TLEManager()
+    catalog = tle_mgr.load_catalog(args.category)
+    if catalog is None:
+        tle_mgr.get_tles(args.category)
+        catalog = tle_mgr.load_catalog(args.category)
+    if catalog is None:
+        print(f"✗ No TLEs for category '{args.category}'")
+        sys.exit(1)
+
+    tracker = SatelliteTracker()
+    tracker.load_catalog(catalog)
+    events = screen(tracker, duration_s=args.hours * 3600, step_s=args.step,
+                    threshold_km=args.threshold, primary=args.primary)
+
+    print(f"\n{len(events)} close approaches under {args.threshold} km in the next {args.hours:g} h")
+    for event in events:
+        print(f"   {event['tca_str']}  {event['satellite_1']:<24} {event['satellite_2']:<24} "
+              f"{event['miss_distance_km']:8.3f} km  {event['relative_speed_km_s']:6.2f} km/s")
+
+
+if __name__ == "__main__":
+    main()
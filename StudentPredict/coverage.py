@@ -0,0 +1,236 @@
+# coverage.py
+"""
+Coverage and revisit-time analysis on a latitude/longitude grid
+A grid cell is covered when at least one satellite is above min_elevation
+seen from it. The footprint test is one matrix product per satellite: the
+cell's unit vector against the satellite's direction, compared with the
+cosine of the footprint's Earth central angle. Time is processed in chunks
+so memory stays bounded (cells x steps per chunk).
+
+Usage:
+    python coverage.py "NOAA 15" "NOAA 18" "NOAA 19" --category weather --hours 24 --grid 2
+"""
+
+import argparse
+import sys
+import numpy as np
+from config import MIN_ELEVATION, COVERAGE_GRID_DEG, COVERAGE_STEP_S
+from propagation import DAY_S, EARTH_RADIUS_KM, propagate_itrs
+
+CHUNK_ELEMENTS = 20_000_000  # Cells x time steps evaluated per chunk
+
+INTERVAL_DTYPE = np.dtype([('lat_index', '<i4'), ('lon_index', '<i4'),
+                           ('start_jd', '<f8'), ('end_jd', '<f8')])
+
+
+def make_grid(step_deg=COVERAGE_GRID_DEG, lat_range=(-90, 90), lon_range=(-180, 180)):
+    """Cell centre latitudes and longitudes (degrees) of a regular grid"""
+    lat = np.arange(lat_range[0] + step_deg / 2, lat_range[1], step_deg)
+    lon = np.arange(lon_range[0] + step_deg / 2, lon_range[1], step_deg)
+    return lat, lon
+
+
+def cell_vectors(lat, lon):
+    """Unit vectors (cells, 3), Earth-fixed, of the grid cell centres (row-major: lat, then lon)"""
+    lat_r, lon_r = np.meshgrid(np.radians(lat), np.radians(lon), indexing='ij')
+    return np.stack([np.cos(lat_r) * np.cos(lon_r), np.cos(lat_r) * np.sin(lon_r),
+                     np.sin(lat_r)], axis=-1).reshape(-1, 3)
+
+
+def footprint_cosine(radius_km, min_elevation):
+    """Cosine of the Earth central angle of the footprint (spherical Earth)"""
+    el = np.radians(min_elevation)
+    ratio = np.clip(EARTH_RADIUS_KM / radius_km * np.cos(el), -1.0, 1.0)
+    return np.cos(np.arccos(ratio) - el)
+
+
+def covered_cells(cells, r, min_elevation):
+    """Boolean (cells, T): covered by at least one of the satellites r (S, T, 3) Earth-fixed
+
+    Dot products are float32 (half the memory traffic of float64): the cell
+    edges move by a few hundredths of a degree at most.
+    """
+    cells = np.asarray(cells, dtype=np.float32)
+    covered = np.zeros((len(cells), r.shape[1]), dtype=bool)
+    dots = np.empty(covered.shape, dtype=np.float32)
+    inside = np.empty(covered.shape, dtype=bool)
+    for sat in r:
+        radius = np.linalg.norm(sat, axis=-1)
+        ok = ~np.isnan(radius)
+        if not ok.any():
+            continue
+        radius = np.where(ok, radius, EARTH_RADIUS_KM)
+        direction = np.where(ok[:, None], sat / radius[:, None], 0.0).astype(np.float32)
+        threshold = footprint_cosine(radius, min_elevation).astype(np.float32)
+        threshold[~ok] = 2.0  # Failed propagation: covers nothing
+        np.matmul(cells, direction.T, out=dots)
+        np.greater_equal(dots, threshold, out=inside)
+        covered |= inside
+    return covered
+
+
+def covered_now(tracker, sat_names, t=None, step_deg=COVERAGE_GRID_DEG, min_elevation=MIN_ELEVATION):
+    """(lat, lon, covered (lat, lon) bool): regions covered at one instant"""
+    t = t if t is not None else tracker.now()
+    lat, lon = make_grid(step_deg)
+    satrecs = [s.model for s in (tracker.satellite_for_time(n, t) for n in sat_names) if s is not None]
+    if not satrecs:
+        return lat, lon, np.zeros((len(lat), len(lon)), dtype=bool)
+    r, v, errors = propagate_itrs(satrecs, tracker.ts.tt_jd(np.atleast_1d(t.tt)))
+    covered = covered_cells(cell_vectors(lat, lon), r, min_elevation)
+    return lat, lon, covered[:, 0].reshape(len(lat), len(lon))
+
+
+def analyze(tracker, sat_names, start_time=None, duration_s=DAY_S, step_s=COVERAGE_STEP_S,
+            step_deg=COVERAGE_GRID_DEG, min_elevation=MIN_ELEVATION, chunk_elements=CHUNK_ELEMENTS):
+    """Coverage of a grid by a set of satellites over a time window
+
+    Intervals are resolved to the time step: an access starts at its first
+    covered sample and ends at the first uncovered one (or the window end).
+    Returns a dict of (lat, lon) grids: coverage_s, fraction, accesses,
+    max_revisit_s / mean_revisit_s (gaps between consecutive accesses, NaN
+    with fewer than two), plus lat, lon, start, step_s, duration_s and
+    intervals (INTERVAL_DTYPE, sorted by cell then time).
+    """
+    start = start_time if start_time is not None else tracker.now()
+    lat, lon = make_grid(step_deg)
+    cells = cell_vectors(lat, lon)
+    shape = (len(lat), len(lon))
+
+    satrecs = [s.model for s in (tracker.satellite_for_time(n, start) for n in sat_names) if s is not None]
+    steps = int(duration_s // step_s) + 1
+    chunk = max(1, chunk_elements // len(cells))
+
+    covered_steps = np.zeros(len(cells), dtype=np.int64)
+    previous = np.zeros(len(cells), dtype=bool)
+    edges = []  # (cells, step indices, +1 rise / -1 set) per chunk
+    for first in range(0, steps, chunk):
+        offsets = np.arange(first, min(first + chunk, steps)) * step_s
+        if satrecs:
+            t = tracker.ts.tt_jd(start.whole, start.tt_fraction + offsets / DAY_S)
+            r, v, errors = propagate_itrs(satrecs, t)
+            covered = covered_cells(cells, r, min_elevation)
+        else:
+            covered = np.zeros((len(cells), len(offsets)), dtype=bool)
+        covered_steps += covered.sum(axis=1)
+
+        change = np.diff(np.concatenate([previous[:, None], covered], axis=1).view(np.int8), axis=1)
+        cell, k = np.nonzero(change)
+        edges.append((cell, first + k, change[cell, k]))
+        previous = covered[:, -1]
+
+    # Accesses still open at the end of the window close there
+    open_cells = np.flatnonzero(previous)
+    edges.append((open_cells, np.full(len(open_cells), steps), np.full(len(open_cells), -1, dtype=np.int8)))
+
+    cell = np.concatenate([e[0] for e in edges])
+    index = np.concatenate([e[1] for e in edges])
+    kind = np.concatenate([e[2] for e in edges])
+    order = np.lexsort((index, cell))
+    cell, index, kind = cell[order], index[order], kind[order]
+    # Per cell, rises and sets alternate: rise, set, rise, set...
+    rises, sets = kind == 1, kind == -1
+    access_cell = cell[rises]
+    start_s = index[rises] * step_s
+    end_s = np.minimum(index[sets] * step_s, duration_s)
+
+    intervals = np.zeros(len(access_cell), dtype=INTERVAL_DTYPE)
+    intervals['lat_index'], intervals['lon_index'] = np.divmod(access_cell, len(lon))
+    intervals['start_jd'] = start.tt + start_s / DAY_S
+    intervals['end_jd'] = start.tt + end_s / DAY_S
+
+    accesses = np.bincount(access_cell, minlength=len(cells))
+    same_cell = access_cell[1:] == access_cell[:-1]
+    gaps = (start_s[1:] - end_s[:-1])[same_cell]
+    gap_cell = access_cell[1:][same_cell]
+    gap_count = np.bincount(gap_cell, minlength=len(cells))
+    max_gap = np.full(len(cells), np.nan)
+    if len(gaps):
+        max_gap_known = np.zeros(len(cells))
+        np.maximum.at(max_gap_known, gap_cell, gaps)
+        max_gap = np.where(gap_count > 0, max_gap_known, np.nan)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean_gap = np.bincount(gap_cell, weights=gaps, minlength=len(cells)) / gap_count
+    mean_gap[gap_count == 0] = np.nan
+
+    coverage_s = np.bincount(access_cell, weights=end_s - start_s, minlength=len(cells))
+    return {
+        'lat': lat,
+        'lon': lon,
+        'start': start,
+        'step_s': step_s,
+        'duration_s': duration_s,
+        'coverage_s': coverage_s.reshape(shape),
+        'fraction': (covered_steps / steps).reshape(shape),
+        'accesses': accesses.reshape(shape),
+        'max_revisit_s': max_gap.reshape(shape),
+        'mean_revisit_s': mean_gap.reshape(shape),
+        'intervals': intervals,
+    }
+
+
+def cell_summary(result, lat, lon):
+    """Coverage figures of the cell containing (lat, lon)"""
+    i = int(np.argmin(np.abs(result['lat'] - lat)))
+    j = int(np.argmin(np.abs(result['lon'] - lon)))
+    intervals = result['intervals']
+    mine = intervals[(intervals['lat_index'] == i) & (intervals['lon_index'] == j)]
+    return {
+        'lat': float(result['lat'][i]),
+        'lon': float(result['lon'][j]),
+        'coverage_s': float(result['coverage_s'][i, j]),
+        'fraction': float(result['fraction'][i, j]),
+        'accesses': int(result['accesses'][i, j]),
+        'max_revisit_s': float(result['max_revisit_s'][i, j]),
+        'mean_revisit_s': float(result['mean_revisit_s'][i, j]),
+        'intervals': mine,
+    }
+
+
+def main():
+    from tle_manager import TLEManager
+    from tracker import SatelliteTracker
+    from config import OBSERVER_LAT, OBSERVER_LON
+    from multi_station import format_duration
+
+    parser = argparse.ArgumentParser(description='Coverage and revisit times of a set of satellites')
+    parser.add_argument('satellites', nargs='*', help='Satellite names (default: whole category)')
+    parser.add_argument('--category', default='weather', help='TLE category (default: weather)')
+    parser.add_argument('--hours', type=float, default=24, help='Analysis window (default: 24 h)')
+    parser.add_argument('--grid', type=float, default=COVERAGE_GRID_DEG, help='Grid step in degrees')
+    parser.add_argument('--step', type=float, default=COVERAGE_STEP_S, help='Time step in seconds')
+    parser.add_argument('--min-elevation', type=float, default=MIN_ELEVATION, help='Minimum elevation')
+    args = parser.parse_args()
+
+    tle_mgr = TLEManager()
+    catalog = tle_mgr.load_catalog(args.category)
+    if catalog is None:
+        tle_mgr.get_tles(args.category)
+        catalog = tle_mgr.load_catalog(args.category)
+    if catalog is None:
+        print(f"✗ No TLEs for category '{args.category}'")
+        sys.exit(1)
+
+    tracker = SatelliteTracker()
+    tracker.load_catalog(catalog)
+    names = []
+    for name in args.satellites or catalog.names:
+        index = catalog.find(name)
+        if index is None:
+            print(f"✗ Satellite not found: {name}")
+            continue
+        names.append(catalog.names[index])
+
+    result = analyze(tracker, names, duration_s=args.hours * 3600, step_s=args.step,
+                     step_deg=args.grid, min_elevation=args.min_elevation)
+    here = cell_summary(result, OBSERVER_LAT, OBSERVER_LON)
+    print(f"\n{len(names)} satellites, {args.hours:g} h, {args.grid:g}° grid, above {args.min_elevation:g}°")
+    print(f"   Mean coverage: {result['fraction'].mean() * 100:.1f}% of the time")
+    print(f"   Observer cell: {here['accesses']} accesses, covered {format_duration(here['coverage_s'])}")
+    if not np.isnan(here['max_revisit_s']):
+        print(f"   Revisit: mean {format_duration(here['mean_revisit_s'])}, "
+              f"longest gap {format_duration(here['max_revisit_s'])}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,388 @@
+# event_core.py
+"""
+Event-driven scheduling core: pub/sub bus, AOS/LOS events, position updates
+An asyncio loop sleeps until the next pass event (computed from the pass
+table) or the next subscriber deadline, instead of polling on fixed timers.
+Position updates are only computed while a watched satellite is above the
+horizon, unless a subscriber asked for slower idle updates, so an idle
+station costs next to no CPU.
+
+The loop runs in its own thread so any front end can use it: callbacks are
+called in that thread (the GUI forwards them through a queued Qt signal).
+
+Usage: python event_core.py "ISS (ZARYA)" "NOAA 19" --category stations
+"""
+
+import argparse
+import asyncio
+import bisect
+import sys
+import threading
+import time
+from config import MIN_ELEVATION, EVENT_PASS_DAYS
+from propagation import DAY_S
+from sim_clock import compute_frames
+from instrumentation import record_error
+
+# Topics
+POSITION = 'position'   # {'time', 'positions': {name: position dict}, 'up': set of names}
+AOS = 'aos'             # {'satellite', 'time', 'pass'}
+LOS = 'los'             # {'satellite', 'time', 'pass'}
+PASSES_EXPIRED = 'passes_expired'  # {'time'}: the clock left the pass table, compute a new one
+
+
+class Subscription:
+    """One subscriber of a topic; position subscribers also set their update rates"""
+
+    def __init__(self, topic, callback, interval_s=None, idle_interval_s=None, satellites=None):
+        self.topic = topic
+        self.callback = callback
+        self.interval_s = interval_s            # While a watched satellite is above the horizon
+        self.idle_interval_s = idle_interval_s  # Otherwise (None: no updates at all)
+        self.satellites = set(satellites) if satellites is not None else None
+        self.due = 0.0  # time.monotonic() of the next update
+
+
+class EventBus:
+    """Topic -> subscriptions; publish() calls the callbacks in the publisher's thread"""
+
+    def __init__(self):
+        self._topics = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, topic, callback, interval_s=None, idle_interval_s=None, satellites=None):
+        subscription = Subscription(topic, callback, interval_s, idle_interval_s, satellites)
+        with self._lock:
+            self._topics.setdefault(topic, []).append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscriptions = self._topics.get(subscription.topic, [])
+            if subscription in subscriptions:
+                subscriptions.remove(subscription)
+
+    def subscribers(self, topic):
+        with self._lock:
+            return list(self._topics.get(topic, ()))
+
+    def publish(self, topic, payload, subscriptions=None):
+        """Deliver payload to every subscriber of topic (or to the given subscriptions)"""
+        if subscriptions is None:
+            subscriptions = self.subscribers(topic)
+        for subscription in subscriptions:
+            try:
+                subscription.callback(payload)
+            except Exception as e:
+                record_error('event_bus', e)
+                print(f"✗ Error in {topic} subscriber: {e}")
+
+
+class EventCore:
+    """Schedules AOS/LOS events and rate-limited position updates on an asyncio loop
+
+    Follows a SimulationClock when given one: events are scheduled at the
+    clock's speed, and clock_changed() must be called after a jump, a speed
+    change or a pause.
+    """
+
+    def __init__(self, ts, clock=None, bus=None):
+        self.ts = ts
+        self.clock = clock
+        self.bus = bus if bus is not None else EventBus()
+        self.names = []
+        self.satrecs = []
+        self.events = []  # (TT Julian date, AOS/LOS, satellite, pass), in time order
+        self.times = []
+        self.table = None  # (start, end) TT Julian dates covered by the pass table
+        self.up = set()
+        self._next = 0  # events[:_next] are in the past of the clock
+        self._expired = False
+        self._loop = None
+        self._wakeup = None
+        self._thread = None
+        self._running = False
+
+    def now(self):
+        return self.clock.now() if self.clock is not None else self.ts.now()
+
+    def _speed(self):
+        if self.clock is None or self.clock.live:
+            return 1.0
+        return 0.0 if self.clock.paused else self.clock.speed
+
+    # Thread-safe API
+
+    def start(self):
+        """Start the loop in a background thread"""
+        if self._thread is not None:
+            return
+        ready = threading.Event()
+        self._thread = threading.Thread(target=self._thread_main, args=(ready,),
+                                        name='event-core', daemon=True)
+        self._thread.start()
+        ready.wait()
+
+    def stop(self):
+        if self._thread is None:
+            return
+        self._loop.call_soon_threadsafe(self._stop)
+        self._thread.join(timeout=2)
+        self._thread = None
+
+    def subscribe(self, topic, callback, interval_s=None, idle_interval_s=None, satellites=None):
+        """Subscribe to a topic; for POSITION, interval_s applies while a watched
+        satellite is up and idle_interval_s otherwise (None: no idle updates)"""
+        subscription = self.bus.subscribe(topic, callback, interval_s, idle_interval_s, satellites)
+        self._call(self._wake)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        self.bus.unsubscribe(subscription)
+
+    def set_interval(self, subscription, interval_s, idle_interval_s=None):
+        """Change the update rates of a POSITION subscription"""
+        def update():
+            subscription.interval_s = interval_s
+            subscription.idle_interval_s = idle_interval_s
+            subscription.due = 0.0
+            self._wake()
+        self._call(update)
+
+    def watch(self, names, satrecs, passes_by_satellite, start_jd, end_jd):
+        """Satellites to publish positions for, and the pass table {name: [pass, ...]}
+        covering [start_jd, end_jd] (TT) that AOS/LOS events come from"""
+        events = []
+        for name, passes in passes_by_satellite.items():
+            for p in passes:
+                events.append((p['rise_time'].tt, AOS, name, p))
+                events.append((p['set_time'].tt, LOS, name, p))
+        events.sort(key=lambda event: event[0])
+        self._call(self._set_watch, list(names), list(satrecs), events, (start_jd, end_jd))
+
+    def clock_changed(self):
+        """The simulation clock jumped, changed speed or was paused/resumed"""
+        self._call(self._resync)
+
+    # Loop thread
+
+    def _call(self, function, *args):
+        """Run function in the loop thread (directly when the loop is not running)"""
+        if self._thread is not None:
+            self._loop.call_soon_threadsafe(function, *args)
+        else:
+            function(*args)
+
+    def _thread_main(self, ready):
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        self._wakeup = asyncio.Event()
+        ready.set()
+        try:
+            self._loop.run_until_complete(self._run())
+        finally:
+            self._loop.close()
+
+    async def _run(self):
+        self._running = True
+        while self._running:
+            self._wakeup.clear()
+            delay = self._step()
+            try:
+                # Sleep until the next deadline, or until something changes
+                await asyncio.wait_for(self._wakeup.wait(), delay)
+            except asyncio.TimeoutError:
+                pass
+
+    def _stop(self):
+        self._running = False
+        self._wake()
+
+    def _wake(self):
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def _set_watch(self, names, satrecs, events, table):
+        self.names, self.satrecs = names, satrecs
+        self.events = events
+        self.times = [event[0] for event in events]
+        self.table = table
+        self._resync()
+
+    def _resync(self):
+        """Recompute the state at the clock's time without publishing the events skipped over"""
+        jd = self.now().tt
+        self._next = bisect.bisect_right(self.times, jd)
+        self.up = {name for start, kind, name, p in self.events
+                   if kind == AOS and start <= jd < p['set_time'].tt}
+        self._expired = False
+        self._refresh_positions()
+        self._wake()
+
+    def _refresh_positions(self):
+        for subscription in self.bus.subscribers(POSITION):
+            subscription.due = 0.0
+
+    def _fire(self, kind, name, p):
+        if kind == AOS:
+            self.up.add(name)
+        else:
+            self.up.discard(name)
+        self._refresh_positions()  # Rates change with the number of satellites up
+        self.bus.publish(kind, {'satellite': name,
+                                'time': p['rise_time'] if kind == AOS else p['set_time'],
+                                'pass': p})
+
+    def _step(self):
+        """Publish whatever is due; return the seconds until the next deadline (None: none)"""
+        t = self.now()
+        jd = t.tt
+        speed = self._speed()
+
+        # Pass events crossed since the last step, in the direction the clock runs
+        while self._next < len(self.events) and self.times[self._next] <= jd:
+            start, kind, name, p = self.events[self._next]
+            self._next += 1
+            self._fire(kind, name, p)
+        while self._next > 0 and self.times[self._next - 1] > jd:
+            self._next -= 1
+            start, kind, name, p = self.events[self._next]
+            self._fire(LOS if kind == AOS else AOS, name, p)
+
+        if self.table is not None and not self._expired and not self.table[0] <= jd < self.table[1]:
+            self._expired = True
+            self.bus.publish(PASSES_EXPIRED, {'time': t})
+
+        delays = []
+        if speed > 0:
+            if self._next < len(self.events):
+                delays.append((self.times[self._next] - jd) * DAY_S / speed)
+            if self.table is not None and not self._expired:
+                delays.append((self.table[1] - jd) * DAY_S / speed)
+        elif speed < 0:
+            if self._next > 0:
+                delays.append((jd - self.times[self._next - 1]) * DAY_S / -speed)
+            if self.table is not None and not self._expired:
+                delays.append((jd - self.table[0]) * DAY_S / -speed)
+
+        delays += self._publish_positions(t, paused=speed == 0)
+        return max(min(delays), 0.0) + 1e-3 if delays else None
+
+    def _publish_positions(self, t, paused):
+        """Send position updates to the subscribers that are due; returns their next deadlines"""
+        if paused or not self.names:
+            return []
+        now = time.monotonic()
+        due, deadlines = [], []
+        for subscription in self.bus.subscribers(POSITION):
+            interval = subscription.interval_s if self.up else subscription.idle_interval_s
+            if interval is None:
+                continue
+            if now >= subscription.due:
+                due.append(subscription)
+                subscription.due = now + interval
+            deadlines.append(subscription.due - now)
+
+        if due:
+            # One vectorized propagation shared by every subscriber due now
+            batch = compute_frames(self.ts, self.names, self.satrecs, t.tt, 1, 1)
+            positions = batch.positions(t.tt, t.utc_iso())
+            up = set(self.up)
+            for subscription in due:
+                selected = positions
+                if subscription.satellites is not None:
+                    selected = {name: position for name, position in positions.items()
+                                if name in subscription.satellites}
+                self.bus.publish(POSITION, {'time': t, 'positions': selected, 'up': up}, [subscription])
+        return deadlines
+
+
+def log_events(core, write=print, position_interval_s=None):
+    """Logging consumer: AOS/LOS lines, and positions of the satellites above
+    the horizon every position_interval_s seconds (never while none is up)"""
+    def on_aos(event):
+        p = event['pass']
+        write(f"{event['time'].utc_iso()}  AOS  {event['satellite']:<24} "
+              f"max {p['max_elevation']:.1f}° at {p['max_time_str']}")
+
+    def on_los(event):
+        write(f"{event['time'].utc_iso()}  LOS  {event['satellite']}")
+
+    def on_position(update):
+        for name in sorted(update['up']):
+            position = update['positions'].get(name)
+            if position:
+                write(f"{position['time']}  POS  {name:<24} az {position['azimuth']:6.1f}°  "
+                      f"el {position['elevation']:5.1f}°  {position['distance_km']:7.1f} km")
+
+    core.subscribe(AOS, on_aos)
+    core.subscribe(LOS, on_los)
+    if position_interval_s:
+        core.subscribe(POSITION, on_position, interval_s=position_interval_s)
+
+
+def main():
+    from tle_manager import TLEManager
+    from tracker import SatelliteTracker
+    from predictor import PassPredictor
+
+    parser = argparse.ArgumentParser(description='Log AOS/LOS events (and positions during passes)')
+    parser.add_argument('satellites', nargs='+', help='Satellite names')
+    parser.add_argument('--category', default='stations', help='TLE category (default: stations)')
+    parser.add_argument('--interval', type=float, default=10,
+                        help='Seconds between position lines during passes (0: none)')
+    parser.add_argument('--rotator', action='store_true', help='Also print the rotator commands')
+    args = parser.parse_args()
+
+    tle_mgr = TLEManager()
+    catalog = tle_mgr.load_catalog(args.category)
+    if catalog is None:
+        tle_mgr.get_tles(args.category)
+        catalog = tle_mgr.load_catalog(args.category)
+    if catalog is None:
+        print(f"✗ No TLEs for category '{args.category}'")
+        sys.exit(1)
+
+    tracker = SatelliteTracker()
+    tracker.load_catalog(catalog)
+    predictor = PassPredictor(tracker)
+    names = []
+    for name in args.satellites:
+        index = catalog.find(name)
+        if index is None:
+            print(f"✗ Satellite not found: {name}")
+        else:
+            names.append(catalog.names[index])
+    if not names:
+        sys.exit(1)
+
+    core = EventCore(tracker.ts)
+
+    def refresh(event=None):
+        start = tracker.now()
+        passes = {name: predictor.find_passes(name, EVENT_PASS_DAYS, MIN_ELEVATION, start) for name in names}
+        satrecs = [tracker.satellite_for_time(name, start).model for name in names]
+        core.watch(names, satrecs, passes, start.tt, start.tt + EVENT_PASS_DAYS)
+        upcoming = sorted((p['rise_time'].tt, name, p) for name, ps in passes.items() for p in ps)
+        if upcoming:
+            jd, name, p = upcoming[0]
+            print(f"✓ {len(upcoming)} passes in the next {EVENT_PASS_DAYS:g} day(s), "
+                  f"next: {name} at {p['rise_time_str']}")
+
+    log_events(core, position_interval_s=args.interval or None)
+    core.subscribe(PASSES_EXPIRED, refresh)
+    if args.rotator:
+        from rotator import RotatorFollower
+        RotatorFollower(tracker, lambda az, el: print(f"   ROT  az {az:6.1f}°  el {el:5.1f}°")).attach(core)
+
+    refresh()
+    core.start()
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        core.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,258 @@
+# export.py
+"""
+Time-range ephemeris export (CSV, Parquet or NumPy .npz)
+Satellites are propagated in vectorized batches of time steps and every batch
+is written out before the next one is computed, so memory stays bounded
+whatever the length of the time range.
+
+Usage:
+    python export.py "ISS (ZARYA)" "NOAA 19" --category stations --days 7 --step 1 -o iss.parquet
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import zipfile
+import numpy as np
+from config import OBSERVER_LAT, OBSERVER_LON, OBSERVER_ELEVATION
+from propagation import DAY_S, sgp4_times, propagate_itrs, geodetic, observer_frame, look_angles
+
+CHUNK_ROWS = 250_000  # Rows (satellites x time steps) propagated and written per batch
+UNIX_EPOCH_JD = 2440587.5
+
+COLUMNS = (
+    'time', 'satellite', 'norad_id', 'latitude', 'longitude', 'altitude_km',
+    'x_km', 'y_km', 'z_km', 'azimuth', 'elevation', 'distance_km', 'range_rate_km_s',
+)
+
+# printf formats for CSV output (time and satellite are written as strings)
+CSV_FORMATS = {
+    'norad_id': '%d', 'latitude': '%.6f', 'longitude': '%.6f', 'altitude_km': '%.4f',
+    'x_km': '%.4f', 'y_km': '%.4f', 'z_km': '%.4f', 'azimuth': '%.4f', 'elevation': '%.4f',
+    'distance_km': '%.4f', 'range_rate_km_s': '%.6f',
+}
+
+
+def iter_ephemeris(tracker, sat_names, start, duration_s, step_s, chunk_rows=CHUNK_ROWS,
+                   observer=(OBSERVER_LAT, OBSERVER_LON, OBSERVER_ELEVATION)):
+    """Yield the ephemeris as chunks of columns {name: array}, rows ordered by time then satellite
+
+    Positions are Earth-fixed (km), azimuth/elevation/range are seen from
+    `observer` (lat, lon, elevation in m). Failed propagations give NaN rows.
+    """
+    satellites = [tracker.satellite_for_time(name, start) for name in sat_names]
+    missing = [name for name, sat in zip(sat_names, satellites) if sat is None]
+    if missing:
+        raise KeyError(f"Unknown satellites: {', '.join(missing)}")
+    satrecs = [sat.model for sat in satellites]
+    names = np.array(sat_names)
+    norad_ids = np.array([satrec.satnum for satrec in satrecs], dtype=np.uint32)
+
+    position, rotation = observer_frame(*observer)
+    positions, rotations = position[None], rotation[None]
+
+    steps = int(duration_s // step_s) + 1
+    steps_per_chunk = max(1, chunk_rows // len(satrecs))
+    for first in range(0, steps, steps_per_chunk):
+        offsets = np.arange(first, min(first + steps_per_chunk, steps)) * step_s
+        t = tracker.ts.tt_jd(start.whole, start.tt_fraction + offsets / DAY_S)
+
+        r, v, errors = propagate_itrs(satrecs, t)
+        # (N, T, ...) -> (T, N, ...) so that rows come out time-major
+        r, v = r.swapaxes(0, 1), v.swapaxes(0, 1)
+        lat, lon, alt = geodetic(r)
+        az, el, distance = look_angles(r, positions, rotations)
+        relative = r - position
+        range_rate = np.einsum('...i,...i', relative, v) / distance[0]
+
+        jd, fraction = sgp4_times(t)
+        unix_ms = np.round(((jd - UNIX_EPOCH_JD) + fraction) * DAY_S * 1000).astype(np.int64)
+        times = unix_ms.astype('datetime64[ms]')
+
+        count = len(offsets)
+        yield {
+            'time': np.repeat(times, len(satrecs)),
+            'satellite': np.tile(names, count),
+            'norad_id': np.tile(norad_ids, count),
+            'latitude': lat.ravel(),
+            'longitude': lon.ravel(),
+            'altitude_km': alt.ravel(),
+            'x_km': r[..., 0].ravel(),
+            'y_km': r[..., 1].ravel(),
+            'z_km': r[..., 2].ravel(),
+            'azimuth': az[0].ravel(),
+            'elevation': el[0].ravel(),
+            'distance_km': distance[0].ravel(),
+            'range_rate_km_s': range_rate.ravel(),
+        }
+
+
+class CSVWriter:
+    """Appends chunks to a CSV file with a header line"""
+
+    def __init__(self, path):
+        self.file = open(path, 'w', newline='')
+        self.file.write(','.join(COLUMNS) + '\n')
+        self.line_format = ','.join(['%s', '"%s"'] + [CSV_FORMATS[c] for c in COLUMNS[2:]]) + '\n'
+
+    def write(self, chunk):
+        columns = [np.char.add(np.datetime_as_string(chunk['time'], unit='ms'), 'Z')]
+        columns += [chunk[c] for c in COLUMNS[1:]]
+        line_format = self.line_format
+        self.file.write(''.join(line_format % row for row in zip(*columns)))
+
+    def close(self):
+        self.file.close()
+
+
+class ParquetWriter:
+    """Appends chunks as row groups of a Parquet file (needs pyarrow)"""
+
+    def __init__(self, path):
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise ImportError("Parquet export needs pyarrow (pip install pyarrow)") from None
+        self.pa = pyarrow
+        self.path = path
+        self.writer = None
+        self.parquet = pyarrow.parquet
+
+    def write(self, chunk):
+        table = self.pa.table({c: chunk[c] for c in COLUMNS})
+        if self.writer is None:
+            self.writer = self.parquet.ParquetWriter(self.path, table.schema)
+        self.writer.write_table(table)
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+
+class NpzWriter:
+    """Writes a .npz archive (one array per column) without holding the columns in memory
+
+    Chunks are appended to one raw temporary file per column; close() then
+    copies them into the archive behind .npy headers holding the final length.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.tmpdir = tempfile.mkdtemp(prefix='.export-', dir=os.path.dirname(os.path.abspath(path)))
+        self.files = {}
+        self.dtypes = {}
+        self.rows = 0
+
+    def write(self, chunk):
+        if not self.files:
+            for c in COLUMNS:
+                self.files[c] = open(os.path.join(self.tmpdir, c), 'wb')
+                # Fixed-width strings must keep the same width in every chunk
+                self.dtypes[c] = chunk[c].dtype
+        for c in COLUMNS:
+            np.ascontiguousarray(chunk[c], dtype=self.dtypes[c]).tofile(self.files[c])
+        self.rows += len(chunk['time'])
+
+    def close(self):
+        try:
+            with zipfile.ZipFile(self.path, 'w', zipfile.ZIP_STORED, allowZip64=True) as archive:
+                for c in COLUMNS:
+                    if c not in self.files:
+                        continue
+                    self.files[c].close()
+                    header = {'descr': np.lib.format.dtype_to_descr(self.dtypes[c]),
+                              'fortran_order': False, 'shape': (self.rows,)}
+                    with archive.open(f'{c}.npy', 'w', force_zip64=True) as member, \
+                            open(os.path.join(self.tmpdir, c), 'rb') as data:
+                        np.lib.format.write_array_header_2_0(member, header)
+                        shutil.copyfileobj(data, member, 1 << 20)
+        finally:
+            shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+
+WRITERS = {'csv': CSVWriter, 'parquet': ParquetWriter, 'npz': NpzWriter}
+
+
+def export_format(path, fmt=None):
+    """Output format from the explicit name or the file extension"""
+    fmt = (fmt or os.path.splitext(path)[1].lstrip('.')).lower()
+    if fmt not in WRITERS:
+        raise ValueError(f"Unknown export format '{fmt}' (use {', '.join(WRITERS)})")
+    return fmt
+
+
+def export_ephemeris(tracker, sat_names, path, start, duration_s, step_s, fmt=None,
+                     chunk_rows=CHUNK_ROWS):
+    """Propagate `sat_names` from `start` over `duration_s` every `step_s` seconds into `path`
+
+    Returns the number of rows written.
+    """
+    writer = WRITERS[export_format(path, fmt)](path)
+    rows = 0
+    try:
+        for chunk in iter_ephemeris(tracker, sat_names, start, duration_s, step_s, chunk_rows):
+            writer.write(chunk)
+            rows += len(chunk['time'])
+    finally:
+        writer.close()
+    return rows
+
+
+def main():
+    from tle_manager import TLEManager
+    from tracker import SatelliteTracker
+
+    parser = argparse.ArgumentParser(description='Export satellite ephemerides over a time range')
+    parser.add_argument('satellites', nargs='*', help='Satellite names (default: whole category)')
+    parser.add_argument('--category', default='stations', help='TLE category (default: stations)')
+    parser.add_argument('--start', help='Start time, ISO UTC like 2026-10-16T12:00:00 (default: now)')
+    parser.add_argument('--days', type=float, default=1, help='Duration in days (default: 1)')
+    parser.add_argument('--step', type=float, default=60, help='Step in seconds (default: 60)')
+    parser.add_argument('--format', choices=sorted(WRITERS), help='Output format (default: from extension)')
+    parser.add_argument('--chunk-rows', type=int, default=CHUNK_ROWS, help='Rows per batch')
+    parser.add_argument('-o', '--output', required=True, help='Output file (.csv, .parquet or .npz)')
+    args = parser.parse_args()
+
+    tle_mgr = TLEManager()
+    catalog = tle_mgr.load_catalog(args.category)
+    if catalog is None:
+        tle_mgr.get_tles(args.category)
+        catalog = tle_mgr.load_catalog(args.category)
+    if catalog is None:
+        print(f"✗ No TLEs for category '{args.category}'")
+        sys.exit(1)
+
+    tracker = SatelliteTracker()
+    tracker.load_catalog(catalog)
+    tracker.use_history(tle_mgr.history)
+
+    names = []
+    for name in args.satellites or catalog.names:
+        index = catalog.find(name)
+        if index is None:
+            print(f"✗ Satellite not found: {name}")
+            continue
+        names.append(catalog.names[index])
+    if not names:
+        sys.exit(1)
+
+    if args.start:
+        from datetime import datetime, timezone
+        start = tracker.ts.from_datetime(datetime.fromisoformat(args.start).replace(tzinfo=timezone.utc))
+    else:
+        start = tracker.now()
+
+    try:
+        rows = export_ephemeris(tracker, names, args.output, start, args.days * DAY_S, args.step,
+                                args.format, args.chunk_rows)
+    except (ImportError, ValueError) as e:
+        print(f"✗ {e}")
+        sys.exit(1)
+    print(f"✓ Exported {rows} rows ({len(names)} satellites) to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
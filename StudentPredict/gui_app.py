@@ -5,26 +5,38 @@ Version avec actualisation auto + direction satellite + texte lisible
 """
 
 import sys
+import time
 import warnings
 warnings.filterwarnings('ignore')
 
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
-                             QHBoxLayout, QPushButton, QListWidget, QLabel, 
-                             QGroupBox, QTextEdit, QSplitter, QComboBox)
-from PyQt6.QtCore import QTimer, Qt
-from PyQt6.QtGui import QFont
-import matplotlib.pyplot as plt
+                             QHBoxLayout, QPushButton, QLabel, QTableView, QHeaderView,
+                             QAbstractItemView, QLineEdit, QDoubleSpinBox,
+                             QGroupBox, QTextEdit, QSplitter, QComboBox, QSplashScreen,
+                             QSlider)
+from PyQt6.QtCore import QTimer, Qt, QThread, QObject, pyqtSignal
+from PyQt6.QtGui import QFont, QPixmap, QColor
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.figure import Figure
-import matplotlib.patches as mpatches
 import numpy as np
 from datetime import datetime
-import pytz
 
 from tle_manager import TLEManager
 from tracker import SatelliteTracker
-from predictor import PassPredictor
-from satellite_db import get_satellite_info
+from predictor import PassPredictor, ALWAYS
+from satellite_db import get_satellite_info, downlink_frequencies
+from sim_clock import SimulationClock, FrameCache, compute_frames
+from event_core import EventCore, POSITION, AOS, LOS, PASSES_EXPIRED
+from alarms import AlarmEngine
+from coverage import analyze as analyze_coverage, cell_summary
+from multi_station import format_duration
+from gui_models import SatelliteListModel, PassTableModel
+from config import (SIM_SPEEDS, SIM_PRECOMPUTE_SPEED, SIM_FRAME_INTERVAL_MS, MIN_ELEVATION,
+                    EVENT_PASS_DAYS, EVENT_DISPLAY_INTERVAL_S, EVENT_INFO_INTERVAL_S,
+                    EVENT_IDLE_INTERVAL_S, ANIM_FPS, ANIM_KEYFRAME_S, ANIM_REDRAW_S, OBSERVER_LAT, OBSERVER_LON,
+                    ALARM_AOS_LEAD_S, GUI_PASS_TABLE_CHUNK, GUI_PASS_PERIODS_H, GUI_FREQUENCY_BANDS)
+import instrumentation
+from instrumentation import instrumented
 
 
 class InteractiveEarthMapWidget(FigureCanvas):
@@ -47,6 +59,40 @@ class InteractiveEarthMapWidget(FigureCanvas):
         self.pan_start = None
         self.update_pending = False
         
+        # La carte (et cartopy) n'est créée qu'au premier affichage
+        self.ax = None
+        self.has_cartopy = False
+        self.pending_positions = None
+        
+        # Couche de couverture (fraction du temps couverte, grille lat/lon)
+        self.coverage = None
+        
+        # Couche animée (blitting): marqueurs redessinés seuls sur le fond mémorisé
+        self.background = None
+        self.animated_names = []
+        self.anim_markers = {}
+        self.anim_links = []
+        self.anim_labels = {}
+        self.last_full_draw = 0.0
+        
+        # Événements souris
+        self.mpl_connect('scroll_event', self.on_scroll)
+        self.mpl_connect('button_press_event', self.on_mouse_press)
+        self.mpl_connect('button_release_event', self.on_mouse_release)
+        self.mpl_connect('motion_notify_event', self.on_mouse_move)
+        self.mpl_connect('draw_event', self.on_draw)
+    
+    def showEvent(self, event):
+        super().showEvent(event)
+        if self.ax is None:
+            # Laisser la fenêtre s'afficher avant d'importer cartopy
+            QTimer.singleShot(0, self.init_map)
+    
+    def init_map(self):
+        """Création de la carte (import différé de cartopy)"""
+        if self.ax is not None:
+            return
+        
         try:
             import cartopy.crs as ccrs
             import cartopy.feature as cfeature
@@ -65,17 +111,17 @@ class InteractiveEarthMapWidget(FigureCanvas):
             self.ax = self.fig.add_subplot(111, facecolor='#1a1a2e')
             self.fig.subplots_adjust(left=0, right=1, top=0.97, bottom=0.03)
         
-        self.setup_earth_map()
-        
-        # Événements souris
-        self.mpl_connect('scroll_event', self.on_scroll)
-        self.mpl_connect('button_press_event', self.on_mouse_press)
-        self.mpl_connect('button_release_event', self.on_mouse_release)
-        self.mpl_connect('motion_notify_event', self.on_mouse_move)
+        if self.pending_positions is not None:
+            positions, selected_sat = self.pending_positions
+            self.pending_positions = None
+            self.update_satellites(positions, selected_sat)
+        else:
+            self.setup_earth_map()
+            self.draw()
         
     def on_scroll(self, event):
         """Gestion du zoom avec molette"""
-        if event.inaxes != self.ax:
+        if self.ax is None or event.inaxes != self.ax:
             return
         
         if event.button == 'up':
@@ -97,7 +143,7 @@ class InteractiveEarthMapWidget(FigureCanvas):
         self.request_update()
     
     def on_mouse_press(self, event):
-        if event.inaxes != self.ax:
+        if self.ax is None or event.inaxes != self.ax:
             return
         
         if event.button == 1:
@@ -140,6 +186,9 @@ class InteractiveEarthMapWidget(FigureCanvas):
         self.update_view_immediate()
     
     def update_view_immediate(self):
+        if self.ax is None:
+            return
+        
         if not self.has_cartopy:
             self.draw()
             return
@@ -161,6 +210,10 @@ class InteractiveEarthMapWidget(FigureCanvas):
         """Configuration carte haute résolution"""
         self.ax.clear()
         
+        # Avant le cadrage: imshow modifie les limites des axes
+        if self.coverage is not None:
+            self.draw_coverage()
+        
         if self.has_cartopy:
             if self.zoom_level > 5.0:
                 resolution = '10m'
@@ -226,10 +279,44 @@ class InteractiveEarthMapWidget(FigureCanvas):
                                 alpha=0.95, edgecolor='red', linewidth=2),
                         transform=transform, zorder=101)
     
+    def set_coverage(self, coverage):
+        """Carte de chaleur de couverture (résultat de coverage.analyze), None pour l'effacer"""
+        self.coverage = coverage
+    
+    def draw_coverage(self):
+        """Fraction du temps où chaque case est couverte, sous les côtes et frontières"""
+        lat, lon = self.coverage['lat'], self.coverage['lon']
+        half_lat = (lat[1] - lat[0]) / 2 if len(lat) > 1 else 0
+        half_lon = (lon[1] - lon[0]) / 2 if len(lon) > 1 else 0
+        extent = [lon[0] - half_lon, lon[-1] + half_lon, lat[0] - half_lat, lat[-1] + half_lat]
+        values = np.ma.masked_equal(self.coverage['fraction'], 0)
+        kwargs = {'transform': self.ccrs.PlateCarree()} if self.has_cartopy else {}
+        self.ax.imshow(values, extent=extent, origin='lower', cmap='inferno', vmin=0,
+                       alpha=0.55, zorder=2, interpolation='nearest', **kwargs)
+    
+    def show_positions(self, satellites_positions, selected_sat=None, redraw=False):
+        """Rendu complet si nécessaire (autres satellites, vue modifiée, flèche de direction
+        trop ancienne), sinon simple déplacement des artistes animés"""
+        if (redraw or self.background is None or selected_sat != self.selected_satellite
+                or list(satellites_positions) != self.animated_names
+                or time.monotonic() - self.last_full_draw > ANIM_REDRAW_S):
+            self.update_satellites(satellites_positions, selected_sat)
+        else:
+            self.animate(satellites_positions)
+    
+    @instrumented('update_satellites')
     def update_satellites(self, satellites_positions, selected_sat=None):
         """Mise à jour avec ligne de direction du satellite"""
         self.selected_satellite = selected_sat
+        
+        if self.ax is None:
+            # Carte pas encore affichée: on dessinera à l'initialisation
+            self.pending_positions = (satellites_positions, selected_sat)
+            return
+        
         self.setup_earth_map()
+        self.create_animated_artists(satellites_positions or {})
+        self.last_full_draw = time.monotonic()
         
         if not satellites_positions:
             self.draw()
@@ -237,50 +324,12 @@ class InteractiveEarthMapWidget(FigureCanvas):
         
         transform = self.ccrs.PlateCarree() if self.has_cartopy else None
         
-        for sat_name, pos in satellites_positions.items():
-            if pos:
-                lon = pos['longitude']
-                lat = pos['latitude']
-                
-                if sat_name == selected_sat:
-                    # Satellite sélectionné
-                    self.ax.plot(lon, lat, 'o', color='#FFFF00', markersize=5, 
-                               markeredgecolor='#FF8C00', markeredgewidth=1, zorder=99,
-                               transform=transform)
-                    
-                    
-                    
-                    # Ligne de connexion vers Rennes
-                    if pos['is_visible']:
-                        from config import OBSERVER_LAT, OBSERVER_LON
-                        self.ax.plot([OBSERVER_LON, lon], [OBSERVER_LAT, lat], 
-                                   'w-', linewidth=12, alpha=0.25, zorder=96,
-                                   transform=transform)
-                        self.ax.plot([OBSERVER_LON, lon], [OBSERVER_LAT, lat], 
-                                   '#00FFFF', linewidth=7, alpha=0.7, zorder=97,
-                                   transform=transform)
-                        self.ax.plot([OBSERVER_LON, lon], [OBSERVER_LAT, lat], 
-                                   '#FFFF00', linewidth=3.5, alpha=1.0, zorder=98,
-                                   transform=transform)
-                    
-                    # NOUVELLE FONCTIONNALITÉ: Flèche de direction du satellite
-                    self.draw_satellite_direction(lon, lat, pos, transform)
-                    
-                else:
-                    # Autres satellites
-                    color = '#00FF00' if pos['is_visible'] else '#666666'
-                    size = 13 if pos['is_visible'] else 2
-                    alpha = 0.9 if pos['is_visible'] else 0.5
-                    
-                    self.ax.plot(lon, lat, 'o', color=color, markersize=size, 
-                               markeredgecolor='white', markeredgewidth=0.5, 
-                               alpha=alpha, transform=transform, zorder=60)
-                    
-                    if self.zoom_level > 6.0:
-                        self.ax.text(lon + 0.4, lat + 0.4, sat_name, color=color, 
-                                   fontsize=8, alpha=alpha, transform=transform,
-                                   bbox=dict(boxstyle='round,pad=0.2', 
-                                           facecolor='black', alpha=0.7))
+        # Flèche de direction: fixe entre deux rendus complets
+        pos = satellites_positions.get(selected_sat)
+        if pos:
+            self.draw_satellite_direction(pos['longitude'], pos['latitude'], pos, transform)
+        
+        self.set_animated_positions(satellites_positions)
         
         """# Légende améliorée
         from matplotlib.lines import Line2D
@@ -301,8 +350,82 @@ class InteractiveEarthMapWidget(FigureCanvas):
         
         self.draw()
     
+    def create_animated_artists(self, satellites_positions):
+        """Marqueurs, ligne vers Rennes et étiquettes, dessinés hors du fond (animated=True)"""
+        kwargs = {'transform': self.ccrs.PlateCarree()} if self.has_cartopy else {}
+        self.anim_markers = {
+            'visible': self.ax.plot([], [], 'o', color='#00FF00', markersize=13, markeredgecolor='white',
+                                    markeredgewidth=0.5, alpha=0.9, zorder=60, animated=True, **kwargs)[0],
+            'hidden': self.ax.plot([], [], 'o', color='#666666', markersize=2, markeredgecolor='white',
+                                   markeredgewidth=0.5, alpha=0.5, zorder=60, animated=True, **kwargs)[0],
+            'selected': self.ax.plot([], [], 'o', color='#FFFF00', markersize=5, markeredgecolor='#FF8C00',
+                                     markeredgewidth=1, zorder=99, animated=True, **kwargs)[0],
+        }
+        # Ligne de connexion vers Rennes (trois épaisseurs superposées)
+        self.anim_links = [
+            self.ax.plot([], [], '-', color=color, linewidth=width, alpha=alpha, zorder=zorder,
+                         animated=True, **kwargs)[0]
+            for color, width, alpha, zorder in (('white', 12, 0.25, 96), ('#00FFFF', 7, 0.7, 97),
+                                                ('#FFFF00', 3.5, 1.0, 98))
+        ]
+        self.animated_names = list(satellites_positions)
+        self.anim_labels = {}
+        if self.zoom_level > 6.0:
+            for name in self.animated_names:
+                if name != self.selected_satellite:
+                    self.anim_labels[name] = self.ax.text(
+                        0, 0, name, fontsize=8, animated=True,
+                        bbox=dict(boxstyle='round,pad=0.2', facecolor='black', alpha=0.7), **kwargs)
+    
+    def set_animated_positions(self, satellites_positions):
+        """Place les artistes animés (satellites affichés au dernier rendu complet seulement)"""
+        visible, hidden = ([], []), ([], [])
+        for name in self.animated_names:
+            pos = satellites_positions.get(name)
+            if not pos:
+                continue
+            lon, lat = pos['longitude'], pos['latitude']
+            if name == self.selected_satellite:
+                self.anim_markers['selected'].set_data([lon], [lat])
+                link = ([OBSERVER_LON, lon], [OBSERVER_LAT, lat]) if pos['is_visible'] else ([], [])
+                for line in self.anim_links:
+                    line.set_data(*link)
+                continue
+            points = visible if pos['is_visible'] else hidden
+            points[0].append(lon)
+            points[1].append(lat)
+            label = self.anim_labels.get(name)
+            if label is not None:
+                label.set_position((lon + 0.4, lat + 0.4))
+                label.set_color('#00FF00' if pos['is_visible'] else '#666666')
+                label.set_alpha(0.9 if pos['is_visible'] else 0.5)
+        self.anim_markers['visible'].set_data(*visible)
+        self.anim_markers['hidden'].set_data(*hidden)
+    
+    def animated_artists(self):
+        return [*self.anim_links, *self.anim_markers.values(), *self.anim_labels.values()]
+    
+    def on_draw(self, event):
+        """Après chaque rendu complet: mémoriser le fond (sans les artistes animés)"""
+        if self.ax is None:
+            return
+        self.background = self.copy_from_bbox(self.fig.bbox)
+        for artist in self.animated_artists():
+            self.ax.draw_artist(artist)
+    
+    def animate(self, satellites_positions):
+        """Image intermédiaire: seuls les artistes animés sont redessinés sur le fond"""
+        if self.background is None or not self.animated_names:
+            return
+        self.set_animated_positions(satellites_positions)
+        self.restore_region(self.background)
+        for artist in self.animated_artists():
+            self.ax.draw_artist(artist)
+        self.blit(self.fig.bbox)
+    
     def draw_satellite_direction(self, lon, lat, pos, transform):
         """Dessine une flèche montrant la direction du satellite"""
+        import matplotlib.patches as mpatches
         from config import OBSERVER_LAT, OBSERVER_LON
         
         # Calculer le vecteur de vélocité du satellite
@@ -398,6 +521,7 @@ class SkyViewWidget(FigureCanvas):
         self.ax.tick_params(colors='white')
         self.ax.grid(True, alpha=0.4, color='cyan', linewidth=0.8)
         
+    @instrumented('SkyViewWidget.update_satellite_position')
     def update_satellite_position(self, position):
         self.setup_sky_view()
         
@@ -432,6 +556,109 @@ class SkyViewWidget(FigureCanvas):
         self.draw()
 
 
+class CatalogLoader(QThread):
+    """Chargement des TLEs en arrière-plan (cache local ou téléchargement)"""
+    
+    loaded = pyqtSignal(str, object)
+    
+    def __init__(self, tle_manager, category, force_download=False):
+        super().__init__()
+        self.tle_manager = tle_manager
+        self.category = category
+        self.force_download = force_download
+    
+    def run(self):
+        if self.force_download:
+            self.tle_manager.download_tles(self.category)
+        else:
+            self.tle_manager.ensure_tles(self.category)
+        # Vue de la catégorie dans le catalogue unifié (objets partagés entre catégories)
+        self.loaded.emit(self.category, self.tle_manager.category_view(self.category))
+
+
+class FramePrecomputer(QThread):
+    """Calcul d'un lot d'images de simulation en arrière-plan (SGP4 vectorisé)"""
+    
+    computed = pyqtSignal(object)
+    
+    def __init__(self, ts, names, satrecs, start_jd, step_s, count):
+        super().__init__()
+        self.ts = ts
+        self.names = names
+        self.satrecs = satrecs
+        self.start_jd = start_jd
+        self.step_s = step_s
+        self.count = count
+    
+    def run(self):
+        batch = compute_frames(self.ts, self.names, self.satrecs,
+                               self.start_jd, self.step_s, self.count)
+        self.computed.emit(batch)
+
+
+class PassTableWorker(QThread):
+    """Calcul de la table des passages en arrière-plan: d'abord les satellites suivis
+    (événements AOS/LOS), puis le reste de la catégorie, par lots, pour la table"""
+    
+    computed = pyqtSignal(dict, float, float)
+    rows = pyqtSignal(dict, bool)  # Lot de passages {nom: [passage, ...]}, premier lot du calcul
+    
+    def __init__(self, predictor, names, start, others=()):
+        super().__init__()
+        self.predictor = predictor
+        self.names = names
+        self.others = others
+        self.start_time = start
+    
+    def find_passes(self, name):
+        return self.predictor.find_passes(name, EVENT_PASS_DAYS, MIN_ELEVATION, self.start_time)
+    
+    def run(self):
+        passes = {}
+        for name in self.names:
+            if self.isInterruptionRequested():
+                return
+            passes[name] = self.find_passes(name)
+        self.computed.emit(passes, self.start_time.tt, self.start_time.tt + EVENT_PASS_DAYS)
+        self.rows.emit(passes, True)
+        
+        batch = {}
+        for name in self.others:
+            if self.isInterruptionRequested():
+                return
+            batch[name] = self.find_passes(name)
+            if len(batch) >= GUI_PASS_TABLE_CHUNK:
+                self.rows.emit(batch, False)
+                batch = {}
+        if batch:
+            self.rows.emit(batch, False)
+
+
+class CoverageWorker(QThread):
+    """Calcul de la couverture et des temps de revisite en arrière-plan"""
+    
+    computed = pyqtSignal(object)
+    
+    def __init__(self, tracker, names, start):
+        super().__init__()
+        self.tracker = tracker
+        self.names = names
+        self.start_time = start
+    
+    def run(self):
+        self.computed.emit(analyze_coverage(self.tracker, self.names, self.start_time))
+
+
+class EventBridge(QObject):
+    """Relais des événements du cœur asyncio vers le thread de l'interface
+    (signal émis depuis un autre thread = connexion en file d'attente)"""
+    
+    event = pyqtSignal(str, object)
+    
+    def forward(self, key):
+        return lambda payload: self.event.emit(key, payload)
+
+
 class MainWindow(QMainWindow):
     """Fenêtre principale avec actualisation auto"""
     
@@ -440,26 +667,73 @@ class MainWindow(QMainWindow):
         
         self.tle_manager = TLEManager()
         self.tracker = SatelliteTracker()
+        self.tracker.use_history(self.tle_manager.history)
         self.predictor = None
         self.selected_satellite = None
-        self.paris_tz = pytz.timezone('Europe/Paris')
+        self._paris_tz = None
+        self.loaders = []
+        self.category_names = []
+        self.other_names = []  # Reste de la catégorie: seulement dans la table des passages
+        
+        # Liste des satellites et table des passages (modèles NumPy, vues virtualisées)
+        frequencies = downlink_frequencies()
+        self.satellite_model = SatelliteListModel(frequencies=frequencies)
+        self.pass_model = PassTableModel(frequencies=frequencies)
+        
+        # Horloge de simulation suivie par le tracker, le prédicteur, la carte et le ciel
+        self.clock = SimulationClock(self.tracker.ts)
+        self.tracker.clock = self.clock
+        self.tle_manager.clock = self.clock
+        self.direction = 1
+        self.frame_cache = FrameCache()
+        self.frame_worker = None
+        self.pass_worker = None
+        self.pass_refresh_pending = False
+        self.coverage_worker = None
         
         self.setWindowTitle("🛰️ Satellite Tracker Pro - Rennes, France")
         self.setGeometry(50, 50, 1900, 1050)
         self.setStyleSheet("background-color: #0d1117; color: white;")
         
         self.setup_ui()
-        self.load_satellites()
-        
-        # Timer pour mise à jour carte et vue du ciel
-        self.map_timer = QTimer()
-        self.map_timer.timeout.connect(self.update_display)
-        self.map_timer.start(3000)  # Toutes les 3 secondes
-        
-        # NOUVEAU: Timer pour actualisation automatique des coordonnées
-        self.info_timer = QTimer()
-        self.info_timer.timeout.connect(self.update_coordinates_only)
-        self.info_timer.start(2000)  # Toutes les 2 secondes
+        self.load_satellites(force_download=False)
+        
+        # Cœur événementiel: positions publiées au rythme de chaque abonné, plus lentement
+        # quand rien n'est au-dessus de l'horizon, et événements AOS/LOS programmés
+        self.events = EventCore(self.tracker.ts, self.clock)
+        self.bridge = EventBridge()
+        self.bridge.event.connect(self.on_core_event)
+        self.display_sub = self.events.subscribe(POSITION, self.bridge.forward('display'),
+                                                 EVENT_DISPLAY_INTERVAL_S, EVENT_IDLE_INTERVAL_S)
+        self.coordinates_sub = self.events.subscribe(POSITION, self.bridge.forward('coordinates'),
+                                                     EVENT_INFO_INTERVAL_S, EVENT_IDLE_INTERVAL_S)
+        for topic in (AOS, LOS, PASSES_EXPIRED):
+            self.events.subscribe(topic, self.bridge.forward(topic))
+        self.events.start()
+        
+        # Alarmes: avertissement avant chaque lever, depuis la même table des passages
+        self.alarms = AlarmEngine(self.tracker.ts, self.clock)
+        self.alarms.add_alarm(AOS, self.bridge.forward('alarm'), lead_s=ALARM_AOS_LEAD_S)
+        self.alarms.start()
+        
+        # Animation de la carte: images intermédiaires interpolées entre les images clés
+        self.last_animated_jd = None
+        self.anim_timer = QTimer()
+        self.anim_timer.timeout.connect(self.animate_map)
+        self.anim_timer.start(int(1000 / ANIM_FPS))
+        
+        # Panneau de performance (seulement avec SGS_INSTRUMENT=1)
+        if instrumentation.ENABLED:
+            self.perf_timer = QTimer()
+            self.perf_timer.timeout.connect(self.update_perf_overlay)
+            self.perf_timer.start(1000)
+    
+    @property
+    def paris_tz(self):
+        if self._paris_tz is None:
+            import pytz
+            self._paris_tz = pytz.timezone('Europe/Paris')
+        return self._paris_tz
         
     def setup_ui(self):
         central_widget = QWidget()
@@ -512,26 +786,20 @@ class MainWindow(QMainWindow):
         layout.addWidget(QLabel("Catégorie:", styleSheet="color: white; font-size: 12px;"))
         layout.addWidget(self.category_combo)
         
-        self.satellite_list = QListWidget()
-        self.satellite_list.setStyleSheet("""
-            QListWidget {
-                background-color: #161b22;
-                border: 2px solid cyan;
-                color: white;
-                font-size: 12px;
-            }
-            QListWidget::item {
-                padding: 6px;
-            }
-            QListWidget::item:selected {
-                background-color: #1f6feb;
-            }
-            QListWidget::item:hover {
-                background-color: #264f78;
-            }
-        """)
-        self.satellite_list.itemClicked.connect(self.on_satellite_selected)
-        layout.addWidget(self.satellite_list)
+        self.satellite_search = QLineEdit()
+        self.satellite_search.setPlaceholderText("🔍 Rechercher un satellite...")
+        self.satellite_search.setStyleSheet(self.FILTER_STYLE)
+        self.satellite_search.textChanged.connect(lambda text: self.satellite_model.set_filter(text=text))
+        layout.addWidget(self.satellite_search)
+        
+        self.satellite_band_combo = self.create_band_combo()
+        self.satellite_band_combo.currentIndexChanged.connect(
+            lambda: self.satellite_model.set_filter(band=self.satellite_band_combo.currentData()))
+        layout.addWidget(self.satellite_band_combo)
+        
+        self.satellite_view = self.create_table_view(self.satellite_model)
+        self.satellite_view.clicked.connect(self.on_satellite_selected)
+        layout.addWidget(self.satellite_view)
         
         instructions = QLabel(
             "💡 Contrôles:\n"
@@ -552,7 +820,7 @@ class MainWindow(QMainWindow):
         layout.addWidget(instructions)
         
         refresh_btn = QPushButton("🔄 Actualiser TLEs")
-        refresh_btn.clicked.connect(self.load_satellites)
+        refresh_btn.clicked.connect(lambda: self.load_satellites(force_download=True))
         refresh_btn.setStyleSheet("""
             QPushButton {
                 background-color: #238636;
@@ -570,6 +838,133 @@ class MainWindow(QMainWindow):
         
         panel.setLayout(layout)
         return panel
+    
+    FILTER_STYLE = """
+        QLineEdit, QComboBox, QDoubleSpinBox {
+            background-color: #161b22;
+            color: white;
+            padding: 4px;
+            border: 1px solid cyan;
+            font-size: 11px;
+        }
+    """
+    
+    def create_table_view(self, model, sort_column=0):
+        """Vue tableau virtualisée: seules les lignes visibles sont demandées au modèle"""
+        view = QTableView()
+        view.setModel(model)
+        view.horizontalHeader().setSortIndicator(sort_column, Qt.SortOrder.AscendingOrder)
+        view.setSortingEnabled(True)
+        view.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        view.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        view.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        view.setAlternatingRowColors(True)
+        view.setWordWrap(False)
+        # Hauteur de ligne fixe: pas de mesure du contenu, défilement en temps constant
+        view.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        view.verticalHeader().setDefaultSectionSize(22)
+        view.verticalHeader().setVisible(False)
+        view.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Interactive)
+        view.horizontalHeader().setStretchLastSection(True)
+        view.setStyleSheet("""
+            QTableView {
+                background-color: #161b22;
+                alternate-background-color: #1c2230;
+                border: 2px solid cyan;
+                color: white;
+                gridline-color: #30363d;
+                font-size: 12px;
+                selection-background-color: #1f6feb;
+            }
+            QHeaderView::section {
+                background-color: #0d1117;
+                color: cyan;
+                border: 1px solid #30363d;
+                padding: 4px;
+                font-weight: bold;
+            }
+        """)
+        return view
+    
+    def create_band_combo(self):
+        combo = QComboBox()
+        combo.setStyleSheet(self.FILTER_STYLE)
+        combo.addItem("📻 Toutes les bandes", None)
+        for band, (low, high) in GUI_FREQUENCY_BANDS.items():
+            combo.addItem(f"📻 {band} ({low:g}-{high:g} MHz)", (low, high))
+        return combo
+    
+    def create_pass_table_panel(self):
+        """Table des passages de la catégorie, avec ses filtres"""
+        panel = QGroupBox("📋 TABLE DES PASSAGES")
+        panel.setStyleSheet("QGroupBox { color: cyan; font-weight: bold; font-size: 13px; }")
+        layout = QVBoxLayout()
+        layout.setContentsMargins(2, 2, 2, 2)
+        
+        filters = QHBoxLayout()
+        filters.addWidget(QLabel("Élév. min:", styleSheet="color: white; font-size: 11px;"))
+        self.pass_elevation_spin = QDoubleSpinBox()
+        self.pass_elevation_spin.setRange(0, 90)
+        self.pass_elevation_spin.setSingleStep(5)
+        self.pass_elevation_spin.setSuffix("°")
+        self.pass_elevation_spin.setValue(MIN_ELEVATION)
+        self.pass_elevation_spin.setStyleSheet(self.FILTER_STYLE)
+        self.pass_elevation_spin.valueChanged.connect(self.apply_pass_filter)
+        filters.addWidget(self.pass_elevation_spin)
+        
+        self.pass_period_combo = QComboBox()
+        self.pass_period_combo.setStyleSheet(self.FILTER_STYLE)
+        self.pass_period_combo.addItem("🕒 Toute la table", None)
+        for hours in GUI_PASS_PERIODS_H:
+            self.pass_period_combo.addItem(f"🕒 Prochaines {hours} h", hours)
+        self.pass_period_combo.currentIndexChanged.connect(self.apply_pass_filter)
+        filters.addWidget(self.pass_period_combo)
+        
+        self.pass_category_combo = QComboBox()
+        self.pass_category_combo.setStyleSheet(self.FILTER_STYLE)
+        self.pass_category_combo.addItem("🏷 Toutes catégories", None)
+        self.pass_category_combo.currentIndexChanged.connect(self.apply_pass_filter)
+        filters.addWidget(self.pass_category_combo)
+        
+        self.pass_band_combo = self.create_band_combo()
+        self.pass_band_combo.currentIndexChanged.connect(self.apply_pass_filter)
+        filters.addWidget(self.pass_band_combo)
+        
+        self.pass_search = QLineEdit()
+        self.pass_search.setPlaceholderText("🔍 Satellite...")
+        self.pass_search.setStyleSheet(self.FILTER_STYLE)
+        self.pass_search.textChanged.connect(self.apply_pass_filter)
+        filters.addWidget(self.pass_search)
+        
+        self.pass_count_label = QLabel("")
+        self.pass_count_label.setStyleSheet("color: lime; font-size: 11px;")
+        filters.addWidget(self.pass_count_label)
+        filters.addStretch()
+        layout.addLayout(filters)
+        
+        self.pass_view = self.create_table_view(self.pass_model, sort_column=1)  # Par heure de lever
+        self.pass_view.clicked.connect(self.on_satellite_selected)
+        self.pass_model.rowsInserted.connect(self.update_pass_count)
+        self.pass_model.modelReset.connect(self.update_pass_count)
+        layout.addWidget(self.pass_view)
+        
+        panel.setLayout(layout)
+        return panel
+    
+    def apply_pass_filter(self):
+        """Filtres de la table des passages (la période part de l'heure de l'horloge)"""
+        hours = self.pass_period_combo.currentData()
+        now = self.clock.now().tt
+        self.pass_model.set_filter(
+            min_elevation=self.pass_elevation_spin.value(),
+            period=None if hours is None else (now, now + hours / 24),
+            category=self.pass_category_combo.currentData(),
+            band=self.pass_band_combo.currentData(),
+            text=self.pass_search.text())
+    
+    def update_pass_count(self):
+        shown, total = self.pass_model.rowCount(), self.pass_model.total()
+        self.pass_count_label.setText(f"{shown} / {total} passages")
         
     def create_center_panel(self):
         panel = QWidget()
@@ -580,7 +975,20 @@ class MainWindow(QMainWindow):
         layout.setSpacing(0)
         
         self.earth_map = InteractiveEarthMapWidget(tracker=self.tracker)
-        layout.addWidget(self.earth_map)
+        map_splitter = QSplitter(Qt.Orientation.Vertical)
+        map_splitter.setStyleSheet("""
+            QSplitter::handle {
+                background-color: cyan;
+                height: 3px;
+            }
+            QSplitter::handle:hover {
+                background-color: yellow;
+            }
+        """)
+        map_splitter.addWidget(self.earth_map)
+        map_splitter.addWidget(self.create_pass_table_panel())
+        map_splitter.setSizes([760, 240])
+        layout.addWidget(map_splitter)
         
         controls_layout = QHBoxLayout()
         controls_layout.setContentsMargins(5, 2, 5, 2)
@@ -619,26 +1027,327 @@ class MainWindow(QMainWindow):
         """)
         controls_layout.addWidget(world_view_btn)
         
+        self.coverage_btn = QPushButton("🗺 Couverture")
+        self.coverage_btn.setCheckable(True)
+        self.coverage_btn.toggled.connect(self.toggle_coverage)
+        self.coverage_btn.setStyleSheet("""
+            QPushButton {
+                background-color: #6e40c9;
+                color: white;
+                border: none;
+                padding: 6px;
+                font-weight: bold;
+                font-size: 11px;
+            }
+            QPushButton:hover {
+                background-color: #8957e5;
+            }
+            QPushButton:checked {
+                background-color: #d29922;
+            }
+        """)
+        controls_layout.addWidget(self.coverage_btn)
+        
         zoom_info = QLabel("🔄 Coordonnées actualisées automatiquement")
         zoom_info.setStyleSheet("color: lime; font-size: 10px; font-style: italic;")
         controls_layout.addWidget(zoom_info)
         
+        self.perf_label = QLabel("")
+        self.perf_label.setStyleSheet("color: orange; font-size: 10px; font-family: Consolas, monospace;")
+        self.perf_label.setVisible(instrumentation.ENABLED)
+        controls_layout.addWidget(self.perf_label)
+        
         layout.addLayout(controls_layout)
+        layout.addLayout(self.create_time_controls())
         
         panel.setLayout(layout)
         return panel
     
+    def create_time_controls(self):
+        """Contrôles de l'horloge de simulation (voyage dans le temps)"""
+        time_layout = QHBoxLayout()
+        time_layout.setContentsMargins(5, 2, 5, 2)
+        button_style = """
+            QPushButton {
+                background-color: #30363d;
+                color: white;
+                border: none;
+                padding: 6px;
+                font-weight: bold;
+                font-size: 11px;
+            }
+            QPushButton:hover {
+                background-color: #484f58;
+            }
+        """
+        
+        live_btn = QPushButton("🔴 Temps réel")
+        live_btn.clicked.connect(self.go_live)
+        live_btn.setStyleSheet(button_style)
+        time_layout.addWidget(live_btn)
+        
+        self.direction_btn = QPushButton("▶ Avant")
+        self.direction_btn.clicked.connect(self.toggle_direction)
+        self.direction_btn.setStyleSheet(button_style)
+        time_layout.addWidget(self.direction_btn)
+        
+        self.pause_btn = QPushButton("⏸ Pause")
+        self.pause_btn.clicked.connect(self.toggle_pause)
+        self.pause_btn.setStyleSheet(button_style)
+        time_layout.addWidget(self.pause_btn)
+        
+        self.speed_combo = QComboBox()
+        self.speed_combo.addItems([f"x{speed}" for speed in SIM_SPEEDS])
+        self.speed_combo.setStyleSheet("background-color: #161b22; color: white; padding: 4px;")
+        self.speed_combo.currentTextChanged.connect(self.apply_speed)
+        time_layout.addWidget(self.speed_combo)
+        
+        # Curseur: décalage en minutes par rapport à l'heure réelle (±24 h)
+        self.time_slider = QSlider(Qt.Orientation.Horizontal)
+        self.time_slider.setRange(-24 * 60, 24 * 60)
+        self.time_slider.setValue(0)
+        self.time_slider.valueChanged.connect(self.on_time_slider_moved)
+        time_layout.addWidget(self.time_slider, stretch=1)
+        
+        self.clock_label = QLabel("🔴 Temps réel")
+        self.clock_label.setStyleSheet("color: cyan; font-size: 11px; font-family: Consolas, monospace;")
+        time_layout.addWidget(self.clock_label)
+        
+        return time_layout
+    
+    def uses_frames(self):
+        """Images précalculées seulement en simulation rapide"""
+        return not self.clock.live and abs(self.clock.speed) >= SIM_PRECOMPUTE_SPEED
+    
+    def apply_speed(self, text=None):
+        speed = int(self.speed_combo.currentText().lstrip('x')) * self.direction
+        if self.clock.live and speed == 1:
+            return
+        if self.clock.live:
+            self.clock.set_time(self.clock.now())
+        self.clock.set_speed(speed)
+        self.clock_changed()
+    
+    def toggle_direction(self):
+        self.direction = -self.direction
+        self.direction_btn.setText("▶ Avant" if self.direction > 0 else "◀ Arrière")
+        self.apply_speed()
+    
+    def toggle_pause(self):
+        if self.clock.paused:
+            self.clock.resume()
+            self.pause_btn.setText("⏸ Pause")
+        else:
+            if self.clock.live:
+                self.clock.set_time(self.clock.now())
+            self.clock.pause()
+            self.pause_btn.setText("▶ Lecture")
+        self.clock_changed()
+    
+    def go_live(self):
+        self.clock.go_live()
+        self.direction = 1
+        self.direction_btn.setText("▶ Avant")
+        self.pause_btn.setText("⏸ Pause")
+        self.speed_combo.blockSignals(True)
+        self.speed_combo.setCurrentIndex(0)
+        self.speed_combo.blockSignals(False)
+        self.clock_changed()
+    
+    def on_time_slider_moved(self, minutes):
+        """Déplacement dans le temps avec le curseur"""
+        now = self.tracker.ts.now()
+        self.clock.set_time(self.tracker.ts.tt_jd(now.whole, now.tt_fraction + minutes / 1440))
+        self.clock_changed()
+    
+    def clock_changed(self):
+        """Horloge modifiée: rythme d'affichage et événements AOS/LOS replanifiés"""
+        if self.uses_frames():
+            # Simulation rapide: images précalculées à cadence fixe, même sans passage
+            interval = SIM_FRAME_INTERVAL_MS / 1000
+            self.events.set_interval(self.display_sub, interval, interval)
+        else:
+            self.events.set_interval(self.display_sub, EVENT_DISPLAY_INTERVAL_S, EVENT_IDLE_INTERVAL_S)
+        self.events.clock_changed()
+        self.alarms.clock_changed()
+        self.update_display()
+    
+    def refresh_pass_table(self):
+        """Recalcule la table des passages de la catégorie à l'heure de l'horloge
+        (un calcul en cours est interrompu et relancé)"""
+        if self.pass_worker is not None:
+            self.pass_worker.requestInterruption()
+            self.pass_refresh_pending = True
+            return
+        if not self.category_names or self.predictor is None:
+            return
+        worker = PassTableWorker(self.predictor, list(self.category_names), self.clock.now(),
+                                 list(self.other_names))
+        worker.computed.connect(self.on_pass_table_computed)
+        worker.rows.connect(self.on_pass_rows)
+        worker.finished.connect(self.on_pass_worker_finished)
+        self.pass_worker = worker
+        worker.start()
+    
+    def current_pass_worker(self):
+        """Vrai si le signal reçu vient du calcul en cours (pas d'un calcul interrompu)"""
+        worker = self.sender()
+        return worker is self.pass_worker and not worker.isInterruptionRequested()
+    
+    def on_pass_table_computed(self, passes, start_jd, end_jd):
+        if not self.current_pass_worker():
+            return
+        start = self.tracker.ts.tt_jd(start_jd)
+        names = [name for name in self.category_names if name in passes]
+        satrecs = [self.tracker.satellite_for_time(name, start).model for name in names]
+        self.events.watch(names, satrecs, passes, start_jd, end_jd)
+        self.alarms.set_passes(passes, start_jd, end_jd)
+    
+    def on_pass_rows(self, passes, first):
+        """Lot de passages calculé: ajouté à la table sans la reconstruire"""
+        if not self.current_pass_worker():
+            return
+        if first:
+            self.pass_model.tz = self.paris_tz
+            self.pass_model.clear()
+            self.apply_pass_filter()  # Période recalée sur l'heure de l'horloge
+        self.pass_model.add_passes(passes)
+    
+    def on_pass_worker_finished(self):
+        self.pass_worker = None
+        if self.pass_refresh_pending:
+            self.pass_refresh_pending = False
+            self.refresh_pass_table()
+    
+    def on_core_event(self, key, payload):
+        """Événements du cœur (reçus dans le thread de l'interface)"""
+        if key == 'display':
+            self.update_display(payload['positions'])
+        elif key == 'coordinates':
+            self.update_coordinates_only(payload['positions'].get(self.selected_satellite))
+        elif key in (AOS, LOS):
+            moment = payload['time'].utc_datetime().astimezone(self.paris_tz)
+            label = "📡 Lever (AOS)" if key == AOS else "🌅 Coucher (LOS)"
+            self.statusBar().showMessage(f"{label}: {payload['satellite']} à {moment.strftime('%H:%M:%S')}")
+        elif key == 'alarm':
+            p = payload['pass']
+            moment = payload['time'].utc_datetime().astimezone(self.paris_tz)
+            self.statusBar().showMessage(f"⏰ {payload['satellite']}: lever à {moment.strftime('%H:%M:%S')} "
+                                         f"(dans {payload['lead_s'] / 60:g} min, max {p['max_elevation']:.0f}°)")
+            QApplication.beep()
+        elif key == PASSES_EXPIRED:
+            self.refresh_pass_table()
+    
+    def closeEvent(self, event):
+        self.events.stop()
+        self.alarms.stop()
+        if self.pass_worker is not None:
+            self.pass_worker.requestInterruption()
+            self.pass_worker.wait()
+        super().closeEvent(event)
+    
+    def update_clock_display(self, t):
+        if self.clock.live:
+            self.clock_label.setText("🔴 Temps réel")
+            offset = 0
+        else:
+            paris_dt = t.utc_datetime().astimezone(self.paris_tz)
+            state = "⏸" if self.clock.paused else f"x{self.clock.speed:g}"
+            self.clock_label.setText(f"🕒 {paris_dt.strftime('%d/%m/%Y %H:%M:%S')} ({state})")
+            offset = round((t.tt - self.tracker.ts.now().tt) * 1440)
+        
+        self.time_slider.blockSignals(True)
+        self.time_slider.setValue(max(self.time_slider.minimum(), min(self.time_slider.maximum(), offset)))
+        self.time_slider.blockSignals(False)
+    
+    def precomputed_positions(self, t):
+        """Positions de toute la catégorie interpolées entre les images clés précalculées
+        (None si pas prêtes)"""
+        self.frame_cache.configure(self.category_names, ANIM_KEYFRAME_S)
+        positions = self.frame_cache.lookup(t.tt, t.utc_iso())
+        self.request_frames(t)
+        return positions
+    
+    def request_frames(self, t):
+        """Lance le calcul du prochain lot d'images si la fenêtre d'anticipation n'est pas couverte"""
+        if self.frame_worker is not None:
+            return
+        request = self.frame_cache.next_request(t.tt, 1 if self.clock.speed >= 0 else -1)
+        if request is None:
+            return
+        start_jd, count = request
+        
+        names = list(self.frame_cache.names)
+        satrecs = [self.tracker.satellite_for_time(name, t).model for name in names]
+        worker = FramePrecomputer(self.tracker.ts, names, satrecs, start_jd,
+                                  self.frame_cache.step_s, count)
+        worker.computed.connect(self.on_frames_computed)
+        worker.finished.connect(self.on_frame_worker_finished)
+        self.frame_worker = worker
+        worker.start()
+    
+    @instrumented('animation')
+    def animate_map(self):
+        """Déplacement fluide des satellites (blitting), à l'heure exacte de l'horloge
+        quelle que soit la cadence réelle des images"""
+        if not self.selected_satellite or not self.category_names or not self.isVisible():
+            return
+        t = self.clock.now()
+        if t.tt == self.last_animated_jd:
+            return  # En pause
+        positions = self.precomputed_positions(t)
+        if positions:
+            self.last_animated_jd = t.tt
+            self.earth_map.animate(positions)
+    
+    def on_frames_computed(self, batch):
+        self.frame_cache.add(batch, self.clock.now().tt)
+    
+    def on_frame_worker_finished(self):
+        self.frame_worker = None
+    
+    def toggle_coverage(self, checked):
+        """Couverture de la catégorie sur 24 h depuis l'heure de l'horloge"""
+        if not checked:
+            self.earth_map.set_coverage(None)
+            self.update_display(redraw=True)
+            return
+        if self.coverage_worker is not None or not self.category_names:
+            self.coverage_btn.setChecked(False)
+            return
+        self.statusBar().showMessage(f"🗺 Calcul de la couverture ({len(self.category_names)} satellites)...")
+        worker = CoverageWorker(self.tracker, list(self.category_names), self.clock.now())
+        worker.computed.connect(self.on_coverage_computed)
+        worker.finished.connect(self.on_coverage_worker_finished)
+        self.coverage_worker = worker
+        worker.start()
+    
+    def on_coverage_computed(self, result):
+        if not self.coverage_btn.isChecked():
+            return
+        self.earth_map.set_coverage(result)
+        here = cell_summary(result, OBSERVER_LAT, OBSERVER_LON)
+        message = (f"🗺 Couverture moyenne {result['fraction'].mean() * 100:.1f}% — "
+                   f"Rennes: {here['accesses']} accès")
+        if not np.isnan(here['max_revisit_s']):
+            message += f", revisite max {format_duration(here['max_revisit_s'])}"
+        self.statusBar().showMessage(message)
+        self.update_display(redraw=True)
+    
+    def on_coverage_worker_finished(self):
+        self.coverage_worker = None
+    
     def reset_map_view(self):
         self.earth_map.zoom_level = 2.5
         self.earth_map.center_lon = -1.6778
         self.earth_map.center_lat = 48.1173
-        self.update_display()
+        self.update_display(redraw=True)
     
     def world_view(self):
         self.earth_map.zoom_level = 1.0
         self.earth_map.center_lon = 0
         self.earth_map.center_lat = 20
-        self.update_display()
+        self.update_display(redraw=True)
         
     def create_right_panel(self):
         splitter = QSplitter(Qt.Orientation.Vertical)
@@ -710,53 +1419,120 @@ class MainWindow(QMainWindow):
         
         return splitter
         
-    def load_satellites(self):
+    def load_satellites(self, force_download=True):
+        """Lance le chargement de la catégorie en arrière-plan"""
         category = self.category_combo.currentText()
         
-        self.satellite_list.clear()
         self.info_display.setText("⏳ Chargement des satellites...")
         
-        satellites = self.tle_manager.download_tles(category)
+        loader = CatalogLoader(self.tle_manager, category, force_download)
+        loader.loaded.connect(self.on_satellites_loaded)
+        loader.finished.connect(lambda: self.loaders.remove(loader))
+        self.loaders.append(loader)
+        loader.start()
+    
+    def on_satellites_loaded(self, category, view):
+        # Ignorer un chargement devenu obsolète (catégorie changée entre-temps)
+        if category != self.category_combo.currentText():
+            return
         
-        for sat in satellites[:20]:
-            self.tracker.add_satellite(sat['name'], sat['line1'], sat['line2'])
-            self.satellite_list.addItem(sat['name'])
+        self.category_names = []
+        self.other_names = []
+        if view is not None:
+            # Un seul catalogue pour toutes les catégories: changer de catégorie ne recrée rien
+            if self.tracker.catalog is not view.parent:
+                self.tracker.load_catalog(view.parent)
+            if self.satellite_model.catalog is not view.parent:
+                self.satellite_model.set_catalog(view.parent)
+                self.pass_model.set_catalog(view.parent)
+                self.pass_category_combo.blockSignals(True)
+                while self.pass_category_combo.count() > 1:
+                    self.pass_category_combo.removeItem(1)
+                for name in getattr(view.parent, 'categories', []):
+                    self.pass_category_combo.addItem(f"🏷 {name}", name)
+                self.pass_category_combo.blockSignals(False)
+            # Carte et événements: les premiers satellites; liste et table: toute la catégorie
+            self.category_names = view.names[:20]
+            self.other_names = view.names[20:]
+        self.satellite_model.set_filter(category=category)
+        self.pass_model.clear()
+        self.frame_cache.clear()
+        self.coverage_btn.setChecked(False)
         
         self.predictor = PassPredictor(self.tracker)
-        self.info_display.setHtml(
-            '<p style="color: lime; font-size: 14px; font-weight: bold;">'
-            f'✓ Chargé {len(satellites[:20])} satellites depuis {category}'
-            '</p>'
-        )
+        self.refresh_pass_table()
+        html = ('<p style="color: lime; font-size: 14px; font-weight: bold;">'
+                f'✓ Chargé {len(self.category_names)} satellites depuis {category}'
+                '</p>')
+        
+        # Résumé du contrôle des TLEs (rejetés / à surveiller)
+        report = self.tle_manager.reports.get(category)
+        if report is not None and (report['dropped'] or report['counts']['stale']
+                                   or report['counts']['mean motion jump']):
+            html += ('<p style="color: orange;">'
+                     f"⚠ {report['dropped']} TLEs rejetés sur {report['total']}, "
+                     f"{report['counts']['stale']} anciens, "
+                     f"{report['counts']['mean motion jump']} sauts de mouvement moyen"
+                     '</p>')
+        self.info_display.setHtml(html)
         
     def on_category_changed(self, category):
-        self.load_satellites()
+        self.load_satellites(force_download=False)
         
-    def on_satellite_selected(self, item):
-        self.selected_satellite = item.text()
+    def on_satellite_selected(self, index):
+        """Satellite choisi dans la liste ou dans la table des passages"""
+        self.selected_satellite = index.model().name_at(index.row())
         self.update_display()
         self.update_info_panel_full()
         
-    def update_display(self):
-        """Mise à jour carte et vue du ciel"""
+    def update_perf_overlay(self):
+        """Temps par image et coût de propagation"""
+        frame = instrumentation.get_stats('frame')
+        propagation = instrumentation.get_stats('get_position')
+        text = "⏱ "
+        if frame:
+            text += f"Image: {frame['last_ms']:.0f} ms (p95 {frame['p95_ms']:.0f} ms)"
+        if propagation:
+            text += (f"  |  Propagation: {propagation['mean_ms']:.2f} ms/appel, "
+                     f"{propagation['count']} appels")
+        self.perf_label.setText(text)
+    
+    @instrumented('frame')
+    def update_display(self, positions=None, redraw=False):
+        """Mise à jour carte et vue du ciel à l'heure de l'horloge de simulation
+        (positions: celles publiées par le cœur événementiel, si disponibles;
+        redraw: rendu complet de la carte, après un changement de vue)"""
+        t = self.clock.now()
+        self.update_clock_display(t)
+        
         if not self.selected_satellite:
             return
-            
-        position = self.tracker.get_position(self.selected_satellite)
         
-        if not position:
-            return
+        # Simulation rapide: toute la catégorie depuis les images précalculées
+        if self.uses_frames():
+            all_positions = self.precomputed_positions(t)
+        elif positions and self.selected_satellite in positions:
+            all_positions = {self.selected_satellite: positions[self.selected_satellite]}
+        else:
+            all_positions = None
+        if all_positions and self.selected_satellite in all_positions:
+            position = all_positions[self.selected_satellite]
+        else:
+            position = self.tracker.get_position(self.selected_satellite, t)
+            if not position:
+                return
+            all_positions = {self.selected_satellite: position}
         
-        all_positions = {self.selected_satellite: position}
-        self.earth_map.update_satellites(all_positions, self.selected_satellite)
+        self.earth_map.show_positions(all_positions, self.selected_satellite, redraw)
         self.sky_view.update_satellite_position(position)
     
-    def update_coordinates_only(self):
+    def update_coordinates_only(self, position=None):
         """NOUVEAU: Actualisation automatique SEULEMENT des coordonnées"""
         if not self.selected_satellite:
             return
         
-        position = self.tracker.get_position(self.selected_satellite)
+        if position is None:
+            position = self.tracker.get_position(self.selected_satellite)
         
         if not position:
             return
@@ -807,6 +1583,19 @@ class MainWindow(QMainWindow):
             tz_name = paris_dt.strftime('%Z')
             return paris_dt.strftime(f'%d/%m/%Y  %H:%M:%S {tz_name}')
         
+        def format_visibility(p):
+            # Visible à l'œil nu: satellite au soleil et observateur dans l'obscurité
+            labels = {'visible': ('lime', 'Visible'),
+                      'partly visible': ('yellow', 'Partiellement visible'),
+                      'invisible': ('gray', 'Invisible')}
+            color, label = labels.get(p.get('visibility'), ('gray', 'Inconnue'))
+            text = f'<span style="color: {color};">{label}</span>'
+            if p.get('visible_start') is not None:
+                start = p['visible_start'].utc_datetime().astimezone(self.paris_tz)
+                end = p['visible_end'].utc_datetime().astimezone(self.paris_tz)
+                text += f" ({start.strftime('%H:%M:%S')} → {end.strftime('%H:%M:%S')})"
+            return text
+        
         # Utiliser HTML pour meilleure lisibilité
         info_html = f"""
         <div style="font-family: Consolas, monospace; font-size: 13px; line-height: 1.8; color: white;">
@@ -862,7 +1651,8 @@ class MainWindow(QMainWindow):
         
         # Ajouter prédictions
         if self.predictor:
-            passes = self.predictor.find_passes(self.selected_satellite, duration_days=3)
+            passes = self.predictor.find_visible_passes([self.selected_satellite],
+                                                        duration_days=3)[self.selected_satellite]
             if passes:
                 best_pass = self.predictor.get_best_pass(passes)
                 
@@ -882,7 +1672,8 @@ class MainWindow(QMainWindow):
                 Maximum:     <span style="color: lime;">{format_time_french(best_pass['max_time_str'])}</span><br>
                 Élévation:   <span style="color: orange; font-weight: bold;">{best_pass['max_elevation']:.1f}°</span><br>
                 Coucher:     <span style="color: lime;">{format_time_french(best_pass['set_time_str'])}</span><br>
-                Durée:       <span style="color: cyan;">{best_pass['duration_str']}</span>
+                Durée:       <span style="color: cyan;">{best_pass['duration_str']}</span><br>
+                Visibilité:  {format_visibility(best_pass)}
                 </p>
                 
                 <p style="color: cyan; font-size: 13px; font-weight: bold; margin-top: 15px;">
@@ -897,9 +1688,17 @@ class MainWindow(QMainWindow):
                     Lever:     <span style="color: lightgreen;">{format_time_french(p['rise_time_str'])}</span><br>
                     Maximum:   <span style="color: lightgreen;">{format_time_french(p['max_time_str'])}</span><br>
                     Élévation: <span style="color: orange;">{p['max_elevation']:.1f}°</span><br>
-                    Durée:     <span style="color: cyan;">{p['duration_str']}</span>
+                    Durée:     <span style="color: cyan;">{p['duration_str']}</span><br>
+                    Visibilité: {format_visibility(p)}
                     </p>
                     """
+            elif self.predictor.screened.get(self.selected_satellite) == ALWAYS:
+                # Géostationnaire toujours visible: ni lever ni coucher
+                info_html += f"""
+                <p style="color: lime; font-size: 14px; margin-top: 20px;">
+                🛰️ Toujours au-dessus de 10° pendant les 3 prochains jours (pas de lever ni de coucher).
+                </p>
+                """
             else:
                 info_html += f"""
                 <p style="color: red; font-size: 14px; margin-top: 20px;">
@@ -916,8 +1715,18 @@ def main():
     app = QApplication(sys.argv)
     app.setStyle('Fusion')
     
+    # Écran de démarrage affiché avant la construction de la fenêtre
+    pixmap = QPixmap(480, 160)
+    pixmap.fill(QColor('#0d1117'))
+    splash = QSplashScreen(pixmap)
+    splash.showMessage("🛰️ Satellite Tracker Pro\n\n⏳ Démarrage...",
+                       Qt.AlignmentFlag.AlignCenter, QColor('cyan'))
+    splash.show()
+    app.processEvents()
+    
     window = MainWindow()
     window.show()
+    splash.finish(window)
     
     sys.exit(app.exec())
 
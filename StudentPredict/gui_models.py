@@ -0,0 +1,322 @@
+# gui_models.py
+"""
+Modèles Qt de la liste des satellites et de la table des passages
+Les colonnes sont des tableaux NumPy: la vue (QTableView) ne demande que les
+cellules affichées, le tri et les filtres sont vectorisés, et les passages
+calculés en arrière-plan sont ajoutés par lots sans reconstruire la table.
+
+Usage:
+    model = PassTableModel(catalog, downlink_frequencies(), tz)
+    model.add_passes({'ISS (ZARYA)': predictor.find_passes('ISS (ZARYA)')})
+    model.set_filter(min_elevation=30, band=(136.0, 174.0))
+    view.setModel(model)
+    view.setSortingEnabled(True)
+"""
+
+from datetime import datetime
+import numpy as np
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex
+
+from multi_station import format_duration
+
+DISPLAY = Qt.ItemDataRole.DisplayRole
+ALIGNMENT = Qt.ItemDataRole.TextAlignmentRole
+NAME_ROLE = Qt.ItemDataRole.UserRole  # Nom du satellite de la ligne
+RIGHT = Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter
+
+
+def frequency_column(norad_ids, frequencies):
+    """Fréquence (MHz) de chaque identifiant NORAD, NaN si inconnue"""
+    column = np.full(len(norad_ids), np.nan)
+    for norad_id, mhz in frequencies.items():
+        column[norad_ids == norad_id] = mhz
+    return column
+
+
+def unix_times(ts, tt_jd):
+    """Dates juliennes TT -> secondes Unix (UTC), une conversion Skyfield par lot"""
+    tt_jd = np.asarray(tt_jd, dtype=float)
+    if not len(tt_jd):
+        return tt_jd
+    return np.array([moment.timestamp() for moment in ts.tt_jd(tt_jd).utc_datetime()])
+
+
+class ArrayTableModel(QAbstractTableModel):
+    """Table sur des colonnes NumPy; l'affichage est une permutation des lignes
+    (filtrées puis triées), recalculée d'un bloc"""
+
+    COLUMNS = ()  # (clé, en-tête)
+    NUMERIC = ()  # Clés alignées à droite
+    DTYPES = {}   # Type de chaque colonne stockée
+
+    def __init__(self, catalog=None, frequencies=None):
+        super().__init__()
+        self.catalog = catalog
+        self.frequencies = frequencies or {}
+        self.criteria = {}
+        self.sort_column = None
+        self.sort_order = Qt.SortOrder.AscendingOrder
+        self._clear_columns()
+
+    def _clear_columns(self):
+        self.columns = {key: np.zeros(0, dtype=dtype) for key, dtype in self.DTYPES.items()}
+        self.size = 0
+        self.rows = np.zeros(0, dtype=np.intp)  # Lignes affichées (indices dans les colonnes)
+
+    # Interface QAbstractTableModel
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.COLUMNS)
+
+    def headerData(self, section, orientation, role=DISPLAY):
+        if role == DISPLAY and orientation == Qt.Orientation.Horizontal:
+            return self.COLUMNS[section][1]
+        return None
+
+    def data(self, index, role=DISPLAY):
+        if not index.isValid():
+            return None
+        row = int(self.rows[index.row()])
+        key = self.COLUMNS[index.column()][0]
+        if role == DISPLAY:
+            return self.text(row, key)
+        if role == ALIGNMENT and key in self.NUMERIC:
+            return RIGHT
+        if role == NAME_ROLE:
+            return self.columns['name'][row]
+        return None
+
+    def sort(self, column, order=Qt.SortOrder.AscendingOrder):
+        self.sort_column, self.sort_order = column, order
+        self._reorder()
+
+    # À compléter par les sous-classes
+
+    def text(self, row, key):
+        return str(self.columns[key][row])
+
+    def sort_key(self, key):
+        return self.columns[key]
+
+    def filter_mask(self, start=0):
+        """Lignes retenues par les critères, à partir de la ligne start"""
+        criteria = self.criteria
+        mask = np.ones(self.size - start, dtype=bool)
+        if criteria.get('text'):
+            query = criteria['text'].upper()
+            mask &= np.char.find(self.columns['search'][start:], query) >= 0
+        category = criteria.get('category')
+        if category is not None:
+            categories = getattr(self.catalog, 'categories', [])
+            if category in categories:
+                bit = np.uint32(1) << np.uint32(categories.index(category))
+                mask &= (self.columns['membership'][start:] & bit) != 0
+            else:
+                mask[:] = False
+        band = criteria.get('band')
+        if band is not None:
+            frequency = self.columns['frequency'][start:]
+            mask &= (frequency >= band[0]) & (frequency <= band[1])
+        return mask
+
+    # Mise à jour
+
+    def name_at(self, row):
+        """Nom du satellite d'une ligne affichée"""
+        return self.columns['name'][int(self.rows[row])]
+
+    def total(self):
+        return self.size
+
+    def set_filter(self, **criteria):
+        """Modifie des critères (None = sans filtre): text, category, band (MHz min, max)..."""
+        self.criteria.update(criteria)
+        self.beginResetModel()
+        self.rows = self._ordered_rows()
+        self.endResetModel()
+
+    def clear(self):
+        self.beginResetModel()
+        self._clear_columns()
+        self.endResetModel()
+
+    def append(self, columns):
+        """Ajoute des lignes {clé: tableau}: insérées en fin de vue, puis triées si besoin"""
+        count = len(columns['name'])
+        if not count:
+            return
+        start = self.size
+        for key in self.columns:
+            self.columns[key] = np.concatenate((self.columns[key], columns[key]))
+        self.size += count
+
+        visible = start + np.flatnonzero(self.filter_mask(start))
+        if len(visible):
+            first = len(self.rows)
+            self.beginInsertRows(QModelIndex(), first, first + len(visible) - 1)
+            self.rows = np.concatenate((self.rows, visible))
+            self.endInsertRows()
+            if self.sort_column is not None:
+                self._reorder()
+
+    def _ordered_rows(self):
+        rows = np.flatnonzero(self.filter_mask())
+        if self.sort_column is not None and len(rows):
+            keys = self.sort_key(self.COLUMNS[self.sort_column][0])[rows]
+            descending = self.sort_order == Qt.SortOrder.DescendingOrder
+            if descending and keys.dtype.kind == 'f':
+                order = np.argsort(-keys, kind='stable')  # Valeurs inconnues (NaN) toujours en fin
+            else:
+                order = np.argsort(keys, kind='stable')
+                if descending:
+                    order = order[::-1]
+            rows = rows[order]
+        return rows
+
+    def _reorder(self):
+        """Nouveau tri des mêmes lignes: la sélection suit ses lignes de données"""
+        self.layoutAboutToBeChanged.emit()
+        persistent = self.persistentIndexList()
+        data_rows = [int(self.rows[index.row()]) for index in persistent]
+        self.rows = self._ordered_rows()
+        if persistent:
+            position = np.zeros(self.size, dtype=np.intp)
+            position[self.rows] = np.arange(len(self.rows))
+            self.changePersistentIndexList(persistent, [self.index(int(position[row]), index.column())
+                                                        for row, index in zip(data_rows, persistent)])
+        self.layoutChanged.emit()
+
+
+class SatelliteListModel(ArrayTableModel):
+    """Liste des satellites du catalogue unifié, filtrable par nom, catégorie et bande"""
+
+    COLUMNS = (('name', "Nom"), ('norad', "NORAD"), ('frequency', "Fréq. (MHz)"),
+               ('categories', "Catégories"))
+    NUMERIC = ('norad', 'frequency')
+    DTYPES = {'name': object, 'search': 'U1', 'norad': np.int64, 'membership': np.uint32,
+              'frequency': float}
+
+    def set_catalog(self, catalog):
+        """Remplace toutes les lignes par les objets d'un catalogue"""
+        self.beginResetModel()
+        self.catalog = catalog
+        self._clear_columns()
+        self.endResetModel()
+        records = catalog.records
+        membership = getattr(catalog, 'membership', None)
+        self.append({
+            'name': np.array(catalog.names, dtype=object),
+            'search': np.char.upper(np.char.decode(records['name'], 'utf-8')),
+            'norad': records['norad_id'].astype(np.int64),
+            'membership': membership if membership is not None else np.zeros(len(records), np.uint32),
+            'frequency': frequency_column(records['norad_id'], self.frequencies),
+        })
+
+    def row_of(self, name):
+        """Ligne affichée d'un satellite, ou None"""
+        rows = np.flatnonzero(self.columns['name'][self.rows] == name)
+        return int(rows[0]) if len(rows) else None
+
+    def text(self, row, key):
+        if key == 'frequency':
+            frequency = self.columns['frequency'][row]
+            return "" if np.isnan(frequency) else f"{frequency:.3f}"
+        if key == 'categories':
+            return ", ".join(self.catalog.categories_of(row)) if hasattr(self.catalog, 'categories_of') else ""
+        return str(self.columns[key][row])
+
+    def sort_key(self, key):
+        return self.columns['membership' if key == 'categories' else key]
+
+
+class PassTableModel(ArrayTableModel):
+    """Table des passages de tous les satellites, filtrable par élévation,
+    période, catégorie et bande de fréquence"""
+
+    COLUMNS = (('name', "Satellite"), ('rise', "Lever"), ('max', "Maximum"), ('set', "Coucher"),
+               ('max_elevation', "Élév. max"), ('duration', "Durée"), ('rise_az', "Az. lever"),
+               ('set_az', "Az. coucher"), ('frequency', "Fréq. (MHz)"), ('categories', "Catégories"))
+    NUMERIC = ('max_elevation', 'duration', 'rise_az', 'set_az', 'frequency')
+    DTYPES = {'name': object, 'search': 'U1', 'membership': np.uint32, 'frequency': float,
+              'rise_jd': float, 'set_jd': float, 'rise': float, 'max': float, 'set': float,
+              'max_elevation': float, 'duration': float, 'rise_az': float, 'set_az': float}
+
+    def __init__(self, catalog=None, frequencies=None, tz=None):
+        super().__init__(catalog, frequencies)
+        self.tz = tz
+
+    def set_catalog(self, catalog):
+        self.catalog = catalog
+        self.clear()
+
+    def add_passes(self, passes):
+        """Ajoute les passages {nom: [passage, ...]} d'un lot de satellites"""
+        rows = [(name, p) for name, sat_passes in passes.items() for p in sat_passes]
+        if not rows:
+            return
+        names = [name for name, p in rows]
+        index = {name: self.catalog.index_of(name) if self.catalog is not None else None
+                 for name in passes}
+        indices = np.array([-1 if index[name] is None else index[name] for name in names])
+        known = indices >= 0
+
+        membership = np.zeros(len(rows), dtype=np.uint32)
+        frequency = np.full(len(rows), np.nan)
+        if known.any():
+            if getattr(self.catalog, 'membership', None) is not None:
+                membership[known] = self.catalog.membership[indices[known]]
+            norad = self.catalog.records['norad_id'][indices[known]]
+            frequency[known] = frequency_column(norad, self.frequencies)
+
+        rise_jd = np.array([p['rise_time'].tt for name, p in rows])
+        max_jd = np.array([p['max_time'].tt for name, p in rows])
+        set_jd = np.array([p['set_time'].tt for name, p in rows])
+        ts = rows[0][1]['rise_time'].ts
+        self.append({
+            'name': np.array(names, dtype=object),
+            'search': np.char.upper(np.array(names, dtype=str)),
+            'membership': membership,
+            'frequency': frequency,
+            'rise_jd': rise_jd,
+            'set_jd': set_jd,
+            'rise': unix_times(ts, rise_jd),
+            'max': unix_times(ts, max_jd),
+            'set': unix_times(ts, set_jd),
+            'max_elevation': np.array([p['max_elevation'] for name, p in rows], dtype=float),
+            'duration': np.array([p['duration_seconds'] for name, p in rows], dtype=float),
+            'rise_az': np.array([p['rise_az'] for name, p in rows], dtype=float),
+            'set_az': np.array([p['set_az'] for name, p in rows], dtype=float),
+        })
+
+    def filter_mask(self, start=0):
+        mask = super().filter_mask(start)
+        min_elevation = self.criteria.get('min_elevation')
+        if min_elevation is not None:
+            mask &= self.columns['max_elevation'][start:] >= min_elevation
+        period = self.criteria.get('period')
+        if period is not None:
+            # Passages en cours ou commençant dans la période (dates juliennes TT)
+            mask &= (self.columns['set_jd'][start:] >= period[0]) & (self.columns['rise_jd'][start:] <= period[1])
+        return mask
+
+    def text(self, row, key):
+        value = self.columns[key][row] if key in self.columns else None
+        if key in ('rise', 'max', 'set'):
+            return datetime.fromtimestamp(value, self.tz).strftime('%d/%m %H:%M:%S')
+        if key == 'duration':
+            return format_duration(value)
+        if key in ('max_elevation', 'rise_az', 'set_az'):
+            return f"{value:.1f}°"
+        if key == 'frequency':
+            return "" if np.isnan(value) else f"{value:.3f}"
+        if key == 'categories':
+            membership = int(self.columns['membership'][row])
+            categories = getattr(self.catalog, 'categories', [])
+            return ", ".join(c for i, c in enumerate(categories) if membership >> i & 1)
+        return str(value)
+
+    def sort_key(self, key):
+        return self.columns['membership' if key == 'categories' else key]
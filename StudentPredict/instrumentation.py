@@ -0,0 +1,254 @@
+# instrumentation.py
+"""
+Lightweight hot-path instrumentation: counters and latency histograms
+
+Disabled by default (decorated functions are left untouched). Environment variables:
+    SGS_INSTRUMENT=1                     record call counts, errors and latencies
+    SGS_PROFILE=get_position,find_passes also profile these operations
+    SGS_PROFILER=pyinstrument            use pyinstrument instead of cProfile
+    SGS_INSTRUMENT_DIR=path              where dump() writes (default data/instrumentation)
+
+Usage: python instrumentation.py [data/instrumentation/stats.json]  - print a dump
+"""
+
+import atexit
+import functools
+import json
+import math
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from config import DATA_FOLDER
+
+PROFILED = {name for name in os.environ.get('SGS_PROFILE', '').split(',') if name}
+ENABLED = os.environ.get('SGS_INSTRUMENT', '') not in ('', '0') or bool(PROFILED)
+PROFILER = os.environ.get('SGS_PROFILER', 'cprofile')
+OUTPUT_DIR = os.environ.get('SGS_INSTRUMENT_DIR', os.path.join(DATA_FOLDER, 'instrumentation'))
+
+# Histogram bucket upper bounds in milliseconds
+BUCKETS_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 10000, math.inf)
+
+
+class OperationStats:
+    """Call count, errors and latency histogram of one operation"""
+
+    def __init__(self, name):
+        self.name = name
+        self.count = 0
+        self.errors = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+        self.last = 0.0
+        self.histogram = [0] * len(BUCKETS_MS)
+
+    def record(self, seconds):
+        self.count += 1
+        self.total += seconds
+        self.last = seconds
+        self.min = min(self.min, seconds)
+        self.max = max(self.max, seconds)
+        ms = seconds * 1000
+        for i, bound in enumerate(BUCKETS_MS):
+            if ms <= bound:
+                self.histogram[i] += 1
+                break
+
+    def percentile(self, q):
+        """Approximate percentile (ms): upper bound of the bucket holding it"""
+        if not self.count:
+            return 0.0
+        target = q / 100 * self.count
+        seen = 0
+        for bound, n in zip(BUCKETS_MS, self.histogram):
+            seen += n
+            if seen >= target:
+                return min(bound, self.max * 1000)
+        return self.max * 1000
+
+    def as_dict(self):
+        return {
+            'count': self.count,
+            'errors': self.errors,
+            'total_ms': self.total * 1000,
+            'mean_ms': self.total / self.count * 1000 if self.count else 0.0,
+            'min_ms': self.min * 1000 if self.count else 0.0,
+            'max_ms': self.max * 1000,
+            'last_ms': self.last * 1000,
+            'p50_ms': self.percentile(50),
+            'p95_ms': self.percentile(95),
+            'histogram': dict(zip([str(b) for b in BUCKETS_MS], self.histogram)),
+        }
+
+
+_stats = {}
+_counters = {}
+_profilers = {}
+_lock = threading.Lock()
+_active = threading.local()
+
+
+def _get_stats(name):
+    stats = _stats.get(name)
+    if stats is None:
+        with _lock:
+            stats = _stats.setdefault(name, OperationStats(name))
+    return stats
+
+
+def _start_profiler(name):
+    """Start the profiler of an operation, unless another one is running in this thread"""
+    if name not in PROFILED or getattr(_active, 'profiling', False):
+        return None
+    profiler = _profilers.get(name)
+    if profiler is None:
+        if PROFILER == 'pyinstrument':
+            from pyinstrument import Profiler
+            profiler = Profiler()
+        else:
+            import cProfile
+            profiler = cProfile.Profile()
+        _profilers[name] = profiler
+    _active.profiling = True
+    if PROFILER == 'pyinstrument':
+        profiler.start()
+    else:
+        profiler.enable()
+    return profiler
+
+
+def _stop_profiler(profiler):
+    if PROFILER == 'pyinstrument':
+        profiler.stop()
+    else:
+        profiler.disable()
+    _active.profiling = False
+
+
+@contextmanager
+def timed(name):
+    """Time a block of code as operation `name`"""
+    if not ENABLED:
+        yield
+        return
+
+    stats = _get_stats(name)
+    profiler = _start_profiler(name)
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        stats.errors += 1
+        raise
+    finally:
+        stats.record(time.perf_counter() - start)
+        if profiler is not None:
+            _stop_profiler(profiler)
+
+
+def instrumented(name):
+    """Decorator recording every call of a function as operation `name`"""
+    def decorator(func):
+        if not ENABLED:
+            return func
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with timed(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def increment(name, amount=1):
+    """Increment a plain counter"""
+    if ENABLED:
+        with _lock:
+            _counters[name] = _counters.get(name, 0) + amount
+
+
+def record_error(name, error=None):
+    """Count an error that was handled (and not re-raised) by operation `name`"""
+    if ENABLED:
+        _get_stats(name).errors += 1
+        if error is not None:
+            increment(f'{name}.{type(error).__name__}')
+
+
+def get_stats(name):
+    """Stats of one operation as a dict, or None if it never ran"""
+    stats = _stats.get(name)
+    return stats.as_dict() if stats else None
+
+
+def snapshot():
+    """All operations and counters as plain dicts"""
+    return {
+        'operations': {name: stats.as_dict() for name, stats in sorted(_stats.items())},
+        'counters': dict(sorted(_counters.items())),
+    }
+
+
+def reset():
+    with _lock:
+        _stats.clear()
+        _counters.clear()
+        _profilers.clear()
+
+
+def format_report(data=None):
+    """Human readable table of a snapshot"""
+    data = data or snapshot()
+    lines = [f"{'operation':<32} {'count':>8} {'errors':>6} {'mean ms':>10} {'p50 ms':>9} "
+             f"{'p95 ms':>9} {'max ms':>9} {'total s':>9}",
+             "-" * 100]
+    for name, s in data['operations'].items():
+        lines.append(f"{name:<32} {s['count']:>8} {s['errors']:>6} {s['mean_ms']:>10.3f} "
+                     f"{s['p50_ms']:>9.2f} {s['p95_ms']:>9.2f} {s['max_ms']:>9.2f} "
+                     f"{s['total_ms'] / 1000:>9.3f}")
+    if data['counters']:
+        lines.append("")
+        for name, value in data['counters'].items():
+            lines.append(f"{name:<32} {value:>8}")
+    return '\n'.join(lines)
+
+
+def dump(directory=OUTPUT_DIR):
+    """Write stats.json and one profile per profiled operation"""
+    if not os.path.exists(directory):
+        os.makedirs(directory)
+
+    with open(os.path.join(directory, 'stats.json'), 'w') as f:
+        json.dump(snapshot(), f, indent=2)
+
+    for name, profiler in _profilers.items():
+        if PROFILER == 'pyinstrument':
+            with open(os.path.join(directory, f'{name}.html'), 'w') as f:
+                f.write(profiler.output_html())
+        else:
+            profiler.dump_stats(os.path.join(directory, f'{name}.prof'))
+    return directory
+
+
+def _dump_at_exit():
+    if _stats or _counters:
+        print(f"✓ Instrumentation written to {dump()}")
+
+
+if ENABLED:
+    atexit.register(_dump_at_exit)
+
+
+def main():
+    path = sys.argv[1] if len(sys.argv) > 1 else os.path.join(OUTPUT_DIR, 'stats.json')
+    if not os.path.exists(path):
+        print(f"✗ No instrumentation dump at {path} (run with SGS_INSTRUMENT=1 first)")
+        return
+    with open(path) as f:
+        print(format_report(json.load(f)))
+
+
+if __name__ == "__main__":
+    main()
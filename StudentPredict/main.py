@@ -2,6 +2,7 @@
 """
 Satellite Tracker - Command Line Version
 Run this first to test everything works!
+(For scripts and cron jobs, use cli.py: JSON Lines / CSV output.)
 """
 
 from tle_manager import TLEManager
@@ -9,6 +10,7 @@ from tracker import SatelliteTracker
 from predictor import PassPredictor
 from satellite_db import get_satellite_info
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 
 def main():
     print("=" * 60)
@@ -19,14 +21,14 @@ def main():
     print("\n1. Downloading satellite data...")
     tle_mgr = TLEManager()
     
-    # Download different categories
-    stations = tle_mgr.download_tles('stations')
-    weather = tle_mgr.download_tles('weather')
-    amateur = tle_mgr.download_tles('amateur')
+    # Recent local files are reused, the rest is downloaded in parallel
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        stations, weather, amateur = pool.map(tle_mgr.get_tles, ['stations', 'weather', 'amateur'])
     
     # Step 2: Initialize tracker
     print("\n2. Initializing tracker...")
     tracker = SatelliteTracker()
+    tracker.use_history(tle_mgr.history)
     
     # Add ISS
     iss_tle = tle_mgr.get_satellite_by_name('ISS', 'stations')
@@ -67,7 +69,7 @@ def main():
         print(f"\n📡 {sat_name}")
         print("-" * 60)
         
-        passes = predictor.find_passes(sat_name, duration_days=7)
+        passes = predictor.find_visible_passes([sat_name], duration_days=7)[sat_name]
         
         if passes:
             best_pass = predictor.get_best_pass(passes)
@@ -77,6 +79,9 @@ def main():
             print(f"   Max:   {best_pass['max_time_str']} (Elevation: {best_pass['max_elevation']:.1f}°)")
             print(f"   Set:   {best_pass['set_time_str']}")
             print(f"   Duration: {best_pass['duration_str']}")
+            print(f"   Visibility: {best_pass['visibility']}")
+            visible = [p for p in passes if p['visibility'] != 'invisible']
+            print(f"   Visible passes: {len(visible)}/{len(passes)}")
             
             info = get_satellite_info(sat_name)
             if info.get('description'):
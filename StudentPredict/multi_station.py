@@ -0,0 +1,214 @@
+# multi_station.py
+"""
+Multi-station tracking with shared propagation
+Satellites are propagated once per time; az/el for every station is then a
+single batched rotation, so adding a station does not add SGP4 work.
+"""
+
+import numpy as np
+from config import STATIONS, MIN_ELEVATION
+from propagation import DAY_S, time_grid, propagate_itrs, observer_frame, look_angles
+
+REFINE_ITERATIONS = 12  # Bisection steps for rise/set times (30 s / 2^12 < 0.01 s)
+
+
+class Station:
+    """A ground station and its Earth-fixed frame"""
+
+    def __init__(self, name, lat, lon, elevation=0):
+        self.name = name
+        self.lat = lat
+        self.lon = lon
+        self.elevation = elevation
+        self.position, self.rotation = observer_frame(lat, lon, elevation)
+
+
+def format_duration(seconds):
+    hours = int(seconds // 3600)
+    minutes = int((seconds % 3600) // 60)
+    return f"{hours:02d}:{minutes:02d}:{int(seconds % 60):02d}"
+
+
+class MultiStationTracker:
+    """Tracks satellites from N ground stations at once"""
+
+    def __init__(self, tracker, stations=STATIONS):
+        self.tracker = tracker
+        self.ts = tracker.ts
+        self.stations = []
+        self._cache_key = None
+        self._cache = None
+        for station in stations:
+            self.add_station(**station)
+
+    def add_station(self, name, lat, lon, elevation=0):
+        """Add a ground station (only its frame is computed, nothing is re-propagated)"""
+        self.stations.append(Station(name, lat, lon, elevation))
+        self.positions = np.array([s.position for s in self.stations])
+        self.rotations = np.array([s.rotation for s in self.stations])
+
+    @property
+    def station_names(self):
+        return [s.name for s in self.stations]
+
+    def geocentric(self, sat_names, t):
+        """Earth-fixed positions (N, T, 3) of satellites; the last result is reused"""
+        key = (tuple(sat_names), np.atleast_1d(t.tt).tobytes())
+        if key != self._cache_key:
+            satrecs = [self.tracker.satellite_for_time(name, t[0] if t.shape else t).model
+                       for name in sat_names]
+            r, v, errors = propagate_itrs(satrecs, t)
+            self._cache_key, self._cache = key, r
+        return self._cache
+
+    def look_angles(self, sat_names, t):
+        """Azimuth, elevation and range arrays of shape (stations, satellites, times)"""
+        return look_angles(self.geocentric(sat_names, t), self.positions, self.rotations)
+
+    def get_positions(self, sat_names=None, time=None):
+        """Az/el of satellites from every station: {station: {satellite: {...}}}"""
+        if sat_names is None:
+            sat_names = self.tracker.satellite_names()
+        if time is None:
+            time = self.tracker.now()
+
+        az, el, distance = self.look_angles(sat_names, time)
+        positions = {}
+        for s, station in enumerate(self.stations):
+            positions[station.name] = {
+                name: {
+                    'time': time.utc_iso(),
+                    'azimuth': float(az[s, i, 0]),
+                    'elevation': float(el[s, i, 0]),
+                    'distance_km': float(distance[s, i, 0]),
+                    'is_visible': bool(el[s, i, 0] > 0),
+                }
+                for i, name in enumerate(sat_names)
+            }
+        return positions
+
+    def _elevation_at(self, satrec, station_index, jd_tt):
+        """Elevation of one satellite for a batch of (station, time) pairs"""
+        t = self.ts.tt_jd(jd_tt)
+        r, v, errors = propagate_itrs([satrec], t)
+        az, el, distance = look_angles(r[0], self.positions, self.rotations)
+        return el[station_index, np.arange(len(jd_tt))], az[station_index, np.arange(len(jd_tt))]
+
+    def _refine_crossings(self, satrec, station_index, lo, hi, min_elevation, rising):
+        """Bisect all horizon crossings at once, return crossing times (TT Julian dates)"""
+        for _ in range(REFINE_ITERATIONS):
+            mid = (lo + hi) / 2
+            el, az = self._elevation_at(satrec, station_index, mid)
+            above = el >= min_elevation
+            # Rising: crossing is after mid if still below. Setting: after mid if still above.
+            after = np.where(rising, ~above, above)
+            lo = np.where(after, mid, lo)
+            hi = np.where(after, hi, mid)
+        return (lo + hi) / 2
+
+    def find_passes(self, sat_name, duration_days=7, min_elevation=MIN_ELEVATION,
+                    start_time=None, step_seconds=30):
+        """Passes above min_elevation for every station: {station: [pass, ...]}
+
+        The satellite is propagated once on a `step_seconds` grid; rise/set are
+        then bisected for all stations together. Passes shorter than the step
+        can be missed.
+        """
+        if self.tracker.get_satellite(sat_name) is None:
+            return {}
+        t0 = start_time if start_time is not None else self.tracker.now()
+        t = time_grid(self.ts, t0, duration_days * DAY_S, step_seconds)
+        az, el, distance = self.look_angles([sat_name], t)
+        az, el = az[:, 0], el[:, 0]
+        satrec = self.tracker.satellite_for_time(sat_name, t0).model
+        jd = t.tt
+
+        above = el >= min_elevation
+        change = np.diff(above.astype(np.int8), axis=1)
+        station_idx, step_idx = np.nonzero(change)
+        rising = change[station_idx, step_idx] > 0
+
+        crossings = self._refine_crossings(satrec, station_idx, jd[step_idx], jd[step_idx + 1],
+                                           min_elevation, rising)
+        cross_el, cross_az = self._elevation_at(satrec, station_idx, crossings)
+
+        passes = {station.name: [] for station in self.stations}
+        for s, station in enumerate(self.stations):
+            events = np.flatnonzero(station_idx == s)
+            # Keep complete rise -> set pairs only (like PassPredictor)
+            for a, b in zip(events[:-1], events[1:]):
+                if not (rising[a] and not rising[b]):
+                    continue
+                i0, i1 = step_idx[a] + 1, step_idx[b] + 1
+                peak = i0 + int(np.argmax(el[s, i0:i1])) if i1 > i0 else i0
+                max_jd = self._refine_peak(satrec, s, jd, el[s], peak)
+                max_el, max_az = self._elevation_at(satrec, np.array([s]), np.array([max_jd]))
+
+                rise_time = self.ts.tt_jd(crossings[a])
+                max_time = self.ts.tt_jd(max_jd)
+                set_time = self.ts.tt_jd(crossings[b])
+                duration = (crossings[b] - crossings[a]) * DAY_S
+                passes[station.name].append({
+                    'station': station.name,
+                    'rise_time': rise_time,
+                    'rise_az': float(cross_az[a]),
+                    'max_time': max_time,
+                    'max_elevation': float(max_el[0]),
+                    'max_azimuth': float(max_az[0]),
+                    'set_time': set_time,
+                    'set_az': float(cross_az[b]),
+                    'duration_seconds': duration,
+                    'rise_time_str': rise_time.utc_iso(),
+                    'max_time_str': max_time.utc_iso(),
+                    'set_time_str': set_time.utc_iso(),
+                    'duration_str': format_duration(duration),
+                })
+        return passes
+
+    @staticmethod
+    def _parabola_peak(x, y0, y1, y2, h):
+        """Abscissa of the vertex of a parabola through (x-h, y0), (x, y1), (x+h, y2)"""
+        denominator = y0 - 2 * y1 + y2
+        if denominator == 0:
+            return x
+        return x + 0.5 * (y0 - y2) / denominator * h
+
+    def _refine_peak(self, satrec, station_index, jd, el, i):
+        """Time of maximum elevation: parabola through the grid samples around
+        index i, then a second one through samples 5 s apart around that"""
+        if i == 0 or i >= len(el) - 1:
+            return jd[i]
+        peak = self._parabola_peak(jd[i], el[i - 1], el[i], el[i + 1], jd[i + 1] - jd[i])
+
+        h = 5.0 / DAY_S
+        samples = np.array([peak - h, peak, peak + h])
+        fine, az = self._elevation_at(satrec, np.full(3, station_index), samples)
+        return self._parabola_peak(peak, fine[0], fine[1], fine[2], h)
+
+    def coverage_overlap(self, sat_name, duration_days=1, min_elevation=MIN_ELEVATION,
+                         min_stations=2, start_time=None, step_seconds=30):
+        """Intervals when at least `min_stations` stations see the satellite simultaneously"""
+        if self.tracker.get_satellite(sat_name) is None:
+            return []
+        t0 = start_time if start_time is not None else self.tracker.now()
+        t = time_grid(self.ts, t0, duration_days * DAY_S, step_seconds)
+        az, el, distance = self.look_angles([sat_name], t)
+        visible = el[:, 0] >= min_elevation
+
+        overlap = visible.sum(axis=0) >= min_stations
+        edges = np.diff(np.concatenate([[0], overlap.astype(np.int8), [0]]))
+        starts, stops = np.flatnonzero(edges == 1), np.flatnonzero(edges == -1) - 1
+
+        intervals = []
+        for i0, i1 in zip(starts, stops):
+            seen_by = visible[:, i0:i1 + 1].any(axis=1)
+            start, end = t[int(i0)], t[int(i1)]
+            intervals.append({
+                'start': start,
+                'end': end,
+                'start_str': start.utc_iso(),
+                'end_str': end.utc_iso(),
+                'duration_seconds': int(i1 - i0) * step_seconds,
+                'stations': [s.name for s, seen in zip(self.stations, seen_by) if seen],
+            })
+        return intervals
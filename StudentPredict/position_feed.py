@@ -0,0 +1,358 @@
+# position_feed.py
+"""
+Shared-memory position feed: propagate once, read from any local process
+A producer propagates every tracked satellite every FEED_INTERVAL_S and
+writes the state vectors and look angles into a ring of slots in a
+multiprocessing.shared_memory block. Each slot is guarded by a sequence
+number (seqlock: odd while being written), so consumers attach to the block
+and read the latest slot with a plain memory copy, without locks, pipes or
+serialization. The producer's cost does not depend on the number of readers.
+
+Block layout (little-endian, sections aligned on 64 bytes):
+    header      HEADER_DTYPE
+    satellites  count x NAME_DTYPE (fixed for the life of the block)
+    slots       slots x (SLOT_DTYPE, count x FEED_DTYPE)
+
+Usage:
+    python position_feed.py serve --category stations        # producer
+    python position_feed.py watch "ISS (ZARYA)" "NOAA 19"     # consumer
+"""
+
+import argparse
+import os
+import sys
+import time
+import numpy as np
+from multiprocessing import shared_memory
+from config import (OBSERVER_LAT, OBSERVER_LON, OBSERVER_ELEVATION, FEED_NAME, FEED_SLOTS, FEED_INTERVAL_S,
+                    FEED_READ_TIMEOUT_S)
+from propagation import propagate_itrs, geodetic, observer_frame, look_angles
+
+FEED_MAGIC = b'SGSFEED\x00'
+FEED_VERSION = 1  # Bump whenever one of the dtypes below changes
+ALIGN = 64
+
+_produced = set()  # Blocks created by this process (a reader here must not unregister them)
+
+HEADER_DTYPE = np.dtype([
+    ('magic', 'S8'),
+    ('version', '<u4'),
+    ('slots', '<u4'),
+    ('count', '<u4'),
+    ('pid', '<u4'),           # Producer process
+    ('interval_s', '<f8'),
+    ('frame', '<u8'),         # Frames published so far; the latest is in slot (frame - 1) % slots
+    ('observer', '<f8', 3),   # lat, lon (deg), elevation (m) of the look angles
+])
+
+NAME_DTYPE = np.dtype([('name', 'S24'), ('norad_id', '<u4')])
+
+SLOT_DTYPE = np.dtype([
+    ('seq', '<u8'),           # Odd while the producer writes the slot
+    ('frame', '<u8'),
+    ('jd', '<f8'),            # TT Julian date of the positions
+    ('unix', '<f8'),          # Wall-clock time they were published
+])
+
+FEED_DTYPE = np.dtype([
+    ('x_km', '<f8'), ('y_km', '<f8'), ('z_km', '<f8'),                 # Earth-fixed (ITRS)
+    ('vx_km_s', '<f8'), ('vy_km_s', '<f8'), ('vz_km_s', '<f8'),
+    ('latitude', '<f8'), ('longitude', '<f8'), ('altitude_km', '<f8'),
+    ('azimuth', '<f8'), ('elevation', '<f8'), ('distance_km', '<f8'), ('range_rate_km_s', '<f8'),
+])
+
+
+def _aligned(size):
+    return -(-size // ALIGN) * ALIGN
+
+
+class FeedLayout:
+    """NumPy views of the sections of a feed block"""
+
+    def __init__(self, buf, count, slots):
+        self.header = np.ndarray((), HEADER_DTYPE, buf, 0)
+        offset = _aligned(HEADER_DTYPE.itemsize)
+        self.satellites = np.ndarray((count,), NAME_DTYPE, buf, offset)
+        offset += _aligned(count * NAME_DTYPE.itemsize)
+        slot_size = _aligned(SLOT_DTYPE.itemsize) + _aligned(count * FEED_DTYPE.itemsize)
+        self.slots = []
+        for i in range(slots):
+            start = offset + i * slot_size
+            self.slots.append((np.ndarray((), SLOT_DTYPE, buf, start),
+                               np.ndarray((count,), FEED_DTYPE, buf, start + _aligned(SLOT_DTYPE.itemsize))))
+
+    @staticmethod
+    def size(count, slots):
+        slot_size = _aligned(SLOT_DTYPE.itemsize) + _aligned(count * FEED_DTYPE.itemsize)
+        return (_aligned(HEADER_DTYPE.itemsize) + _aligned(count * NAME_DTYPE.itemsize)
+                + slots * slot_size)
+
+
+class FeedProducer:
+    """Propagates a fixed set of satellites and publishes them into a new shared-memory block
+
+    The block is unlinked by close(); consumers still attached keep reading
+    their mapping but see no new frames.
+    """
+
+    def __init__(self, tracker, names, name=FEED_NAME, slots=FEED_SLOTS, interval_s=FEED_INTERVAL_S,
+                 observer=(OBSERVER_LAT, OBSERVER_LON, OBSERVER_ELEVATION)):
+        self.tracker = tracker
+        self.interval_s = interval_s
+        t = tracker.now()
+        satellites = [tracker.satellite_for_time(n, t) for n in names]
+        self.names = [n for n, sat in zip(names, satellites) if sat is not None]
+        self.satrecs = [sat.model for sat in satellites if sat is not None]
+        self.position, self.rotation = observer_frame(*observer)
+
+        count = len(self.names)
+        try:
+            self.shm = shared_memory.SharedMemory(name, create=True, size=FeedLayout.size(count, slots))
+        except FileExistsError:
+            raise FileExistsError(f"Position feed '{name}' already exists (another producer running?)") from None
+        _produced.add(name)
+        self.name = name
+        self.layout = FeedLayout(self.shm.buf, count, slots)
+        self.layout.satellites['name'] = [n.encode('utf-8')[:24] for n in self.names]
+        self.layout.satellites['norad_id'] = [satrec.satnum for satrec in self.satrecs]
+        header = self.layout.header
+        header['version'], header['slots'], header['count'] = FEED_VERSION, slots, count
+        header['pid'], header['interval_s'], header['observer'] = os.getpid(), interval_s, observer
+        header['magic'] = FEED_MAGIC  # Last: readers wait for it
+
+    def publish(self, t=None):
+        """Propagate at t (default: the tracker's time) into the next slot"""
+        t = t if t is not None else self.tracker.now()
+        r, v, errors = propagate_itrs(self.satrecs, t)
+        r, v = r[:, 0], v[:, 0]
+        lat, lon, alt = geodetic(r)
+        az, el, distance = look_angles(r, self.position[None], self.rotation[None])
+        relative = r - self.position
+        range_rate = np.einsum('...i,...i', relative, v) / distance[0]
+
+        header = self.layout.header
+        frame = int(header['frame']) + 1
+        slot, records = self.layout.slots[(frame - 1) % len(self.layout.slots)]
+        slot['seq'] += 1  # Odd: readers retry
+        records['x_km'], records['y_km'], records['z_km'] = r.T
+        records['vx_km_s'], records['vy_km_s'], records['vz_km_s'] = v.T
+        records['latitude'], records['longitude'], records['altitude_km'] = lat, lon, alt
+        records['azimuth'], records['elevation'], records['distance_km'] = az[0], el[0], distance[0]
+        records['range_rate_km_s'] = range_rate
+        slot['frame'], slot['jd'], slot['unix'] = frame, t.tt, time.time()
+        slot['seq'] += 1  # Even again: slot consistent
+        header['frame'] = frame
+        return frame
+
+    def run(self, stop=None):
+        """Publish every interval_s until stop (a threading.Event) is set or Ctrl-C"""
+        try:
+            while stop is None or not stop.is_set():
+                started = time.monotonic()
+                self.publish()
+                delay = self.interval_s - (time.monotonic() - started)
+                if stop is not None:
+                    stop.wait(max(delay, 0))
+                elif delay > 0:
+                    time.sleep(delay)
+        except KeyboardInterrupt:
+            pass
+
+    def close(self):
+        self.layout = None  # Views must go before the mapping
+        self.shm.close()
+        self.shm.unlink()
+        _produced.discard(self.name)
+
+
+class FeedReader:
+    """Attaches to a producer's block and reads its latest frame (lock-free, no serialization)"""
+
+    def __init__(self, name=FEED_NAME, wait_s=5.0):
+        try:
+            self.shm = shared_memory.SharedMemory(name)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"No position feed '{name}' (start 'python position_feed.py serve')") from None
+        # Only the producer may unlink the block (Python < 3.13 registers readers too)
+        if name not in _produced:
+            from multiprocessing import resource_tracker
+            resource_tracker.unregister(self.shm._name, 'shared_memory')
+
+        header = np.ndarray((), HEADER_DTYPE, self.shm.buf, 0)
+        deadline = time.monotonic() + wait_s
+        while header['magic'] != FEED_MAGIC and time.monotonic() < deadline:
+            time.sleep(0.01)  # Producer still initializing
+        if header['magic'] != FEED_MAGIC or header['version'] != FEED_VERSION:
+            del header
+            self.shm.close()
+            raise ValueError(f"'{name}' is not a version {FEED_VERSION} position feed")
+        self.layout = FeedLayout(self.shm.buf, int(header['count']), int(header['slots']))
+        self.pid = int(header['pid'])
+        self.interval_s = float(header['interval_s'])
+        self.observer = tuple(header['observer'].tolist())
+        del header
+        self.names = [n.decode('utf-8', 'ignore') for n in self.layout.satellites['name'].tolist()]
+        self.norad_ids = self.layout.satellites['norad_id'].copy()
+        self.index = {n: i for i, n in reversed(list(enumerate(self.names)))}
+        self.retries = 0
+        self._ts = None
+
+    @property
+    def frame(self):
+        """Number of frames published so far"""
+        return int(self.layout.header['frame'])
+
+    def producer_alive(self):
+        """False once the producer process is gone (a block left behind by a crash)"""
+        try:
+            os.kill(self.pid, 0)
+        except ProcessLookupError:
+            return False
+        except OSError:
+            pass  # Exists but belongs to another user
+        return True
+
+    def read(self, rows=None, timeout_s=FEED_READ_TIMEOUT_S):
+        """(frame, TT Julian date, records) of the latest frame, or None before the first
+
+        records is a copy (FEED_DTYPE) of all satellites, or of the given
+        row indices. Copies taken while the producer rewrote the slot are
+        detected by the sequence number and taken again, for at most
+        timeout_s: a producer that died (or hangs) halfway through a slot
+        raises RuntimeError instead of spinning forever.
+        """
+        slots = self.layout.slots
+        deadline = None
+        while True:
+            frame = int(self.layout.header['frame'])
+            if frame == 0:
+                return None
+            slot, records = slots[(frame - 1) % len(slots)]
+            seq = int(slot['seq'])
+            if seq % 2 == 0:
+                jd = float(slot['jd'])
+                data = records.copy() if rows is None else records[rows]
+                if int(slot['seq']) == seq and int(slot['frame']) == frame:
+                    return frame, jd, data
+            self.retries += 1
+            if deadline is None:
+                deadline = time.monotonic() + timeout_s
+            elif time.monotonic() > deadline:
+                if not self.producer_alive():
+                    raise RuntimeError(f"Position feed producer (pid {self.pid}) exited while writing "
+                                       f"frame {frame}")
+                raise RuntimeError(f"Position feed frame {frame} still being written after {timeout_s:g} s")
+            elif seq % 2:
+                time.sleep(0.0001)  # Let the producer finish the slot
+
+    def age_s(self):
+        """Seconds since the latest frame was published (inf before the first)"""
+        frame = self.frame
+        if frame == 0:
+            return float('inf')
+        slot, records = self.layout.slots[(frame - 1) % len(self.layout.slots)]
+        return time.time() - float(slot['unix'])
+
+    def positions(self, names=None):
+        """Latest {name: position} in the format of SatelliteTracker.get_position
+        (without sunlit, with the TT 'jd' and range_rate_km_s), for every
+        satellite or the given names"""
+        names = self.names if names is None else [n for n in names if n in self.index]
+        latest = self.read(np.array([self.index[n] for n in names], dtype=np.intp))
+        if latest is None:
+            return {}
+        frame, jd, records = latest
+        if self._ts is None:
+            from skyfield_data import get_timescale
+            self._ts = get_timescale()
+        time_str = self._ts.tt_jd(jd).utc_iso()
+        return {
+            name: {
+                'time': time_str,
+                'jd': jd,
+                'latitude': float(row['latitude']),
+                'longitude': float(row['longitude']),
+                'altitude_km': float(row['altitude_km']),
+                'azimuth': float(row['azimuth']),
+                'elevation': float(row['elevation']),
+                'distance_km': float(row['distance_km']),
+                'range_rate_km_s': float(row['range_rate_km_s']),
+                'is_visible': bool(row['elevation'] > 0),
+            }
+            for name, row in zip(names, records)
+        }
+
+    def close(self):
+        self.layout = None
+        self.shm.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Shared-memory position feed (producer or consumer)')
+    parser.add_argument('command', choices=('serve', 'watch'))
+    parser.add_argument('satellites', nargs='*', help='serve: satellites to publish (default: whole category); '
+                                                      'watch: satellites to print (default: all)')
+    parser.add_argument('--category', default='stations', help='TLE category to serve (default: stations)')
+    parser.add_argument('--name', default=FEED_NAME, help=f'Shared-memory block name (default: {FEED_NAME})')
+    parser.add_argument('--interval', type=float, default=FEED_INTERVAL_S,
+                        help=f'Seconds between frames (serve) or lines (watch) (default: {FEED_INTERVAL_S})')
+    args = parser.parse_args()
+
+    if args.command == 'watch':
+        try:
+            reader = FeedReader(args.name)
+        except (FileNotFoundError, ValueError) as e:
+            print(f"✗ {e}")
+            sys.exit(1)
+        names = args.satellites or reader.names
+        try:
+            while True:
+                for name, p in reader.positions(names).items():
+                    print(f"{name:<24} az {p['azimuth']:6.1f}°  el {p['elevation']:5.1f}°  "
+                          f"{p['distance_km']:8.1f} km  {p['range_rate_km_s']:+6.3f} km/s")
+                print(f"-- frame {reader.frame}, {reader.age_s():.2f} s old")
+                time.sleep(args.interval)
+        except KeyboardInterrupt:
+            pass
+        except RuntimeError as e:
+            print(f"✗ {e}")
+            sys.exit(1)
+        finally:
+            reader.close()
+        return
+
+    from tle_manager import TLEManager
+    from tracker import SatelliteTracker
+    tle_mgr = TLEManager()
+    catalog = tle_mgr.load_catalog(args.category)
+    if catalog is None:
+        tle_mgr.get_tles(args.category)
+        catalog = tle_mgr.load_catalog(args.category)
+    if catalog is None:
+        print(f"✗ No TLEs for category '{args.category}'")
+        sys.exit(1)
+
+    tracker = SatelliteTracker()
+    tracker.load_catalog(catalog)
+    tracker.use_history(tle_mgr.history)
+    names = []
+    for name in args.satellites or catalog.names:
+        index = catalog.find(name)
+        if index is None:
+            print(f"✗ Satellite not found: {name}")
+        else:
+            names.append(catalog.names[index])
+    try:
+        producer = FeedProducer(tracker, names, args.name, interval_s=args.interval)
+    except FileExistsError as e:
+        print(f"✗ {e}")
+        sys.exit(1)
+    print(f"✓ Publishing {len(producer.names)} satellites to '{args.name}' every {args.interval:g} s")
+    try:
+        producer.run()
+    finally:
+        producer.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,33 +1,221 @@
 # predictor.py
 """
 Satellite pass prediction and signal analysis
+Orbits are classified from mean motion and eccentricity first: satellites
+that can never rise high enough at the observer's latitude and
+geostationary objects (always or never above the horizon) are settled
+without any search, and the coarse search step depends on the class.
 """
 
 from skyfield.api import load
 from datetime import datetime, timedelta
 import numpy as np
-from config import MIN_ELEVATION
+from config import (MIN_ELEVATION, LEO_MIN_MEAN_MOTION, GEO_MEAN_MOTION, HEO_MIN_ECCENTRICITY,
+                    PASS_SEARCH_STEP, PASS_MIN_DIP_S, GEO_CHECK_STEP_S, ORBIT_SCREEN_MARGIN_DEG)
+from instrumentation import instrumented
+from propagation import DAY_S, EARTH_RADIUS_KM, time_grid, propagate_itrs, observer_frame, look_angles
+from visibility import label_passes
+
+EARTH_MU = 398600.4418  # km³/s²
+
+# Orbit classes
+LEO = 'LEO'
+MEO = 'MEO'
+HEO = 'HEO'
+GEO = 'GEO'
+
+# Screening verdicts
+SEARCH = 'search'  # Passes possible: search them
+NEVER = 'never'    # Never above the minimum elevation during the window
+ALWAYS = 'always'  # Above it during the whole window (geostationary)
+
+
+def mean_motion_rev_day(satrec):
+    return satrec.no_kozai * 1440.0 / (2 * np.pi)
+
+
+def orbit_class(satrec):
+    """LEO, MEO, HEO or GEO from the mean motion and eccentricity of an SGP4 model"""
+    mean_motion = mean_motion_rev_day(satrec)
+    if satrec.ecco >= HEO_MIN_ECCENTRICITY:
+        return HEO
+    if GEO_MEAN_MOTION[0] <= mean_motion <= GEO_MEAN_MOTION[1]:
+        return GEO
+    if mean_motion >= LEO_MIN_MEAN_MOTION:
+        return LEO
+    return MEO
+
+
+def can_rise(satrec, latitude, min_elevation, margin_deg=ORBIT_SCREEN_MARGIN_DEG):
+    """False when the orbit can never bring the satellite above min_elevation at this latitude
+
+    The ground track never goes further from the equator than the
+    inclination (180° - inclination for retrograde orbits), and from its
+    apogee radius the satellite is above min_elevation within an Earth
+    central angle of arccos(R cos(el) / r) - el of its subpoint (spherical
+    Earth; the margin covers geodetic latitude and perturbations).
+    """
+    n = satrec.no_kozai / 60.0  # rad/s
+    if not n > 0:
+        return True
+    apogee = (EARTH_MU / n ** 2) ** (1 / 3) * (1 + satrec.ecco)
+    el = np.radians(min_elevation)
+    reach = np.degrees(np.arccos(min(EARTH_RADIUS_KM * np.cos(el) / apogee, 1.0))) - min_elevation
+    inclination = np.degrees(satrec.inclo)
+    ground_track = min(inclination, 180.0 - inclination)
+    return abs(latitude) <= ground_track + reach + margin_deg
+
+
+def search_step_days(satrec, orbit=None):
+    """Coarse step of the pass search: a fraction of the orbital period set per
+    orbit class, at most a quarter day (the Earth turns under slow satellites).
+    Eccentric orbits can dip below the minimum elevation for a few minutes
+    near apogee: their step is also bounded by PASS_MIN_DIP_S so such dips
+    split passes like on multi_station's grid."""
+    orbit = orbit or orbit_class(satrec)
+    orbits_per_day = max(mean_motion_rev_day(satrec), 1.0)
+    step_days = min(PASS_SEARCH_STEP[orbit] / orbits_per_day, 0.25)
+    if orbit == HEO:
+        step_days = min(step_days, PASS_MIN_DIP_S / DAY_S)
+    return step_days
+
+
+def find_events(satrec, observer, t0, t1, altitude_degrees, step_days):
+    """Rise (0), culmination (1) and set (2) times like EarthSatellite.find_events,
+    computed on our vectorized SGP4 path with the coarse step given by the caller
+
+    Elevations are sampled every step_days and maxima bisected on the sign
+    of the slope; rise/set are bisected between consecutive samples and
+    culminations, so passes shorter than the step are still found whole.
+    """
+    ts = t0.ts
+    position, rotation = observer_frame(observer.latitude.degrees, observer.longitude.degrees,
+                                        observer.elevation.m)
+
+    def elevation_at(jd):
+        r, v, errors = propagate_itrs([satrec], ts.tt_jd(jd))
+        return look_angles(r[0], position[None], rotation[None])[1][0]
+
+    # One extra sample past each end catches maxima before the first interior sample
+    count = max(int(np.ceil((t1.tt - t0.tt) / step_days)), 2)
+    step = (t1.tt - t0.tt) / count
+    grid = np.linspace(t0.tt - step, t1.tt + step, count + 3)
+    el = elevation_at(grid)
+
+    # Culminations: bisect the sign of the slope around each grid maximum
+    half_second = 0.5 / DAY_S
+    i = np.flatnonzero((el[1:-1] >= el[:-2]) & (el[1:-1] > el[2:])) + 1
+    lo, hi = grid[i - 1], grid[i + 1]
+    while len(i) and (hi - lo).max() > half_second:
+        mid = (lo + hi) / 2
+        slope = np.diff(elevation_at(np.concatenate((mid - half_second / 10, mid + half_second / 10)))
+                        .reshape(2, -1), axis=0)[0]
+        lo = np.where(slope > 0, mid, lo)
+        hi = np.where(slope > 0, hi, mid)
+    jdmax = (lo + hi) / 2
+    jdmax = jdmax[(jdmax >= t0.tt) & (jdmax <= t1.tt)]
+    jdmax = jdmax[elevation_at(jdmax) >= altitude_degrees] if len(jdmax) else jdmax
+
+    # Rise and set: bisect every change of side between samples and culminations
+    points = np.union1d(grid[1:-1], jdmax)
+    above = elevation_at(points) >= altitude_degrees
+    k = np.flatnonzero(above[1:] != above[:-1])
+    lo, hi, rising = points[k], points[k + 1], above[k + 1]
+    iterations = int(np.ceil(np.log2(max((hi - lo).max(initial=0) / half_second, 1))))
+    for _ in range(iterations):
+        mid = (lo + hi) / 2
+        after = (elevation_at(mid) >= altitude_degrees) != rising
+        lo = np.where(after, mid, lo)
+        hi = np.where(after, hi, mid)
+
+    times = np.concatenate((jdmax, (lo + hi) / 2))
+    events = np.concatenate((np.ones(len(jdmax), dtype=np.uint8),
+                             np.where(rising, 0, 2).astype(np.uint8)))
+    order = times.argsort()
+    return ts.tt_jd(times[order]), events[order]
+
 
 class PassPredictor:
-    def __init__(self, tracker):
+    def __init__(self, tracker, clock=None):
         self.tracker = tracker
         self.ts = tracker.ts
+        self.clock = clock
+        self.screened = {}  # Verdict of the last search of satellites screened out (NEVER/ALWAYS)
     
-    def find_passes(self, sat_name, duration_days=7, min_elevation=MIN_ELEVATION):
-        """Find all passes of a satellite above minimum elevation"""
+    def now(self):
+        """Start of default searches: this predictor's clock if set, else the tracker's time"""
+        if self.clock is not None:
+            return self.clock.now()
+        return self.tracker.now()
+    
+    def screen(self, sat_name, duration_days=7, min_elevation=MIN_ELEVATION, start_time=None):
+        """(orbit class, verdict) of a satellite for a pass search window
         
-        if sat_name not in self.tracker.satellites:
-            return []
+        The verdict is SEARCH, NEVER (cannot rise above min_elevation at the
+        observer's latitude, or geostationary and out of reach) or ALWAYS
+        (geostationary and above min_elevation the whole window). None for
+        unknown satellites.
+        """
+        t0 = start_time if start_time is not None else self.now()
+        satellite = self.tracker.satellite_for_time(sat_name, self.ts.tt_jd(t0.tt + duration_days / 2))
+        if satellite is None:
+            return None
+        return self._screen(satellite, t0, duration_days, min_elevation)
+    
+    def _screen(self, satellite, t0, duration_days, min_elevation):
+        satrec = satellite.model
+        orbit = orbit_class(satrec)
+        observer = self.tracker.observer
+        if not can_rise(satrec, observer.latitude.degrees, min_elevation):
+            return orbit, NEVER
+        if orbit != GEO:
+            return orbit, SEARCH
+        
+        # Geostationary: the elevation barely moves, sample it over the window directly
+        t = time_grid(self.ts, t0, duration_days * DAY_S, GEO_CHECK_STEP_S)
+        r, v, errors = propagate_itrs([satrec], t)
+        position, rotation = observer_frame(observer.latitude.degrees, observer.longitude.degrees,
+                                            observer.elevation.m)
+        az, el, distance = look_angles(r[0], position[None], rotation[None])
+        if el.min() > min_elevation + ORBIT_SCREEN_MARGIN_DEG:
+            return orbit, ALWAYS
+        if el.max() < min_elevation - ORBIT_SCREEN_MARGIN_DEG:
+            return orbit, NEVER
+        return orbit, SEARCH  # Drifting or inclined enough to cross min_elevation
+    
+    @instrumented('find_passes')
+    def find_passes(self, sat_name, duration_days=7, min_elevation=MIN_ELEVATION, start_time=None):
+        """Find all passes of a satellite above minimum elevation (from now, or from start_time)
+        
+        Satellites screened out (see screen()) have no passes: the ones that
+        never rise high enough, and geostationary ones that are always up.
+        Their verdict is kept in self.screened so callers can tell them apart.
+        """
         
-        satellite = self.tracker.satellites[sat_name]
         observer = self.tracker.observer
         
         # Time range
-        t0 = self.ts.now()
+        t0 = start_time if start_time is not None else self.now()
         t1 = self.ts.utc(t0.utc_datetime() + timedelta(days=duration_days))
         
-        # Find events (rise, culminate, set)
-        t, events = satellite.find_events(observer, t0, t1, altitude_degrees=min_elevation)
+        # Element set closest to the middle of the search window
+        satellite = self.tracker.satellite_for_time(sat_name, self.ts.tt_jd((t0.tt + t1.tt) / 2))
+        if satellite is None:
+            return []
+        
+        orbit, verdict = self._screen(satellite, t0, duration_days, min_elevation)
+        if verdict != SEARCH:
+            self.screened[sat_name] = verdict
+            return []
+        self.screened.pop(sat_name, None)
+        
+        # Find events (rise, culminate, set); Skyfield's own step suits LEO,
+        # the other classes get theirs from the orbit class
+        if orbit == LEO:
+            t, events = satellite.find_events(observer, t0, t1, altitude_degrees=min_elevation)
+        else:
+            t, events = find_events(satellite.model, observer, t0, t1, min_elevation,
+                                    search_step_days(satellite.model, orbit))
         
         passes = []
         current_pass = {}
@@ -47,8 +235,8 @@ class PassPredictor:
                 current_pass['set_time'] = ti
                 current_pass['set_az'] = self._get_azimuth(satellite, observer, ti)
                 
-                # Calculate duration
-                if 'rise_time' in current_pass:
+                # Calculate duration (erratic orbits can rise and set without a culmination)
+                if 'rise_time' in current_pass and 'max_time' in current_pass:
                     duration = (ti.utc_datetime() - current_pass['rise_time'].utc_datetime()).total_seconds()
                     current_pass['duration_seconds'] = duration
                     
@@ -68,6 +256,13 @@ class PassPredictor:
         
         return passes
     
+    def find_visible_passes(self, sat_names, duration_days=7, min_elevation=MIN_ELEVATION, start_time=None):
+        """Passes of several satellites {name: [pass, ...]}, each labelled with its
+        optical visibility (see visibility.label_passes)"""
+        passes = {name: self.find_passes(name, duration_days, min_elevation, start_time)
+                  for name in sat_names}
+        return label_passes(self.tracker, passes)
+    
     def _get_azimuth(self, satellite, observer, time):
         """Get azimuth at specific time"""
         difference = satellite - observer
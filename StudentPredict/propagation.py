@@ -0,0 +1,142 @@
+# propagation.py
+"""
+Vectorized SGP4 propagation for many satellites and times at once
+Geocentric states are computed once (TEME -> ITRS) and observer-relative
+quantities are then derived with plain NumPy rotations.
+"""
+
+import numpy as np
+from sgp4.api import SatrecArray
+from skyfield.sgp4lib import theta_GMST1982
+
+DAY_S = 86400.0
+
+# WGS84 ellipsoid
+EARTH_RADIUS_KM = 6378.137
+EARTH_FLATTENING = 1 / 298.257223563
+EARTH_E2 = EARTH_FLATTENING * (2 - EARTH_FLATTENING)
+
+
+def time_grid(ts, start, duration_s, step_s):
+    """Skyfield Time array from `start` over `duration_s` seconds every `step_s` seconds"""
+    offsets = np.arange(0.0, duration_s + step_s / 2, step_s) / DAY_S
+    return ts.tt_jd(start.whole, start.tt_fraction + offsets)
+
+
+def leap_seconds(t):
+    """TAI - UTC (s) at Skyfield times, from the timescale's leap second table
+
+    Same values as Skyfield's own conversion, including its ramp over the
+    inserted second: whole TAI seconds interpolated between the offsets.
+    """
+    ts = t.ts
+    seconds, fraction = divmod(t.whole * DAY_S, 1.0)
+    seconds += (fraction + t.tai_fraction * DAY_S) // 1.0
+    offsets = ts.leap_offsets[:, None] + [-1.0, 0.0]
+    leap_tai = ts.leap_dates[:, None] * DAY_S + [-1.0, 0.0] + offsets
+    return np.interp(seconds, leap_tai.ravel(), offsets.ravel())
+
+
+def sgp4_times(t):
+    """Split UTC Julian dates for SGP4, the same way Skyfield's EarthSatellite does"""
+    jd = np.atleast_1d(t.whole).astype(float)
+    fraction = np.atleast_1d(t.tai_fraction - leap_seconds(t) / DAY_S).astype(float)
+    return np.broadcast_to(jd, fraction.shape).copy(), fraction
+
+
+def propagate_teme(satrecs, t):
+    """TEME positions (km), velocities (km/s) and error codes for N satellites x T times
+
+    Returns arrays of shape (N, T, 3), (N, T, 3) and (N, T). Positions of
+    failed propagations (decayed, invalid elements...) are NaN.
+    """
+    jd, fraction = sgp4_times(t)
+    errors, r, v = SatrecArray(list(satrecs)).sgp4(jd, fraction)
+    failed = errors != 0
+    if failed.any():
+        r[failed] = np.nan
+        v[failed] = np.nan
+    return r, v, errors
+
+
+def teme_to_itrs(r, v, t):
+    """Rotate TEME states (..., T, 3) into the Earth-fixed frame (GMST 1982, no polar motion)"""
+    theta, theta_dot = theta_GMST1982(np.atleast_1d(t.whole), np.atleast_1d(t.ut1_fraction))
+    cos_t, sin_t = np.cos(theta), np.sin(theta)
+
+    x = cos_t * r[..., 0] + sin_t * r[..., 1]
+    y = -sin_t * r[..., 0] + cos_t * r[..., 1]
+    r_itrs = np.stack([x, y, r[..., 2]], axis=-1)
+
+    # Earth rotation adds -omega x r to the velocity
+    omega = theta_dot / DAY_S
+    vx = cos_t * v[..., 0] + sin_t * v[..., 1] + omega * y
+    vy = -sin_t * v[..., 0] + cos_t * v[..., 1] - omega * x
+    v_itrs = np.stack([vx, vy, v[..., 2]], axis=-1)
+    return r_itrs, v_itrs
+
+
+def propagate_itrs(satrecs, t):
+    """Earth-fixed positions and velocities (N, T, 3) plus SGP4 error codes (N, T)"""
+    r, v, errors = propagate_teme(satrecs, t)
+    r_itrs, v_itrs = teme_to_itrs(r, v, t)
+    return r_itrs, v_itrs, errors
+
+
+def geodetic(r_itrs):
+    """WGS84 latitude (deg), longitude (deg) and altitude (km) of Earth-fixed positions"""
+    x, y, z = r_itrs[..., 0], r_itrs[..., 1], r_itrs[..., 2]
+    lon = np.arctan2(y, x)
+    p = np.hypot(x, y)
+
+    lat = np.arctan2(z, p * (1 - EARTH_E2))
+    for _ in range(3):
+        sin_lat = np.sin(lat)
+        n = EARTH_RADIUS_KM / np.sqrt(1 - EARTH_E2 * sin_lat ** 2)
+        alt = p / np.cos(lat) - n
+        lat = np.arctan2(z, p * (1 - EARTH_E2 * n / (n + alt)))
+
+    sin_lat = np.sin(lat)
+    n = EARTH_RADIUS_KM / np.sqrt(1 - EARTH_E2 * sin_lat ** 2)
+    alt = p * np.cos(lat) + z * sin_lat - n * (1 - EARTH_E2 * sin_lat ** 2)
+    return np.degrees(lat), np.degrees(lon), alt
+
+
+def observer_frame(latitude, longitude, elevation_m):
+    """Earth-fixed position (km) and East-North-Up rotation matrix of an observer"""
+    lat, lon = np.radians(latitude), np.radians(longitude)
+    h = elevation_m / 1000.0
+    n = EARTH_RADIUS_KM / np.sqrt(1 - EARTH_E2 * np.sin(lat) ** 2)
+
+    position = np.array([
+        (n + h) * np.cos(lat) * np.cos(lon),
+        (n + h) * np.cos(lat) * np.sin(lon),
+        (n * (1 - EARTH_E2) + h) * np.sin(lat),
+    ])
+    rotation = np.array([
+        [-np.sin(lon), np.cos(lon), 0.0],
+        [-np.sin(lat) * np.cos(lon), -np.sin(lat) * np.sin(lon), np.cos(lat)],
+        [np.cos(lat) * np.cos(lon), np.cos(lat) * np.sin(lon), np.sin(lat)],
+    ])
+    return position, rotation
+
+
+def look_angles(r_itrs, positions, rotations):
+    """Azimuth (deg), elevation (deg) and range (km) from S observers
+
+    r_itrs has shape (..., 3); positions (S, 3) and rotations (S, 3, 3) are
+    stacked observer frames. Results have shape (S, ...).
+    """
+    shape = r_itrs.shape[:-1]
+    flat = r_itrs.reshape(-1, 3)
+    # One matrix multiply per observer: (S, 3, 3) x (S, 3, M)
+    relative = flat[None, :, :] - positions[:, None, :]
+    enu = np.einsum('sij,smj->smi', rotations, relative)
+
+    east, north, up = enu[..., 0], enu[..., 1], enu[..., 2]
+    distance = np.sqrt(east ** 2 + north ** 2 + up ** 2)
+    azimuth = np.degrees(np.arctan2(east, north)) % 360.0
+    elevation = np.degrees(np.arcsin(up / distance))
+
+    out_shape = (len(positions),) + shape
+    return azimuth.reshape(out_shape), elevation.reshape(out_shape), distance.reshape(out_shape)
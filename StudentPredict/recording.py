@@ -0,0 +1,375 @@
+# recording.py
+"""
+SDR recording of passes: one recorder process per pass, with Doppler updates
+Passes from find_passes are turned into recording windows for one receiver
+(padded, and cut where they overlap so that a recording starts the moment
+the previous one stops), each with the downlink frequency of satellite_db
+and a Doppler timeline. The scheduler launches RECORDER_COMMAND at the start
+of each window and stops it at the end; while it records, the current
+Doppler correction is sent every DOPPLER_STEP_S as a JSON datagram to a
+local UDP port (a GNU Radio flowgraph or any tuner script can listen there).
+
+Usage:
+    python recording.py "NOAA 19" "NOAA 18" --category weather --days 1
+    python recording.py "NOAA 19" --category weather --dry-run
+    python recording.py "ISS" --command "rtl_fm -f {frequency_hz} -M fm -s 48k {output}.raw"
+    python recording.py "NOAA 19" --category weather --feed  # Doppler from position_feed.py serve
+"""
+
+import argparse
+import json
+import os
+import re
+import shlex
+import socket
+import subprocess
+import sys
+import threading
+import time
+import numpy as np
+from config import (OBSERVER_LAT, OBSERVER_LON, OBSERVER_ELEVATION, MIN_ELEVATION, RECORDER_COMMAND,
+                    RECORDING_FOLDER, RECORDING_PADDING_S, RECORDER_STOP_TIMEOUT_S,
+                    DOPPLER_HOST, DOPPLER_PORT, DOPPLER_STEP_S, FEED_NAME)
+from propagation import DAY_S, propagate_itrs, observer_frame
+from satellite_db import get_satellite_info
+
+SPEED_OF_LIGHT_KM_S = 299792.458
+
+DOPPLER_DTYPE = [('jd', 'f8'), ('range_rate_km_s', 'f8'), ('doppler_hz', 'f8')]
+
+
+def downlink_hz(sat_name):
+    """First frequency listed in satellite_db for a satellite (Hz), or None"""
+    frequencies = get_satellite_info(sat_name).get('frequencies_mhz')
+    return frequencies[0] * 1e6 if frequencies else None
+
+
+def doppler_timeline(tracker, sat_name, start_jd, stop_jd, frequency_hz, step_s=DOPPLER_STEP_S,
+                     observer=(OBSERVER_LAT, OBSERVER_LON, OBSERVER_ELEVATION)):
+    """Doppler shift of a downlink seen from the observer, every step_s from start to stop (TT)
+
+    Structured array of jd, range_rate_km_s and doppler_hz (positive while
+    the satellite approaches).
+    """
+    jd = np.append(np.arange(start_jd, stop_jd, step_s / DAY_S), stop_jd)
+    t = tracker.ts.tt_jd(jd)
+    satellite = tracker.satellite_for_time(sat_name, t[len(jd) // 2])
+    r, v, errors = propagate_itrs([satellite.model], t)
+    position, rotation = observer_frame(*observer)
+    relative = r[0] - position
+    range_rate = np.einsum('...i,...i', relative, v[0]) / np.linalg.norm(relative, axis=-1)
+
+    timeline = np.zeros(len(jd), dtype=DOPPLER_DTYPE)
+    timeline['jd'] = jd
+    timeline['range_rate_km_s'] = range_rate
+    timeline['doppler_hz'] = -range_rate / SPEED_OF_LIGHT_KM_S * frequency_hz
+    return timeline
+
+
+def plan_recordings(tracker, passes_by_satellite, frequencies=None, padding_s=RECORDING_PADDING_S,
+                    step_s=DOPPLER_STEP_S):
+    """Recording windows for one receiver from a pass table {satellite: [pass, ...]}, in time order
+
+    Windows are the passes padded by padding_s on both sides. Where padding
+    overlaps, the cut is halfway between the previous LOS and the next AOS;
+    where passes themselves overlap, the later one starts when the earlier
+    one stops (late_start), and is skipped if nothing is left of it. So
+    consecutive recordings never leave a gap nor share the receiver.
+
+    Each plan: satellite, pass, frequency_hz, start / stop (TT Julian dates),
+    start_str / stop_str, late_start and doppler (see doppler_timeline).
+    frequencies {satellite: Hz} overrides satellite_db; satellites without
+    a known frequency are left out.
+    """
+    frequencies = frequencies or {}
+    pad = padding_s / DAY_S
+    candidates = []
+    for name, passes in passes_by_satellite.items():
+        frequency = frequencies.get(name) or downlink_hz(name)
+        if frequency is None:
+            print(f"✗ No downlink frequency for {name}, not recorded")
+            continue
+        candidates += [(p['rise_time'].tt, p['set_time'].tt, name, p, frequency) for p in passes]
+    candidates.sort(key=lambda c: c[0])
+
+    plans = []
+    for rise, set_, name, p, frequency in candidates:
+        start, stop = rise - pad, set_ + pad
+        late = False
+        if plans and start < plans[-1]['stop']:
+            previous = plans[-1]
+            previous_set = previous['pass']['set_time'].tt
+            if rise >= previous_set:
+                # Only the padding overlaps: hand over halfway between LOS and AOS
+                start = previous['stop'] = (previous_set + rise) / 2
+            else:
+                start, late = previous['stop'], True
+                if start >= set_:
+                    print(f"✗ {name} pass at {p['rise_time_str']} is inside the "
+                          f"{previous['satellite']} recording, skipped")
+                    continue
+        plans.append({'satellite': name, 'pass': p, 'frequency_hz': frequency,
+                      'start': start, 'stop': stop, 'late_start': late})
+
+    ts = tracker.ts
+    for plan in plans:
+        plan['start_str'] = ts.tt_jd(plan['start']).utc_iso()
+        plan['stop_str'] = ts.tt_jd(plan['stop']).utc_iso()
+        plan['doppler'] = doppler_timeline(tracker, plan['satellite'], plan['start'], plan['stop'],
+                                           plan['frequency_hz'], step_s)
+    return plans
+
+
+def output_path(plan, folder=RECORDING_FOLDER):
+    """Output file stem: folder/<UTC start>_<satellite>_<frequency>"""
+    stamp = re.sub(r'[^0-9T]', '', plan['start_str'])
+    satellite = re.sub(r'[^A-Za-z0-9]+', '-', plan['satellite']).strip('-')
+    return os.path.join(folder, f"{stamp}_{satellite}_{plan['frequency_hz'] / 1e6:.4f}MHz")
+
+
+def recorder_args(command, plan, output, port=DOPPLER_PORT):
+    """Argument list of the recorder command for a plan
+
+    Each argument of the command (split like a shell would) is formatted
+    with {frequency_hz}, {frequency_mhz}, {satellite}, {output}, {duration_s}
+    and {doppler_port}; no shell is involved, so satellite names are safe.
+    """
+    fields = {
+        'frequency_hz': int(round(plan['frequency_hz'])),
+        'frequency_mhz': f"{plan['frequency_hz'] / 1e6:.4f}",
+        'satellite': plan['satellite'],
+        'output': output,
+        'duration_s': int(np.ceil((plan['stop'] - plan['start']) * DAY_S)),
+        'doppler_port': port,
+    }
+    return [arg.format(**fields) for arg in shlex.split(command)]
+
+
+class RecordingScheduler:
+    """Runs recording plans one after another in a background thread
+
+    Each recorder starts at its window start (immediately when the previous
+    one stopped there) and is stopped at its window end with SIGTERM, then
+    SIGKILL after RECORDER_STOP_TIMEOUT_S. Its output goes to
+    <output>.log. Doppler datagrams go to (host, port) while it records:
+    {"satellite", "time", "frequency_hz", "doppler_hz", "tuned_hz", "range_rate_km_s"}.
+    With a position_feed.FeedReader as feed, the range rate comes from its
+    latest frame when that frame is current and publishes the satellite,
+    and from the plan's Doppler timeline otherwise.
+    """
+
+    def __init__(self, tracker, command=RECORDER_COMMAND, folder=RECORDING_FOLDER,
+                 host=DOPPLER_HOST, port=DOPPLER_PORT, step_s=DOPPLER_STEP_S, log=print, feed=None,
+                 observer=(OBSERVER_LAT, OBSERVER_LON, OBSERVER_ELEVATION)):
+        self.tracker = tracker
+        self.command = command
+        self.folder = folder
+        self.address = (host, port)
+        self.step_s = step_s
+        self.log = log
+        if feed is not None and not np.allclose(feed.observer, observer):
+            log(f"✗ Position feed computed for another observer {feed.observer}, not used")
+            feed = None
+        self.feed = feed
+        self.results = []  # One dict per finished recording
+        self._stop = threading.Event()
+        self._thread = None
+        self._socket = None
+
+    def start(self, plans):
+        """Record the plans (in time order) in a background thread"""
+        if self._thread is not None:
+            raise RuntimeError("Recording scheduler already running")
+        self._stop.clear()
+        self._thread = threading.Thread(target=self.run, args=(plans,), name='recording', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the current recording and the schedule"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def wait(self):
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _seconds_until(self, jd):
+        return (jd - self.tracker.now().tt) * DAY_S
+
+    def run(self, plans):
+        os.makedirs(self.folder, exist_ok=True)
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        try:
+            for plan in plans:
+                if self._seconds_until(plan['stop']) <= 0:
+                    continue  # Already over
+                if self._stop.wait(max(self._seconds_until(plan['start']), 0)):
+                    break
+                self.results.append(self._record(plan))
+                if self._stop.is_set():
+                    break
+        finally:
+            self._socket.close()
+
+    def _record(self, plan):
+        output = output_path(plan, self.folder)
+        args = recorder_args(self.command, plan, output, self.address[1])
+        result = {'satellite': plan['satellite'], 'output': output, 'start': time.time(),
+                  'returncode': None, 'error': None}
+        self.log(f"● Recording {plan['satellite']} on {plan['frequency_hz'] / 1e6:.4f} MHz "
+                 f"until {plan['stop_str']}")
+        try:
+            with open(output + '.log', 'wb') as log_file:
+                process = subprocess.Popen(args, stdout=log_file, stderr=subprocess.STDOUT,
+                                           stdin=subprocess.DEVNULL)
+                try:
+                    self._follow(process, plan)
+                finally:
+                    result['returncode'] = self._terminate(process)
+        except OSError as e:
+            result['error'] = str(e)
+            self.log(f"✗ Could not start the recorder for {plan['satellite']}: {e}")
+            # Keep the schedule: the next pass is attempted at its own start
+            self._stop.wait(max(self._seconds_until(plan['stop']), 0))
+        result['stop'] = time.time()
+        if result['error'] is None:
+            self.log(f"✓ Recorded {plan['satellite']} ({result['stop'] - result['start']:.0f} s) -> {output}")
+        return result
+
+    def _follow(self, process, plan):
+        """Send Doppler updates until the end of the window, a stop request or the recorder exits"""
+        doppler = plan['doppler']
+        while True:
+            remaining = self._seconds_until(plan['stop'])
+            if remaining <= 0 or process.poll() is not None:
+                break
+            self._send_doppler(plan, self.tracker.now(), doppler)
+            if self._stop.wait(min(self.step_s, remaining)):
+                break
+        if process.poll() is not None and self._seconds_until(plan['stop']) > 0:
+            self.log(f"✗ Recorder for {plan['satellite']} exited early (code {process.returncode})")
+
+    def _feed_range_rate(self, sat_name, t):
+        """Range rate of the feed's latest frame (km/s), or None when it does not
+        publish the satellite or its frame is more than two intervals from t"""
+        feed = self.feed
+        if feed is None or sat_name not in feed.index:
+            return None
+        try:
+            latest = feed.read(np.array([feed.index[sat_name]], dtype=np.intp))
+        except RuntimeError as e:
+            self.log(f"✗ {e}; Doppler from the pass timelines from now on")
+            self.feed = None
+            return None
+        if latest is None:
+            return None
+        frame, jd, records = latest
+        if abs(jd - t.tt) * DAY_S > 2 * feed.interval_s:
+            return None  # Stale feed or another clock
+        return float(records['range_rate_km_s'][0])
+
+    def _send_doppler(self, plan, t, doppler):
+        range_rate = self._feed_range_rate(plan['satellite'], t)
+        if range_rate is None:
+            range_rate = float(np.interp(t.tt, doppler['jd'], doppler['range_rate_km_s']))
+        shift = -range_rate / SPEED_OF_LIGHT_KM_S * plan['frequency_hz']
+        message = {
+            'satellite': plan['satellite'],
+            'time': t.utc_iso(),
+            'frequency_hz': plan['frequency_hz'],
+            'doppler_hz': round(shift, 1),
+            'tuned_hz': round(plan['frequency_hz'] + shift, 1),
+            'range_rate_km_s': round(range_rate, 4),
+        }
+        try:
+            self._socket.sendto(json.dumps(message).encode(), self.address)
+        except OSError:
+            pass  # Nobody listening: Doppler updates are best effort
+
+    def _terminate(self, process):
+        if process.poll() is None:
+            process.terminate()
+            try:
+                process.wait(RECORDER_STOP_TIMEOUT_S)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.wait()
+        return process.returncode
+
+
+def main():
+    from tle_manager import TLEManager
+    from tracker import SatelliteTracker
+    from predictor import PassPredictor
+
+    parser = argparse.ArgumentParser(description='Record the next passes with an SDR recorder command')
+    parser.add_argument('satellites', nargs='+', help='Satellite names')
+    parser.add_argument('--category', default='weather', help='TLE category (default: weather)')
+    parser.add_argument('--days', type=float, default=1, help='Scheduling window in days (default: 1)')
+    parser.add_argument('--min-elevation', type=float, default=MIN_ELEVATION,
+                        help=f'Minimum pass elevation in degrees (default: {MIN_ELEVATION})')
+    parser.add_argument('--frequency', type=float, help='Downlink in MHz for every satellite (default: satellite_db)')
+    parser.add_argument('--command', default=RECORDER_COMMAND, help=f'Recorder command (default: {RECORDER_COMMAND})')
+    parser.add_argument('--port', type=int, default=DOPPLER_PORT, help=f'Doppler UDP port (default: {DOPPLER_PORT})')
+    parser.add_argument('--feed', nargs='?', const=FEED_NAME, metavar='NAME',
+                        help=f'Doppler from a running position feed (default name: {FEED_NAME})')
+    parser.add_argument('--dry-run', action='store_true', help='Print the schedule without recording')
+    args = parser.parse_args()
+
+    tle_mgr = TLEManager()
+    catalog = tle_mgr.load_catalog(args.category)
+    if catalog is None:
+        tle_mgr.get_tles(args.category)
+        catalog = tle_mgr.load_catalog(args.category)
+    if catalog is None:
+        print(f"✗ No TLEs for category '{args.category}'")
+        sys.exit(1)
+
+    tracker = SatelliteTracker()
+    tracker.load_catalog(catalog)
+    tracker.use_history(tle_mgr.history)
+    predictor = PassPredictor(tracker)
+    passes = {}
+    for name in args.satellites:
+        index = catalog.find(name)
+        if index is None:
+            print(f"✗ Satellite not found: {name}")
+            continue
+        name = catalog.names[index]
+        passes[name] = predictor.find_passes(name, args.days, args.min_elevation)
+
+    frequencies = {name: args.frequency * 1e6 for name in passes} if args.frequency else None
+    plans = plan_recordings(tracker, passes, frequencies)
+    for plan in plans:
+        doppler = plan['doppler']['doppler_hz']
+        flags = ' LATE' if plan['late_start'] else ''
+        print(f"{plan['start_str']} -> {plan['stop_str']}  {plan['satellite']:<24} "
+              f"{plan['frequency_hz'] / 1e6:9.4f} MHz  max el {plan['pass']['max_elevation']:5.1f}°  "
+              f"Doppler {doppler.max():+7.0f} .. {doppler.min():+7.0f} Hz{flags}")
+    if args.dry_run or not plans:
+        return
+
+    feed = None
+    if args.feed:
+        from position_feed import FeedReader
+        try:
+            feed = FeedReader(args.feed)
+        except (FileNotFoundError, ValueError) as e:
+            print(f"✗ {e}; Doppler from the pass timelines")
+
+    scheduler = RecordingScheduler(tracker, args.command, port=args.port, feed=feed)
+    scheduler.start(plans)
+    try:
+        scheduler.wait()
+    except KeyboardInterrupt:
+        scheduler.stop()
+    finally:
+        if feed is not None:
+            feed.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,365 @@
+# rotator.py
+"""
+Rotator command planning (Yaesu GS-5500 style az/el rotator)
+Turns the az/el samples of passes into command schedules that respect the
+rotator's azimuth range (0-450° with overlap), elevation range (0-180° allows
+flip mode for overhead passes) and slew rates. All passes of a schedule are
+planned together as (passes x samples) arrays, and every plan is run through
+a kinematic simulator of the rotator.
+
+Usage:
+    python rotator.py "ISS (ZARYA)" --category stations --days 1
+"""
+
+import argparse
+import sys
+import numpy as np
+from config import OBSERVER_LAT, OBSERVER_LON, OBSERVER_ELEVATION, ROTATOR, ROTATOR_STEP_S
+from propagation import DAY_S, propagate_itrs, observer_frame, look_angles
+from visibility import pass_grid
+
+NORMAL = 'normal'
+FLIP = 'flip'
+
+
+class RotatorLimits:
+    """Mechanical limits of an az/el rotator (degrees, degrees per second)"""
+
+    def __init__(self, az_min=0, az_max=450, el_min=0, el_max=180, az_rate=6.0, el_rate=2.7,
+                 flip_elevation=75, park=(0, 0)):
+        self.az_min = az_min
+        self.az_max = az_max
+        self.el_min = el_min
+        self.el_max = el_max
+        self.az_rate = az_rate
+        self.el_rate = el_rate
+        self.flip_elevation = flip_elevation  # Only consider flip mode above this maximum elevation
+        self.park = park
+
+    @property
+    def can_flip(self):
+        return self.el_max >= 180
+
+
+def sample_passes(tracker, passes_by_satellite, step_s=ROTATOR_STEP_S,
+                  observer=(OBSERVER_LAT, OBSERVER_LON, OBSERVER_ELEVATION)):
+    """Az/el samples of every pass: (names, passes, [(jd, az, el), ...])
+
+    Each satellite is propagated once over all of its passes.
+    """
+    grid, samples = pass_grid(passes_by_satellite, step_s)
+    position, rotation = observer_frame(*observer)
+    rows = {}
+    for row, (name, p, index) in enumerate(samples):
+        rows.setdefault(name, []).append((row, index))
+
+    ts = tracker.ts
+    tracks = [None] * len(samples)
+    for name, entries in rows.items():
+        index = np.unique(np.concatenate([i for _, i in entries]))
+        satellite = tracker.satellite_for_time(name, ts.tt_jd(grid[index[len(index) // 2]]))
+        if satellite is None:
+            continue
+        r, v, errors = propagate_itrs([satellite.model], ts.tt_jd(grid[index]))
+        sat_az, sat_el, distance = look_angles(r[0], position[None], rotation[None])
+        for row, i in entries:
+            k = np.searchsorted(index, i)
+            tracks[row] = (grid[i], sat_az[0, k], sat_el[0, k])
+
+    kept = [row for row, track in enumerate(tracks) if track is not None]
+    return ([samples[row][0] for row in kept], [samples[row][1] for row in kept],
+            [tracks[row] for row in kept])
+
+
+def pad(arrays):
+    """Stack 1-D arrays of different lengths, repeating their last value; also returns the valid mask"""
+    width = max(len(a) for a in arrays)
+    out = np.empty((len(arrays), width))
+    valid = np.zeros((len(arrays), width), dtype=bool)
+    for i, a in enumerate(arrays):
+        out[i, :len(a)], out[i, len(a):] = a, a[-1]
+        valid[i, :len(a)] = True
+    return out, valid
+
+
+def fit_azimuth(az, limits):
+    """Unwrap azimuths (passes, samples) and shift each pass by whole turns into the range
+
+    Returns the shifted azimuths and, per pass, whether the whole pass fits.
+    Passes that cannot fit are wrapped into [az_min, az_min + 360), which
+    means an unwinding move during the pass.
+    """
+    unwrapped = np.degrees(np.unwrap(np.radians(az), axis=1))
+    lo, hi = unwrapped.min(axis=1), unwrapped.max(axis=1)
+
+    fits = np.zeros(len(az), dtype=bool)
+    shift = np.zeros(len(az))
+    # Lowest whole-turn shift that fits, trying start azimuths in [az_min, az_min + 360) first
+    for turns in (0, 1, -1, 2, -2):
+        candidate = turns * 360.0 - np.floor((unwrapped[:, 0] - limits.az_min) / 360.0) * 360.0
+        ok = ~fits & (lo + candidate >= limits.az_min) & (hi + candidate <= limits.az_max)
+        shift[ok] = candidate[ok]
+        fits |= ok
+
+    fitted = unwrapped + shift[:, None]
+    wrapped = limits.az_min + (az - limits.az_min) % 360.0
+    return np.where(fits[:, None], fitted, wrapped), fits
+
+
+def simulate(az_cmd, el_cmd, step_s, limits):
+    """Kinematic rotator model: each axis moves towards its command at most at its slew rate
+
+    Commands have shape (passes, samples); returns the rotator positions at
+    the same instants, starting on the first command. The rotator follows
+    its commands exactly until the first one that is too far for one step,
+    so only passes with such a jump are stepped through, from that jump on.
+    """
+    az_step, el_step = limits.az_rate * step_s, limits.el_rate * step_s
+    az, el = az_cmd.copy(), el_cmd.copy()
+    too_far = ((np.abs(np.diff(az_cmd, axis=1)) > az_step)
+               | (np.abs(np.diff(el_cmd, axis=1)) > el_step))
+    rows = np.flatnonzero(too_far.any(axis=1))
+    if not len(rows):
+        return az, el
+
+    start = int(too_far[rows].argmax(axis=1).min())
+    pos_az, pos_el = az_cmd[rows, start], el_cmd[rows, start]
+    for k in range(start + 1, az_cmd.shape[1]):
+        pos_az = pos_az + np.minimum(np.maximum(az_cmd[rows, k] - pos_az, -az_step), az_step)
+        pos_el = pos_el + np.minimum(np.maximum(el_cmd[rows, k] - pos_el, -el_step), el_step)
+        az[rows, k], el[rows, k] = pos_az, pos_el
+    return az, el
+
+
+def pointing_error(az, el, target_az, target_el):
+    """Angle (deg) between mechanical pointing (el may exceed 90 in flip mode) and the target"""
+    el, target_el = np.radians(el), np.radians(target_el)
+    cos = (np.sin(el) * np.sin(target_el)
+           + np.cos(el) * np.cos(target_el) * np.cos(np.radians(az - target_az)))
+    return np.degrees(np.arccos(np.clip(cos, -1.0, 1.0)))
+
+
+def plan_commands(az, el, valid, step_s, limits):
+    """Rate-limited commands for padded pass samples, choosing normal or flip mode per pass
+
+    Returns (az_cmd, el_cmd, flipped, fits, max_error).
+    """
+    el_clip = np.clip(el, limits.el_min, 90.0)
+    candidates = [fit_azimuth(az, limits) + (el_clip,)]
+    if limits.can_flip:
+        # Whole pass seen over the top: same azimuth swing, but half a turn away in the az range
+        candidates.append(fit_azimuth(az + 180.0, limits) + (180.0 - el_clip,))
+        # Rise side normal, set side over the top: an overhead pass needs no half turn at culmination
+        far = np.abs((az - az[:, :1] + 180.0) % 360.0 - 180.0) > 90.0
+        candidates.append(fit_azimuth(np.where(far, az + 180.0, az), limits)
+                          + (np.where(far, 180.0 - el_clip, el_clip),))
+
+    results = []
+    for cmd_az, fits, cmd_el in candidates:
+        sim_az, sim_el = simulate(cmd_az, cmd_el, step_s, limits)
+        error = np.where(valid, pointing_error(sim_az, sim_el, az, el_clip), 0.0).max(axis=1)
+        results.append((sim_az, sim_el, fits, error))
+
+    sim_az, sim_el, fits, error = results[0]
+    flipped = np.zeros(len(az), dtype=bool)
+    high = el.max(axis=1) >= limits.flip_elevation
+    for flip_az, flip_el, flip_fits, flip_error in results[1:]:
+        # Flip when it tracks clearly better (overhead passes, or passes not fitting the az range)
+        better = (high & (flip_error + 0.5 < error)) | (~fits & flip_fits)
+        flipped |= better
+        sim_az = np.where(better[:, None], flip_az, sim_az)
+        sim_el = np.where(better[:, None], flip_el, sim_el)
+        fits = np.where(better, flip_fits, fits)
+        error = np.where(better, flip_error, error)
+    return sim_az, sim_el, flipped, fits, error
+
+
+def length_buckets(lengths):
+    """Groups of rows with lengths within a factor of two, so that one long
+    pass does not pad every other pass to its length"""
+    buckets = np.ceil(np.log2(np.maximum(lengths, 1))).astype(int)
+    for bucket in np.unique(buckets):
+        yield np.flatnonzero(buckets == bucket)
+
+
+def plan_schedule(tracker, passes_by_satellite, limits=None, step_s=ROTATOR_STEP_S,
+                  observer=(OBSERVER_LAT, OBSERVER_LON, OBSERVER_ELEVATION)):
+    """Rotator plans for a pass table {satellite: [pass, ...]}, in rise time order
+
+    Each plan: satellite, pass, mode ('normal'/'flip'), preposition_time
+    (when to start moving from the previous pass or the park position),
+    late_start (not enough time to get there), az_range_ok, max_error_deg
+    and commands (structured array of jd (TT), az, el; one per step).
+    """
+    limits = limits or RotatorLimits(**ROTATOR)
+    names, passes, tracks = sample_passes(tracker, passes_by_satellite, step_s, observer)
+    if not passes:
+        return []
+    order = sorted(range(len(passes)), key=lambda i: tracks[i][0][0])
+    names = [names[i] for i in order]
+    passes = [passes[i] for i in order]
+    tracks = [tracks[i] for i in order]
+
+    count = len(passes)
+    lengths = np.array([len(jd) for jd, _, _ in tracks])
+    commands = [None] * count
+    flipped = np.zeros(count, dtype=bool)
+    fits = np.zeros(count, dtype=bool)
+    error = np.zeros(count)
+    for rows in length_buckets(lengths):
+        az, valid = pad([tracks[i][1] for i in rows])
+        el, _ = pad([tracks[i][2] for i in rows])
+        cmd_az, cmd_el, flipped[rows], fits[rows], error[rows] = plan_commands(
+            az, el, valid, step_s, limits)
+        for k, i in enumerate(rows):
+            n = lengths[i]
+            commands[i] = np.zeros(n, dtype=[('jd', 'f8'), ('az', 'f8'), ('el', 'f8')])
+            commands[i]['jd'], commands[i]['az'], commands[i]['el'] = tracks[i][0], cmd_az[k, :n], cmd_el[k, :n]
+
+    # Moving from the end of the previous pass (or the park position) to the first command
+    first = np.array([(c['jd'][0], c['az'][0], c['el'][0]) for c in commands])
+    last = np.array([(c['jd'][-1], c['az'][-1], c['el'][-1]) for c in commands])
+    from_az = np.concatenate([[limits.park[0]], last[:-1, 1]])
+    from_el = np.concatenate([[limits.park[1]], last[:-1, 2]])
+    lead_s = np.maximum(np.abs(first[:, 1] - from_az) / limits.az_rate,
+                        np.abs(first[:, 2] - from_el) / limits.el_rate)
+    preposition = first[:, 0] - lead_s / DAY_S
+    late = preposition < np.concatenate([[-np.inf], last[:-1, 0]])
+
+    ts = tracker.ts
+    plans = []
+    for i, (name, p) in enumerate(zip(names, passes)):
+        start = ts.tt_jd(preposition[i])
+        plans.append({
+            'satellite': name,
+            'pass': p,
+            'mode': FLIP if flipped[i] else NORMAL,
+            'preposition_time': start,
+            'preposition_time_str': start.utc_iso(),
+            'late_start': bool(late[i]),
+            'az_range_ok': bool(fits[i]),
+            'max_error_deg': float(error[i]),
+            'commands': commands[i],
+        })
+    return plans
+
+
+def check_schedule(plans, limits=None, step_s=ROTATOR_STEP_S, tolerance=1e-6):
+    """Replay the command schedules in the kinematic simulator
+
+    Returns the worst values over all plans: command rates (deg/s), range
+    violations (deg) and how far the simulated rotator ends up from its
+    commands (deg; 0 when every command is reachable), plus 'ok'.
+    """
+    limits = limits or RotatorLimits(**ROTATOR)
+    worst = {'az_rate': 0.0, 'el_rate': 0.0, 'range_violation': 0.0, 'following_error': 0.0}
+    lengths = np.array([len(plan['commands']) for plan in plans])
+    for rows in length_buckets(lengths):
+        az, _ = pad([plans[i]['commands']['az'] for i in rows])
+        el, _ = pad([plans[i]['commands']['el'] for i in rows])
+        sim_az, sim_el = simulate(az, el, step_s, limits)
+        worst['az_rate'] = max(worst['az_rate'], np.abs(np.diff(az, axis=1)).max(initial=0) / step_s)
+        worst['el_rate'] = max(worst['el_rate'], np.abs(np.diff(el, axis=1)).max(initial=0) / step_s)
+        worst['range_violation'] = max(worst['range_violation'],
+                                       np.max(limits.az_min - az), np.max(az - limits.az_max),
+                                       np.max(limits.el_min - el), np.max(el - limits.el_max))
+        worst['following_error'] = max(worst['following_error'],
+                                       np.abs(sim_az - az).max(), np.abs(sim_el - el).max())
+
+    worst = {key: float(value) for key, value in worst.items()}
+    worst['ok'] = (worst['az_rate'] <= limits.az_rate + tolerance
+                   and worst['el_rate'] <= limits.el_rate + tolerance
+                   and worst['range_violation'] <= tolerance
+                   and worst['following_error'] <= tolerance)
+    return worst
+
+
+class RotatorFollower:
+    """Event core consumer driving a rotator: each pass is planned at AOS, its
+    commands are sent every step while the satellite is up, and the rotator
+    parks at LOS. send(az, el) talks to the actual rotator."""
+
+    def __init__(self, tracker, send, limits=None, step_s=ROTATOR_STEP_S, satellites=None):
+        self.tracker = tracker
+        self.send = send
+        self.limits = limits or RotatorLimits(**ROTATOR)
+        self.step_s = step_s
+        self.satellites = set(satellites) if satellites is not None else None
+        self.plan = None
+
+    def attach(self, core):
+        from event_core import AOS, LOS, POSITION
+        core.subscribe(AOS, self.on_aos)
+        core.subscribe(LOS, self.on_los)
+        # No idle updates: the follower sleeps between passes
+        core.subscribe(POSITION, self.on_position, interval_s=self.step_s)
+
+    def on_aos(self, event):
+        if self.plan is not None:
+            return  # Already following a pass
+        if self.satellites is not None and event['satellite'] not in self.satellites:
+            return
+        plans = plan_schedule(self.tracker, {event['satellite']: [event['pass']]}, self.limits, self.step_s)
+        self.plan = plans[0] if plans else None
+
+    def on_position(self, update):
+        if self.plan is None:
+            return
+        commands = self.plan['commands']
+        jd = update['time'].tt
+        self.send(float(np.interp(jd, commands['jd'], commands['az'])),
+                  float(np.interp(jd, commands['jd'], commands['el'])))
+
+    def on_los(self, event):
+        if self.plan is not None and event['satellite'] == self.plan['satellite']:
+            self.plan = None
+            self.send(*self.limits.park)
+
+
+def main():
+    from tle_manager import TLEManager
+    from tracker import SatelliteTracker
+    from predictor import PassPredictor
+
+    parser = argparse.ArgumentParser(description='Plan rotator commands for the next passes')
+    parser.add_argument('satellites', nargs='+', help='Satellite names')
+    parser.add_argument('--category', default='stations', help='TLE category (default: stations)')
+    parser.add_argument('--days', type=float, default=1, help='Planning window in days (default: 1)')
+    args = parser.parse_args()
+
+    tle_mgr = TLEManager()
+    catalog = tle_mgr.load_catalog(args.category)
+    if catalog is None:
+        tle_mgr.get_tles(args.category)
+        catalog = tle_mgr.load_catalog(args.category)
+    if catalog is None:
+        print(f"✗ No TLEs for category '{args.category}'")
+        sys.exit(1)
+
+    tracker = SatelliteTracker()
+    tracker.load_catalog(catalog)
+    predictor = PassPredictor(tracker)
+    passes = {}
+    for name in args.satellites:
+        index = catalog.find(name)
+        if index is None:
+            print(f"✗ Satellite not found: {name}")
+            continue
+        name = catalog.names[index]
+        passes[name] = predictor.find_passes(name, args.days)
+
+    plans = plan_schedule(tracker, passes)
+    for plan in plans:
+        flags = ' LATE' if plan['late_start'] else ''
+        flags += '' if plan['az_range_ok'] else ' UNWIND'
+        print(f"{plan['pass']['rise_time_str']}  {plan['satellite']:<24} "
+              f"max el {plan['pass']['max_elevation']:5.1f}°  {plan['mode']:<6} "
+              f"error {plan['max_error_deg']:5.2f}°  {len(plan['commands'])} commands{flags}")
+
+    check = check_schedule(plans)
+    print(f"\n{'✓' if check['ok'] else '✗'} Simulator check: az rate {check['az_rate']:.2f}°/s, "
+          f"el rate {check['el_rate']:.2f}°/s, range violation {check['range_violation']:.3f}°")
+
+
+if __name__ == "__main__":
+    main()
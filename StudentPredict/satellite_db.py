@@ -186,6 +186,12 @@ def get_satellite_info(sat_name):
     }
 
 
+def downlink_frequencies():
+    """{NORAD ID: first listed frequency in MHz} for the satellites with known frequencies"""
+    return {info['norad_id']: info['frequencies_mhz'][0] for info in SATELLITE_DATABASE.values()
+            if info.get('frequencies_mhz') and 'norad_id' in info}
+
+
 def list_cubesats():
     """List all CubeSats in database"""
     return [name for name, info in SATELLITE_DATABASE.items() 
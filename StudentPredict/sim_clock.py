@@ -0,0 +1,251 @@
+# sim_clock.py
+"""
+Simulation clock (time travel, accelerated time) and precomputed frames
+The tracker, predictor and GUI read the current time from the clock, so they
+all follow it. The GUI map draws precomputed keyframes: every satellite is
+propagated over a whole batch of frames in one vectorized call, and the
+positions in between are interpolated for each displayed frame.
+"""
+
+import time
+import numpy as np
+from config import (OBSERVER_LAT, OBSERVER_LON, OBSERVER_ELEVATION,
+                    SIM_BATCH_FRAMES, SIM_CACHE_FRAMES)
+from propagation import DAY_S, propagate_itrs, geodetic, observer_frame, look_angles
+
+
+class SimulationClock:
+    """Real time by default; can jump to any instant and run at a speed factor
+    (negative = backwards)"""
+
+    def __init__(self, ts):
+        self.ts = ts
+        self.speed = 1.0
+        self.paused = False
+        self.live = True
+        self._anchor_real = time.monotonic()
+        self._anchor = None  # (whole, fraction) TT Julian date at _anchor_real
+
+    def _elapsed_days(self):
+        if self.paused:
+            return 0.0
+        return (time.monotonic() - self._anchor_real) * self.speed / DAY_S
+
+    def now(self):
+        """Current simulated time"""
+        if self.live:
+            return self.ts.now()
+        whole, fraction = self._anchor
+        return self.ts.tt_jd(whole, fraction + self._elapsed_days())
+
+    def _reanchor(self, t):
+        self._anchor = (t.whole, t.tt_fraction)
+        self._anchor_real = time.monotonic()
+        self.live = False
+
+    def set_time(self, t):
+        """Jump to a Skyfield Time"""
+        self._reanchor(t)
+
+    def shift(self, seconds):
+        """Move the simulated time forwards (or backwards) by some seconds"""
+        t = self.now()
+        self._reanchor(self.ts.tt_jd(t.whole, t.tt_fraction + seconds / DAY_S))
+
+    def set_speed(self, speed):
+        if speed == self.speed:
+            return
+        self._reanchor(self.now())
+        self.speed = float(speed)
+
+    def pause(self):
+        if not self.paused:
+            self._reanchor(self.now())
+            self.paused = True
+
+    def resume(self):
+        if self.paused:
+            self._reanchor(self.now())
+            self.paused = False
+
+    def go_live(self):
+        """Back to real time at normal speed"""
+        self.live = True
+        self.paused = False
+        self.speed = 1.0
+
+
+class FixedClock:
+    """Clock stopped at a given instant, for reproducible runs (benchmarks,
+    offline checks); advance() moves it explicitly"""
+
+    def __init__(self, t):
+        self.t = t
+
+    def now(self):
+        return self.t
+
+    def advance(self, seconds):
+        self.t = self.t.ts.tt_jd(self.t.whole, self.t.tt_fraction + seconds / DAY_S)
+
+
+class FrameBatch:
+    """Positions of N satellites on a regular grid of frames"""
+
+    def __init__(self, names, start_jd, step_s, lat, lon, alt, az, el, distance, velocity):
+        self.names = names
+        self.start = start_jd  # TT Julian date of the first frame
+        self.step = step_s / DAY_S
+        self.step_s = step_s
+        self.count = lat.shape[1]
+        self.lat, self.lon, self.alt = lat, lon, alt
+        self.az, self.el, self.distance = az, el, distance
+        self.velocity = velocity
+
+    @property
+    def end(self):
+        return self.start + (self.count - 1) * self.step
+
+    def covers(self, jd):
+        return self.start <= jd <= self.end
+
+    def positions(self, jd, time_str):
+        """Dict like SatelliteTracker.get_all_positions() for the frame nearest to jd"""
+        i = min(max(int(round((jd - self.start) / self.step)), 0), self.count - 1)
+        return self._as_dict(time_str, self.lat[:, i], self.lon[:, i], self.alt[:, i], self.az[:, i],
+                             self.el[:, i], self.distance[:, i], self.velocity[:, i])
+
+    def interpolated(self, jd, time_str):
+        """Same as positions(), interpolated between the two frames around jd
+
+        Ground positions move along the great circle joining the two frames
+        (spherical interpolation of unit vectors, so crossing the antimeridian
+        or passing near a pole is handled), the azimuth the short way round,
+        and everything else linearly.
+        """
+        if self.count < 2:
+            return self.positions(jd, time_str)
+        x = min(max((jd - self.start) / self.step, 0.0), self.count - 1)
+        i = min(int(x), self.count - 2)
+        f = x - i
+        lat0, lon0 = np.radians(self.lat[:, i]), np.radians(self.lon[:, i])
+        lat1, lon1 = np.radians(self.lat[:, i + 1]), np.radians(self.lon[:, i + 1])
+        u0 = np.stack([np.cos(lat0) * np.cos(lon0), np.cos(lat0) * np.sin(lon0), np.sin(lat0)])
+        u1 = np.stack([np.cos(lat1) * np.cos(lon1), np.cos(lat1) * np.sin(lon1), np.sin(lat1)])
+        omega = np.arccos(np.clip(np.einsum('i...,i...', u0, u1), -1.0, 1.0))
+        sin_omega = np.sin(omega)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            small = sin_omega < 1e-9
+            w0 = np.where(small, 1 - f, np.sin((1 - f) * omega) / sin_omega)
+            w1 = np.where(small, f, np.sin(f * omega) / sin_omega)
+        u = w0 * u0 + w1 * u1
+        lat = np.degrees(np.arctan2(u[2], np.hypot(u[0], u[1])))
+        lon = np.degrees(np.arctan2(u[1], u[0]))
+
+        az0, az1 = self.az[:, i], self.az[:, i + 1]
+        az = (az0 + ((az1 - az0 + 180) % 360 - 180) * f) % 360
+
+        def linear(values):
+            return values[:, i] + (values[:, i + 1] - values[:, i]) * f
+
+        return self._as_dict(time_str, lat, lon, linear(self.alt), az, linear(self.el),
+                             linear(self.distance), linear(self.velocity))
+
+    def _as_dict(self, time_str, lat, lon, alt, az, el, distance, velocity):
+        return {
+            name: {
+                'time': time_str,
+                'latitude': float(lat[n]),
+                'longitude': float(lon[n]),
+                'altitude_km': float(alt[n]),
+                'azimuth': float(az[n]),
+                'elevation': float(el[n]),
+                'distance_km': float(distance[n]),
+                'is_visible': bool(el[n] > 0),
+                'velocity_km_s': velocity[n],
+            }
+            for n, name in enumerate(self.names)
+            if not np.isnan(lat[n])
+        }
+
+
+def compute_frames(ts, names, satrecs, start_jd, step_s, count,
+                   observer=(OBSERVER_LAT, OBSERVER_LON, OBSERVER_ELEVATION)):
+    """Propagate all satellites over `count` frames in one vectorized call
+
+    Only uses its arguments (no tracker state), so it can run in a worker thread.
+    """
+    whole = np.floor(start_jd)
+    t = ts.tt_jd(whole, start_jd - whole + np.arange(count) * step_s / DAY_S)
+    r, v, errors = propagate_itrs(satrecs, t)
+    lat, lon, alt = geodetic(r)
+    position, rotation = observer_frame(*observer)
+    az, el, distance = look_angles(r, position[None], rotation[None])
+    return FrameBatch(list(names), start_jd, step_s, lat, lon, alt, az[0], el[0], distance[0], v)
+
+
+class FrameCache:
+    """Precomputed frame batches around the simulated time
+
+    Batches are only valid for one list of satellites and one frame step;
+    configure() drops them when either changes.
+    """
+
+    def __init__(self, batch_frames=SIM_BATCH_FRAMES, max_frames=SIM_CACHE_FRAMES):
+        self.batch_frames = batch_frames
+        self.max_frames = max_frames
+        self.names = ()
+        self.step_s = None
+        self.batches = []
+
+    def configure(self, names, step_s):
+        names = tuple(names)
+        if names != self.names or step_s != self.step_s:
+            self.names = names
+            self.step_s = step_s
+            self.batches = []
+
+    def clear(self):
+        """Drop every batch (e.g. after new TLEs were loaded)"""
+        self.batches = []
+
+    def _covering(self, jd):
+        for batch in self.batches:
+            if batch.covers(jd):
+                return batch
+        return None
+
+    def lookup(self, jd, time_str):
+        """Positions at jd (interpolated between frames), or None if no batch covers it"""
+        batch = self._covering(jd)
+        return batch.interpolated(jd, time_str) if batch is not None else None
+
+    def next_request(self, jd, direction=1):
+        """(start_jd, count) of the batch to compute next, or None if the
+        look-ahead window (half a batch in the direction of time) is covered"""
+        if not self.names or self.step_s is None:
+            return None
+        step = self.step_s / DAY_S
+        span = (self.batch_frames - 1) * step
+        batch = self._covering(jd)
+        if batch is None:
+            # Jumped outside the cache: start a new batch at the current time
+            return (jd if direction >= 0 else jd - span), self.batch_frames
+
+        ahead = jd + direction * span / 2
+        if self._covering(ahead) is not None:
+            return None
+        # Consecutive batches share their boundary frame, so every instant
+        # between them can be interpolated
+        if direction >= 0:
+            return batch.end, self.batch_frames
+        return batch.start - span, self.batch_frames
+
+    def add(self, batch, jd):
+        """Store a computed batch, dropping the ones furthest from jd beyond max_frames"""
+        if tuple(batch.names) != self.names or batch.step_s != self.step_s:
+            return  # Computed for an older configuration
+        self.batches.append(batch)
+        self.batches.sort(key=lambda b: abs((b.start + b.end) / 2 - jd))
+        while sum(b.count for b in self.batches) > self.max_frames and len(self.batches) > 1:
+            self.batches.pop()
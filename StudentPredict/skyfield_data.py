@@ -0,0 +1,225 @@
+# skyfield_data.py
+"""
+Shared Skyfield data: timescale and planetary ephemeris
+Both are loaded once per process instead of on every call, from a local
+bundle in DATA_FOLDER whose files are checked against the SHA-256 sums of
+a manifest. Tracking never goes to the network: missing files are fetched
+once, explicitly, with `python skyfield_data.py --download`.
+
+Usage:
+    python skyfield_data.py --download   # fetch missing files, record their checksums
+    python skyfield_data.py              # bundle status
+    python skyfield_data.py --verify     # re-hash every file of the bundle
+    python skyfield_data.py --add FILE   # add a file copied from another machine
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import sys
+from config import DATA_FOLDER
+
+EPHEMERIS_FILE = 'de421.bsp'
+IERS_FILE = 'finals2000A.all'  # Optional: newer UT1 / Delta T than Skyfield's built-in tables
+BUNDLE_FILES = (EPHEMERIS_FILE, IERS_FILE)
+MANIFEST_FILE = 'skyfield_manifest.json'
+
+_timescale = None
+_ephemeris = None
+_ephemeris_error = None
+
+
+class MissingDataError(FileNotFoundError):
+    """A bundle file is not in DATA_FOLDER"""
+
+
+class ChecksumError(ValueError):
+    """A bundle file does not match the checksum recorded in the manifest"""
+
+
+def bundle_path(filename):
+    return os.path.join(DATA_FOLDER, filename)
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def read_manifest():
+    """{filename: {'sha256', 'size', 'mtime'}} of the bundle ({} if none yet)"""
+    try:
+        with open(bundle_path(MANIFEST_FILE)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def write_manifest(manifest):
+    os.makedirs(DATA_FOLDER, exist_ok=True)
+    path = bundle_path(MANIFEST_FILE)
+    with open(path + '.tmp', 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(path + '.tmp', path)
+
+
+def _stamp(path):
+    stat = os.stat(path)
+    return stat.st_size, stat.st_mtime_ns
+
+
+def record_file(filename, manifest=None):
+    """Hash a bundle file and store its checksum in the manifest"""
+    manifest = read_manifest() if manifest is None else manifest
+    path = bundle_path(filename)
+    size, mtime = _stamp(path)
+    manifest[filename] = {'sha256': file_sha256(path), 'size': size, 'mtime': mtime}
+    write_manifest(manifest)
+    return manifest[filename]
+
+
+def checked_path(filename, rehash=False):
+    """Path of a bundle file after checking it against the manifest
+
+    The file is only re-hashed when its size or modification time differ
+    from the manifest's (or with rehash=True), so startup stays fast. A file
+    missing from the manifest is hashed and recorded on first use.
+    """
+    path = bundle_path(filename)
+    if not os.path.exists(path):
+        raise MissingDataError(f"{filename} is not in {DATA_FOLDER} "
+                               f"(run 'python skyfield_data.py --download' once while online)")
+    manifest = read_manifest()
+    entry = manifest.get(filename)
+    if entry is None:
+        record_file(filename, manifest)
+        print(f"✓ Recorded checksum of {filename}")
+        return path
+
+    size, mtime = _stamp(path)
+    if not rehash and (size, mtime) == (entry['size'], entry['mtime']):
+        return path
+    if file_sha256(path) != entry['sha256']:
+        raise ChecksumError(f"{path} does not match its recorded checksum "
+                            f"(re-download it with 'python skyfield_data.py --download')")
+    entry['mtime'] = mtime  # Same content, touched: no need to hash it again next time
+    write_manifest(manifest)
+    return path
+
+
+def get_timescale():
+    """Timescale from the bundle's finals2000A.all if present and valid,
+    otherwise from Skyfield's built-in leap-second and Delta T tables"""
+    global _timescale
+    if _timescale is None:
+        from skyfield.api import load
+        try:
+            path = checked_path(IERS_FILE)
+        except MissingDataError:
+            path = None
+        except ChecksumError as e:
+            print(f"✗ {e}; using built-in tables")
+            path = None
+        if path is None:
+            _timescale = load.timescale(builtin=True)
+        else:
+            from skyfield.data import iers
+            from skyfield.timelib import Timescale
+            with open(path, 'rb') as f:
+                utc_mjd, dut1 = iers.parse_dut1_from_finals_all(f)
+            daily_tt, daily_delta_t, leap_dates, leap_offsets = iers.build_timescale_arrays(utc_mjd, dut1)
+            _timescale = Timescale((daily_tt, daily_delta_t), leap_dates, leap_offsets)
+    return _timescale
+
+
+def get_ephemeris():
+    """Planetary ephemeris from the bundle (never downloaded here)
+
+    Raises MissingDataError or ChecksumError; the failure is remembered so
+    per-position callers do not retry it on every call.
+    """
+    global _ephemeris, _ephemeris_error
+    if _ephemeris is None:
+        if _ephemeris_error is not None:
+            raise _ephemeris_error
+        try:
+            path = checked_path(EPHEMERIS_FILE)
+        except (MissingDataError, ChecksumError) as e:
+            _ephemeris_error = e
+            print(f"✗ {e}")
+            raise
+        from skyfield.jpllib import SpiceKernel
+        _ephemeris = SpiceKernel(path)
+    return _ephemeris
+
+
+def provision(filenames=BUNDLE_FILES):
+    """Download the missing bundle files (the only network access) and record their checksums"""
+    from skyfield.api import Loader
+    loader = Loader(DATA_FOLDER, verbose=False)
+    manifest = read_manifest()
+    for filename in filenames:
+        if os.path.exists(bundle_path(filename)) and filename in manifest:
+            continue
+        if not os.path.exists(bundle_path(filename)):
+            print(f"Downloading {filename}...")
+            try:
+                loader.download(filename)
+            except OSError as e:
+                print(f"✗ Could not download {filename}: {e}")
+                continue
+        record_file(filename, manifest)
+        print(f"✓ {filename} ({manifest[filename]['size'] / 1e6:.1f} MB)")
+
+
+def verify_bundle(rehash=True):
+    """{filename: 'ok' | 'missing' | 'checksum mismatch'} (rehash=False: only changed files are hashed)"""
+    status = {}
+    for filename in BUNDLE_FILES:
+        try:
+            checked_path(filename, rehash)
+            status[filename] = 'ok'
+        except MissingDataError:
+            status[filename] = 'missing'
+        except ChecksumError:
+            status[filename] = 'checksum mismatch'
+    return status
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Local Skyfield data bundle (ephemeris, Earth orientation)')
+    parser.add_argument('--download', action='store_true', help='Download missing files (needs network)')
+    parser.add_argument('--verify', action='store_true', help='Re-hash the bundle files')
+    parser.add_argument('--add', metavar='FILE', help='Copy a file into the bundle and record its checksum')
+    args = parser.parse_args()
+
+    if args.add:
+        filename = os.path.basename(args.add)
+        if filename not in BUNDLE_FILES:
+            print(f"✗ Not a bundle file: {filename} (expected {', '.join(BUNDLE_FILES)})")
+            sys.exit(1)
+        os.makedirs(DATA_FOLDER, exist_ok=True)
+        if os.path.abspath(args.add) != os.path.abspath(bundle_path(filename)):
+            shutil.copyfile(args.add, bundle_path(filename))
+        record_file(filename)
+        print(f"✓ Added {filename}")
+    if args.download:
+        provision()
+
+    failed = False
+    for filename, state in verify_bundle(args.verify).items():
+        if state == 'ok':
+            print(f"✓ {filename}")
+        else:
+            print(f"✗ {filename}: {state}")
+            failed = failed or filename == EPHEMERIS_FILE
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+# tests/conftest.py
+"""
+Shared fixtures: a tracker on the fixed TLE files of benchmarks/data/ at a
+fixed time, so the tests run offline and give the same results every run.
+"""
+
+import os
+import sys
+import pytest
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = os.path.join(PROJECT_DIR, 'benchmarks', 'data')
+sys.path.insert(0, PROJECT_DIR)
+
+# Close to the epochs of the fixed TLEs (like the benchmarks)
+FIXED_TIME = (2026, 10, 16, 12, 0, 0)
+
+
+@pytest.fixture(scope='session')
+def catalog():
+    from catalog import TLECatalog
+    with open(os.path.join(DATA_DIR, 'stations.tle')) as f:
+        return TLECatalog.from_tle_text(f.read())
+
+
+@pytest.fixture(scope='session')
+def tracker(catalog):
+    from tracker import SatelliteTracker
+    from sim_clock import FixedClock
+    tracker = SatelliteTracker()
+    tracker.clock = FixedClock(tracker.ts.utc(*FIXED_TIME))
+    tracker.load_catalog(catalog)
+    return tracker
@@ -0,0 +1,159 @@
+# tests/test_alarms.py
+"""
+Alarm engine on a FixedClock stepped by hand: AOS/TCA/LOS alarms fire in
+time order and only once due, jumps skip the alarms they pass over, and the
+pass table refilled window by window across its horizon fires every ISS pass
+exactly once.
+"""
+
+import time
+import pytest
+
+from conftest import FIXED_TIME
+from alarms import AlarmEngine, pass_source, TCA
+from event_core import AOS, LOS
+from predictor import PassPredictor
+from propagation import DAY_S
+from sim_clock import FixedClock
+
+ISS = 'ISS (ZARYA)'
+MIN_ELEVATION = 10
+STEP_S = 600
+
+
+@pytest.fixture(scope='module')
+def predictor(tracker):
+    return PassPredictor(tracker)
+
+
+@pytest.fixture
+def clock(tracker):
+    return FixedClock(tracker.ts.utc(*FIXED_TIME))
+
+
+@pytest.fixture
+def engines():
+    started = []
+    yield started
+    for engine in started:
+        engine.stop()
+
+
+def wait_until(condition, timeout_s=10):
+    deadline = time.monotonic() + timeout_s
+    while not condition():
+        assert time.monotonic() < deadline, "timed out waiting for the alarm engine"
+        time.sleep(0.005)
+
+
+def move_to(engine, clock, jd):
+    clock.t = clock.t.ts.tt_jd(jd)
+    engine.clock_advanced()
+
+
+def recorder(events):
+    return lambda event: events.append((event['kind'], event['lead_s'], event['satellite'], event['pass']))
+
+
+def fire_jd(event):
+    kind, lead_s, name, p = event
+    return p[{AOS: 'rise_time', TCA: 'max_time', LOS: 'set_time'}[kind]].tt - lead_s / DAY_S
+
+
+def test_alarms_fire_in_order_once_due(tracker, predictor, clock, engines):
+    start_jd = clock.now().tt
+    passes = predictor.find_passes(ISS, 1, MIN_ELEVATION, clock.now())
+    assert len(passes) >= 2
+
+    events = []
+    engine = AlarmEngine(tracker.ts, clock)
+    engines.append(engine)
+    engine.set_passes({ISS: passes}, start_jd, start_jd + 1)
+    for kind, lead_s in [(LOS, 0), (TCA, 0), (AOS, 0), (AOS, 300)]:
+        engine.add_alarm(kind, recorder(events), lead_s)
+    engine.start()
+    assert engine.pending() == 4 * len(passes)
+    assert engine.next_alarm() == (pytest.approx(passes[0]['rise_time'].tt - 300 / DAY_S), AOS, ISS)
+
+    # Not due yet: nothing fires
+    first = passes[0]['rise_time'].tt - 300 / DAY_S
+    move_to(engine, clock, first - 1 / DAY_S)
+    time.sleep(0.05)
+    assert events == []
+    move_to(engine, clock, first)
+    wait_until(lambda: len(events) == 1)
+    assert events[0][:2] == (AOS, 300)
+
+    # Step through the day
+    jd = first
+    while jd < start_jd + 1:
+        jd += STEP_S / DAY_S
+        move_to(engine, clock, jd)
+        wait_until(lambda: engine.next_alarm() is None or engine.next_alarm()[0] > jd)
+    wait_until(lambda: len(events) == 4 * len(passes))
+
+    times = [fire_jd(event) for event in events]
+    assert times == sorted(times)
+    for i, p in enumerate(passes):
+        assert [(kind, lead_s) for kind, lead_s, name, q in events[4 * i:4 * i + 4]] == \
+            [(AOS, 300), (AOS, 0), (TCA, 0), (LOS, 0)]
+        assert all(q is p for kind, lead_s, name, q in events[4 * i:4 * i + 4])
+    assert engine.pending() == 0
+
+
+def test_jump_skips_alarms(tracker, predictor, clock, engines):
+    start_jd = clock.now().tt
+    passes = predictor.find_passes(ISS, 1, MIN_ELEVATION, clock.now())
+    events = []
+    engine = AlarmEngine(tracker.ts, clock)
+    engines.append(engine)
+    engine.set_passes({ISS: passes}, start_jd, start_jd + 1)
+    engine.add_alarm(AOS, recorder(events))
+    engine.start()
+
+    # Jump to the middle of the second pass: the first two AOS go by silently
+    clock.t = passes[1]['max_time']
+    engine.clock_changed()
+    assert engine.pending() == len(passes) - 2
+    move_to(engine, clock, passes[2]['rise_time'].tt)
+    wait_until(lambda: len(events) == 1)
+    assert events[0][3] is passes[2]
+
+
+# First horizon during the 18:48-18:54 pass, or just after it (the pass is in both windows)
+@pytest.mark.parametrize('window_min', [6 * 60 + 50, 6 * 60 + 56])
+def test_refill_across_horizon(tracker, predictor, clock, engines, window_min):
+    start_jd = clock.now().tt
+    events = []
+    engine = AlarmEngine(tracker.ts, clock, source=pass_source(predictor, [ISS], MIN_ELEVATION),
+                         window_days=window_min * 60 / DAY_S, refill_margin_s=3600, overlap_s=1800)
+    engines.append(engine)
+    for kind in (AOS, TCA, LOS):
+        engine.add_alarm(kind, recorder(events))
+    engine.start()
+
+    def loaded_ahead():
+        return engine.horizon is not None and engine.horizon - 3600 / DAY_S > clock.now().tt
+
+    horizons = set()
+    jd = start_jd
+    while jd < start_jd + 1:
+        wait_until(loaded_ahead)
+        horizons.add(engine.horizon)
+        jd += STEP_S / DAY_S
+        move_to(engine, clock, jd)
+        wait_until(lambda: engine.next_alarm() is None or engine.next_alarm()[0] > jd)
+    assert len(horizons) >= 4  # Several refills
+
+    expected = [p for p in predictor.find_passes(ISS, 1.5, MIN_ELEVATION, tracker.ts.tt_jd(start_jd))
+                if p['set_time'].tt <= jd]
+    assert any(p['rise_time'].tt < horizon and p['set_time'].tt > horizon - 1800 / DAY_S
+               for p in expected for horizon in horizons)
+    wait_until(lambda: len(events) >= 3 * len(expected))
+    los = [event for event in events if event[0] == LOS]
+    assert len(los) == len(expected)
+    for event, p in zip(los, expected):
+        assert event[3]['rise_time'].tt == pytest.approx(p['rise_time'].tt, abs=1 / DAY_S)
+        assert event[3]['set_time'].tt == pytest.approx(p['set_time'].tt, abs=1 / DAY_S)
+    # Every pass fired its AOS, TCA and LOS once, in order
+    assert [event[0] for event in events] == [AOS, TCA, LOS] * len(expected)
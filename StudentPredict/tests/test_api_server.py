@@ -0,0 +1,151 @@
+# tests/test_api_server.py
+"""
+TrackingAPI handlers through aiohttp.test_utils: valid requests, and invalid
+query parameters answered with 400 instead of an internal error.
+"""
+
+import asyncio
+import json
+import pytest
+
+aiohttp = pytest.importorskip('aiohttp')
+from aiohttp.test_utils import TestClient, TestServer
+
+from api_server import TrackingAPI
+from predictor import PassPredictor
+
+ISS = 'ISS (ZARYA)'
+
+
+@pytest.fixture(scope='module')
+def api(tracker):
+    return TrackingAPI(tracker, PassPredictor(tracker))
+
+
+def run(api, scenario):
+    """Run scenario(client) against a test server of the API"""
+    async def main():
+        async with TestClient(TestServer(api.make_app())) as client:
+            return await scenario(client)
+    return asyncio.run(main())
+
+
+def get(api, path, params=None):
+    """(status, JSON body) of a GET request"""
+    async def scenario(client):
+        response = await client.get(path, params=params)
+        return response.status, await response.json()
+    return run(api, scenario)
+
+
+def test_status(api, catalog):
+    status, body = get(api, '/api/status')
+    assert status == 200
+    assert body['satellites'] == len(catalog)
+    assert body['time'].startswith('2026-10-16T12:00:00')
+
+
+def test_catalog_limit(api):
+    status, body = get(api, '/api/catalog', {'limit': '2'})
+    assert status == 200
+    assert len(body['results']) == 2
+    assert body['results'][0] == {'name': ISS, 'norad_id': 25544}
+
+
+@pytest.mark.parametrize('limit', ['x', '0', '-3', '1.5'])
+def test_catalog_invalid_limit(api, limit):
+    status, body = get(api, '/api/catalog', {'limit': limit})
+    assert status == 400
+    assert 'limit' in body['error']
+
+
+def test_positions(api):
+    status, body = get(api, '/api/positions', {'names': f'{ISS},NOT A SATELLITE'})
+    assert status == 200
+    assert list(body['positions']) == [ISS]
+    assert body['unknown'] == ['NOT A SATELLITE']
+    assert -90 <= body['positions'][ISS]['elevation'] <= 90
+
+
+def test_positions_unknown(api):
+    status, body = get(api, '/api/positions', {'names': 'NOT A SATELLITE'})
+    assert status == 404
+
+
+def test_batch_positions(api):
+    status, body = get(api, '/api/positions/batch', {'names': ISS, 'start': '2026-10-16T12:00:00',
+                                                     'duration': '600', 'step': '60'})
+    assert status == 200
+    assert len(body['columns']['time']) == 11
+    assert body['columns']['time'][0] == '2026-10-16T12:00:00.000Z'
+
+
+@pytest.mark.parametrize('params', [
+    {'step': 'nan'},
+    {'step': 'inf'},
+    {'step': '-inf'},
+    {'step': 'x'},
+    {'step': '0'},
+    {'duration': 'nan'},
+    {'duration': 'inf'},
+    {'duration': '-1'},
+    {'start': 'yesterday'},
+    {'duration': '1e9', 'step': '1'},
+])
+def test_batch_positions_invalid(api, params):
+    status, body = get(api, '/api/positions/batch', {'names': ISS, **params})
+    assert status == 400
+    assert body['error']
+
+
+def test_passes(api):
+    status, body = get(api, '/api/passes', {'name': ISS, 'days': '1'})
+    assert status == 200
+    assert body['satellite'] == ISS
+    for p in body['passes']:
+        assert p['rise_time'] < p['max_time'] < p['set_time']
+        assert p['max_elevation'] >= 10
+
+
+@pytest.mark.parametrize('params', [
+    {'days': 'nan'},
+    {'days': 'inf'},
+    {'days': '0'},
+    {'days': 'x'},
+    {'min_elevation': 'nan'},
+    {'min_elevation': '91'},
+])
+def test_passes_invalid(api, params):
+    status, body = get(api, '/api/passes', {'name': ISS, **params})
+    assert status == 400
+
+
+@pytest.mark.parametrize('interval', ['x', 'nan', 'inf'])
+def test_stream_invalid_interval(api, interval):
+    # Rejected before the WebSocket upgrade: a plain HTTP 400
+    status, body = get(api, '/api/stream', {'names': ISS, 'interval': interval})
+    assert status == 400
+    assert 'interval' in body['error']
+    assert api.clients == 0
+
+
+def test_stream(api):
+    async def scenario(client):
+        async with client.ws_connect('/api/stream', params={'names': ISS, 'interval': '1'}) as ws:
+            first = json.loads((await ws.receive(timeout=10)).data)
+            replies = []
+            for update in ({'interval': 'x'}, {'interval': float('inf')}, {'names': 'ISS'},
+                           {'names': [ISS, 'NOT A SATELLITE']}):
+                await ws.send_str(json.dumps(update))
+                message = json.loads((await ws.receive(timeout=10)).data)
+                while 'positions' in message:  # Skip the periodic updates
+                    message = json.loads((await ws.receive(timeout=10)).data)
+                replies.append(message)
+            clients = api.clients
+        return first, replies, clients
+
+    first, replies, clients = run(api, scenario)
+    assert list(first['positions']) == [ISS]
+    assert clients == 1
+    assert 'error' in replies[0] and 'error' in replies[1] and 'error' in replies[2]
+    assert replies[3] == {'unknown': ['NOT A SATELLITE']}
@@ -0,0 +1,171 @@
+# tests/test_catalog.py
+"""
+Array-backed catalog: parsed records against sgp4's own TLE parser, name
+lookups, Alpha-5 catalog numbers and subsets; binary snapshots and cached
+validation flags, saved, memory-mapped back and rejected when unusable.
+"""
+
+import os
+import numpy as np
+import pytest
+from sgp4.api import Satrec
+
+from conftest import DATA_DIR
+from catalog import (TLECatalog, parse_tle_records, satrec_from_record, save_snapshot, load_snapshot,
+                     save_flags, load_flags, SNAPSHOT_HEADER_SIZE)
+
+
+@pytest.fixture(scope='module')
+def stations_text():
+    with open(os.path.join(DATA_DIR, 'stations.tle')) as f:
+        return f.read()
+
+
+def test_records_match_sgp4_parser(stations_text):
+    lines = stations_text.strip().split('\n')
+    records = parse_tle_records(stations_text)
+    assert len(records) == len(lines) // 3
+    jd, fraction = np.full(3, 2461330.0), np.array([0.0, 0.25, 0.5])
+
+    for i, record in enumerate(records):
+        reference = Satrec.twoline2rv(lines[3 * i + 1], lines[3 * i + 2])
+        assert record['norad_id'] == reference.satnum
+        assert record['epoch_jd'] + record['epoch_fraction'] == pytest.approx(
+            reference.jdsatepoch + reference.jdsatepochF, abs=1e-8)
+
+        satrec = satrec_from_record(record)
+        errors, r, v = satrec.sgp4_array(jd, fraction)
+        expected_errors, expected_r, expected_v = reference.sgp4_array(jd, fraction)
+        np.testing.assert_array_equal(errors, expected_errors)
+        np.testing.assert_allclose(r, expected_r, atol=1e-6)
+        np.testing.assert_allclose(v, expected_v, atol=1e-9)
+
+
+def test_lookups(catalog):
+    assert catalog.names[0] == 'ISS (ZARYA)'
+    assert 'ISS (ZARYA)' in catalog and 'ISS' not in catalog
+    assert catalog.index_of('ISS (ZARYA)') == 0
+    assert catalog.find('zarya') == 0
+    assert catalog.find('no such satellite') is None
+    assert catalog.get_satellite('no such satellite') is None
+
+
+def test_satellites_are_created_once(stations_text):
+    catalog = TLECatalog.from_tle_text(stations_text)
+    assert catalog.memory_usage()['materialized'] == 0
+
+    satellite = catalog.get_satellite('ISS (ZARYA)')
+    assert satellite.name == 'ISS (ZARYA)' and satellite.model.satnum == 25544
+    assert catalog.get_satellite(0) is satellite
+    assert catalog.memory_usage()['materialized'] == 1
+
+
+def test_alpha5_catalog_numbers(stations_text):
+    lines = stations_text.strip().split('\n')[:3]
+    lines[1] = lines[1][:2] + 'A0001' + lines[1][7:]
+    lines[2] = lines[2][:2] + 'A0001' + lines[2][7:]
+    records = parse_tle_records('\n'.join(lines) + '\n' + stations_text)
+    assert records['norad_id'][:2].tolist() == [100001, 25544]
+
+
+def test_subset_keeps_flags(stations_text):
+    catalog = TLECatalog.from_tle_text(stations_text)
+    catalog.flags = np.arange(len(catalog), dtype=np.uint8)
+
+    subset = catalog.subset(np.arange(len(catalog)) % 2 == 1)
+    assert subset.names == catalog.names[1::2]
+    assert subset.flags.tolist() == catalog.flags[1::2].tolist()
+    assert subset.get_satellite(0).name == catalog.names[1]
+
+
+@pytest.fixture
+def source(tmp_path, stations_text):
+    """stations.tle copied to a temporary folder"""
+    path = tmp_path / 'stations.tle'
+    path.write_text(stations_text)
+    return str(path)
+
+
+def test_snapshot_round_trip(tmp_path, source, stations_text):
+    catalog = TLECatalog.from_tle_text(stations_text)
+    path = str(tmp_path / 'stations.tlebin')
+    catalog.save_snapshot(path, source)
+
+    loaded = TLECatalog.from_snapshot(path, source)
+    assert isinstance(loaded.records, np.memmap)
+    assert loaded.records.tobytes() == catalog.records.tobytes()
+    assert loaded.names == catalog.names
+
+    satellite = loaded.get_satellite(0)
+    t = loaded.ts.tt_jd(2461330.0)
+    np.testing.assert_array_equal(satellite.at(t).position.km,
+                                  catalog.get_satellite(0).at(t).position.km)
+
+
+def test_empty_snapshot(tmp_path):
+    path = str(tmp_path / 'empty.tlebin')
+    save_snapshot(parse_tle_records(''), path)
+    assert len(load_snapshot(path)) == 0
+
+
+def test_unusable_snapshots(tmp_path, source, stations_text):
+    path = str(tmp_path / 'stations.tlebin')
+    assert load_snapshot(path, source) is None  # Missing
+
+    save_snapshot(parse_tle_records(stations_text), path, source)
+    assert load_snapshot(path) is not None
+    stat = os.stat(source)
+    os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert load_snapshot(path, source) is None  # Text file changed since
+    assert load_snapshot(path) is not None      # (unless no source is given)
+
+    with open(path, 'rb') as f:
+        data = f.read()
+    with open(path, 'wb') as f:
+        f.write(data[:-1])
+    assert load_snapshot(path) is None  # Truncated
+
+    with open(path, 'wb') as f:
+        f.write(data[:8] + b'\xff' + data[9:])
+    assert load_snapshot(path) is None  # Other format version
+
+    with open(path, 'wb') as f:
+        f.write(data[:SNAPSHOT_HEADER_SIZE - 1])
+    assert load_snapshot(path) is None  # No complete header
+
+
+def test_flags_round_trip(tmp_path, source):
+    path = str(tmp_path / 'stations.tleflags')
+    flags = np.array([0, 4, 8, 0], dtype=np.uint8)
+    save_flags(flags, 2461330.25, path, source)
+
+    loaded, jd = load_flags(path, source, count=4)
+    assert loaded.tolist() == flags.tolist() and jd == 2461330.25
+    assert load_flags(path, source, count=5) == (None, None)
+    with open(source, 'a') as f:
+        f.write('\n')
+    assert load_flags(path, source) == (None, None)
+
+
+def test_load_catalog_uses_snapshot(tmp_path, monkeypatch, tracker, source, stations_text):
+    import tle_manager
+    from tle_manager import TLEManager
+    monkeypatch.setattr(tle_manager, 'DATA_FOLDER', str(tmp_path))
+
+    first = TLEManager.parser(tracker.clock).load_catalog('stations')
+    assert not isinstance(first.records, np.memmap)
+    assert os.path.exists(tmp_path / 'stations.tlebin')
+    assert os.path.exists(tmp_path / 'stations.tleflags')
+
+    second = TLEManager.parser(tracker.clock).load_catalog('stations')
+    assert isinstance(second.records, np.memmap)
+    assert second.names == first.names
+    assert second.flags.tolist() == first.flags.tolist()
+
+    # A new text file replaces the snapshot
+    lines = stations_text.strip().split('\n')
+    with open(source, 'w') as f:
+        f.write('\n'.join(lines[:-3]) + '\n')
+    third = TLEManager.parser(tracker.clock).load_catalog('stations')
+    assert not isinstance(third.records, np.memmap)
+    assert third.names == first.names[:-1]
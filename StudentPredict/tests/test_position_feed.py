@@ -0,0 +1,114 @@
+# tests/test_position_feed.py
+"""
+Shared-memory position feed: frames published by a FeedProducer read back by
+a FeedReader (same values as the tracker, ring of slots reused), and reads of
+a slot left half-written by a stuck or dead producer giving up with an error.
+"""
+
+import itertools
+import os
+import subprocess
+import sys
+import pytest
+
+from position_feed import FeedProducer, FeedReader
+from propagation import DAY_S
+
+SLOTS = 4
+_blocks = itertools.count()
+
+
+@pytest.fixture
+def producer(tracker, catalog):
+    producer = FeedProducer(tracker, catalog.names[:5], f'sgs_test_{os.getpid()}_{next(_blocks)}',
+                            slots=SLOTS, interval_s=0.5)
+    yield producer
+    producer.close()
+
+
+@pytest.fixture
+def reader(producer):
+    reader = FeedReader(producer.name)
+    yield reader
+    reader.close()
+
+
+def dead_pid():
+    process = subprocess.run([sys.executable, '-c', 'import os; print(os.getpid())'],
+                             capture_output=True, text=True, check=True)
+    return int(process.stdout)
+
+
+def test_round_trip(tracker, producer, reader):
+    assert reader.names == producer.names
+    assert reader.norad_ids.tolist() == [satrec.satnum for satrec in producer.satrecs]
+    assert reader.pid == os.getpid() and reader.interval_s == 0.5
+    assert reader.read() is None and reader.positions() == {}
+
+    t = tracker.now()
+    assert producer.publish() == 1
+    frame, jd, records = reader.read()
+    assert (frame, jd) == (1, t.tt)
+    assert len(records) == len(producer.names)
+
+    positions = reader.positions([producer.names[2], producer.names[0], 'NOT IN THE FEED'])
+    assert list(positions) == [producer.names[2], producer.names[0]]
+    for name, p in positions.items():
+        expected = tracker.get_position(name, t)
+        assert p['time'] == t.utc_iso() and p['jd'] == jd
+        assert p['elevation'] == pytest.approx(expected['elevation'], abs=0.01)
+        assert p['azimuth'] == pytest.approx(expected['azimuth'], abs=0.01)
+        assert p['distance_km'] == pytest.approx(expected['distance_km'], abs=0.5)
+        assert p['latitude'] == pytest.approx(expected['latitude'], abs=0.01)
+        assert p['altitude_km'] == pytest.approx(expected['altitude_km'], abs=0.5)
+
+    # Range rate: the derivative of the published distance (1 s apart, taken at the midpoint)
+    later = tracker.ts.tt_jd(t.tt + 1 / DAY_S)
+    producer.publish(later)
+    frame, jd, after = reader.read()
+    assert frame == 2 and jd == later.tt
+    midpoint = (after['range_rate_km_s'] + records['range_rate_km_s']) / 2
+    assert midpoint == pytest.approx(after['distance_km'] - records['distance_km'], abs=1e-4)
+
+
+def test_ring_of_slots(tracker, producer, reader):
+    start = tracker.now().tt
+    for i in range(2 * SLOTS + 1):
+        producer.publish(tracker.ts.tt_jd(start + i / DAY_S))
+        frame, jd, records = reader.read(rows=[1])
+        assert frame == i + 1 and jd == start + i / DAY_S
+        assert len(records) == 1
+    assert reader.frame == 2 * SLOTS + 1
+
+
+def test_feed_names_are_exclusive(producer, tracker):
+    with pytest.raises(FileExistsError):
+        FeedProducer(tracker, producer.names, producer.name)
+    with pytest.raises(FileNotFoundError):
+        FeedReader(producer.name + '_missing')
+
+
+def test_torn_slot_from_stuck_producer(producer, reader):
+    producer.publish()
+    slot, records = producer.layout.slots[0]
+    slot['seq'] += 1  # Producer stopped halfway through the slot
+    with pytest.raises(RuntimeError, match='still being written after 0.05 s'):
+        reader.read(timeout_s=0.05)
+    assert reader.retries > 1
+
+    slot['seq'] += 1  # Finished at last
+    assert reader.read(timeout_s=0.05)[0] == 1
+
+
+def test_torn_slot_from_dead_producer(producer):
+    producer.publish()
+    producer.layout.header['pid'] = dead_pid()
+    slot, records = producer.layout.slots[0]
+    slot['seq'] += 1
+    reader = FeedReader(producer.name)
+    try:
+        assert not reader.producer_alive()
+        with pytest.raises(RuntimeError, match='exited while writing frame 1'):
+            reader.read(timeout_s=0.05)
+    finally:
+        reader.close()
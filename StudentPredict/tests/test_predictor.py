@@ -0,0 +1,120 @@
+# tests/test_predictor.py
+"""
+Pass prediction on the synthetic catalog of benchmarks/data/active.tle:
+screening verdicts per orbit class (settled without a search, and true on a
+dense elevation grid), and HEO passes against the same grid, including a pass
+split in two by a dip of under two minutes near apogee.
+"""
+
+import os
+import numpy as np
+import pytest
+
+from conftest import DATA_DIR, FIXED_TIME
+from predictor import PassPredictor, LEO, MEO, HEO, GEO, SEARCH, NEVER, ALWAYS
+from propagation import DAY_S, time_grid, propagate_itrs, observer_frame, look_angles
+
+NAMES = ['ISS (ZARYA)', 'SAT-60007', 'SAT-60000', 'SAT-60008', 'SAT-63139', 'SAT-60005',
+         'SAT-60025', 'SAT-61739']
+GRID_STEP_S = 5
+
+
+@pytest.fixture(scope='module')
+def predictor():
+    from catalog import TLECatalog
+    from tracker import SatelliteTracker
+    from sim_clock import FixedClock
+    with open(os.path.join(DATA_DIR, 'active.tle')) as f:
+        catalog = TLECatalog.from_tle_text(f.read())
+    catalog = catalog.subset([catalog.index_of(name) for name in NAMES])
+    tracker = SatelliteTracker()
+    tracker.clock = FixedClock(tracker.ts.utc(*FIXED_TIME))
+    tracker.load_catalog(catalog)
+    return PassPredictor(tracker)
+
+
+def elevations(predictor, name, start, duration_s, step_s=GRID_STEP_S):
+    """(TT Julian dates, elevations) of a satellite on a regular grid"""
+    tracker = predictor.tracker
+    observer = tracker.observer
+    t = time_grid(tracker.ts, start, duration_s, step_s)
+    r, v, errors = propagate_itrs([tracker.satellite_for_time(name, start).model], t)
+    position, rotation = observer_frame(observer.latitude.degrees, observer.longitude.degrees,
+                                        observer.elevation.m)
+    return t.tt, look_angles(r[0], position[None], rotation[None])[1][0]
+
+
+def grid_passes(predictor, name, start, days, min_elevation):
+    """(rise, set) TT Julian dates of the complete passes seen on the grid"""
+    jd, el = elevations(predictor, name, start, days * DAY_S)
+    above = el >= min_elevation
+    changes = np.flatnonzero(above[1:] != above[:-1]) + 1
+    rises = [jd[k] for k in changes if above[k]]
+    sets = [jd[k] for k in changes if not above[k]]
+    if sets and (not rises or sets[0] < rises[0]):
+        sets = sets[1:]  # Already up at the start
+    return list(zip(rises, sets))
+
+
+def assert_same_passes(passes, expected):
+    assert len(passes) == len(expected)
+    for p, (rise, set_) in zip(passes, expected):
+        # The grid sees each event up to one step late
+        assert 0 <= rise - p['rise_time'].tt <= (GRID_STEP_S + 1) / DAY_S
+        assert 0 <= set_ - p['set_time'].tt <= (GRID_STEP_S + 1) / DAY_S
+
+
+@pytest.mark.parametrize('name, orbit, verdict', [
+    ('ISS (ZARYA)', LEO, SEARCH),
+    ('SAT-60007', LEO, NEVER),    # 21.8° inclination, too low for 48°N
+    ('SAT-60000', GEO, NEVER),    # Below the horizon
+    ('SAT-60008', GEO, ALWAYS),   # Near 26° all the time
+    ('SAT-63139', GEO, SEARCH),   # Inclined: crosses 10° daily
+    ('SAT-60005', MEO, SEARCH),
+    ('SAT-60025', HEO, SEARCH),
+])
+def test_screen_verdicts(predictor, name, orbit, verdict):
+    start = predictor.now()
+    assert predictor.screen(name, 3, 10, start) == (orbit, verdict)
+
+    passes = predictor.find_passes(name, 3, 10, start)
+    jd, el = elevations(predictor, name, start, 3 * DAY_S, 60)
+    if verdict == NEVER:
+        assert passes == [] and predictor.screened[name] == NEVER
+        assert el.max() < 10
+    elif verdict == ALWAYS:
+        assert passes == [] and predictor.screened[name] == ALWAYS
+        assert el.min() > 10
+    else:
+        assert name not in predictor.screened
+        assert len(passes) > 0
+
+
+def test_unknown_satellite(predictor):
+    assert predictor.screen('NO SUCH SATELLITE') is None
+    assert predictor.find_passes('NO SUCH SATELLITE') == []
+
+
+def test_heo_passes_match_grid(predictor):
+    start = predictor.now()
+    passes = predictor.find_passes('SAT-60025', 3, 10, start)
+    assert_same_passes(passes, grid_passes(predictor, 'SAT-60025', start, 3, 10))
+    for p in passes:
+        assert p['rise_time'].tt < p['max_time'].tt < p['set_time'].tt
+        assert p['max_elevation'] >= 10
+
+
+def test_heo_pass_split_at_short_dip(predictor):
+    # SAT-61739 hovers near 57° at apogee, with a shallow minimum between two maxima
+    start = predictor.now()
+    jd, el = elevations(predictor, 'SAT-61739', predictor.ts.tt_jd(2461330.2105 - 0.02), 0.04 * DAY_S, 1)
+    lowest = np.argmin(np.where(el > 50, el, np.inf))
+    assert 0 < lowest < len(el) - 1
+    min_elevation = el[lowest] + 0.0005  # A dip below this, shorter than the search step of its class
+
+    expected = grid_passes(predictor, 'SAT-61739', start, 2, min_elevation)
+    gaps = [(b[0] - a[1]) * DAY_S for a, b in zip(expected, expected[1:])]
+    assert any(60 < gap < 300 for gap in gaps)
+
+    passes = predictor.find_passes('SAT-61739', 2, min_elevation, start)
+    assert_same_passes(passes, expected)
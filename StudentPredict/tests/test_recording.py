@@ -0,0 +1,211 @@
+# tests/test_recording.py
+"""
+RecordingScheduler end to end: a stub recorder script logs when it starts
+and stops, a UDP listener collects the Doppler datagrams, and the clock runs
+in real time from the fixed test instant. Covers back-to-back handover,
+late starts, skipped passes, SIGTERM/SIGKILL and recorders that fail.
+"""
+
+import json
+import shlex
+import socket
+import sys
+import threading
+import time
+import pytest
+
+import recording
+from recording import RecordingScheduler, plan_recordings
+from propagation import DAY_S
+
+# Recorder stub: stub.py MODE SATELLITE OUTPUT
+#   obey      exit 0 on SIGTERM
+#   stubborn  ignore SIGTERM (needs SIGKILL)
+#   crash     exit 3 after 0.3 s
+STUB = '''
+import json, signal, sys, time
+mode, satellite, output = sys.argv[1:4]
+log = open(output + '.events', 'a')
+def event(name):
+    log.write(json.dumps({'event': name, 'satellite': satellite, 'unix': time.time()}) + '\\n')
+    log.flush()
+def on_term(*args):
+    event('sigterm')
+    if mode != 'stubborn':
+        sys.exit(0)
+signal.signal(signal.SIGTERM, on_term)
+event('start')
+if mode == 'crash':
+    time.sleep(0.3)
+    sys.exit(3)
+while True:
+    time.sleep(0.01)
+'''
+
+FREQUENCY_HZ = 137.1e6
+STEP_S = 0.25
+
+
+@pytest.fixture
+def clock_tracker(catalog):
+    """Tracker on a clock running in real time from the fixed test instant"""
+    from tracker import SatelliteTracker
+    from sim_clock import SimulationClock
+    from conftest import FIXED_TIME
+    tracker = SatelliteTracker()
+    tracker.clock = SimulationClock(tracker.ts)
+    tracker.clock.set_time(tracker.ts.utc(*FIXED_TIME))
+    tracker.load_catalog(catalog)
+    return tracker
+
+
+@pytest.fixture
+def listener():
+    """UDP socket collecting Doppler datagrams in a thread: (port, messages)"""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.bind(('127.0.0.1', 0))
+    sock.settimeout(0.1)
+    messages, done = [], threading.Event()
+
+    def listen():
+        while not done.is_set():
+            try:
+                messages.append(json.loads(sock.recv(4096)))
+            except socket.timeout:
+                pass
+
+    thread = threading.Thread(target=listen, daemon=True)
+    thread.start()
+    yield sock.getsockname()[1], messages
+    done.set()
+    thread.join()
+    sock.close()
+
+
+def stub_command(tmp_path, mode):
+    stub = tmp_path / 'stub.py'
+    stub.write_text(STUB)
+    return f"{shlex.quote(sys.executable)} {shlex.quote(str(stub))} {mode} {{satellite}} {{output}}"
+
+
+def make_pass(tracker, rise_s, set_s):
+    """Pass dict rising / setting this many seconds after the tracker's time"""
+    now = tracker.now().tt
+    rise, set_ = (tracker.ts.tt_jd(now + s / DAY_S) for s in (rise_s, set_s))
+    return {'rise_time': rise, 'set_time': set_, 'rise_time_str': rise.utc_iso(),
+            'max_time': tracker.ts.tt_jd((rise.tt + set_.tt) / 2), 'max_elevation': 45.0}
+
+
+def read_events(folder):
+    events = []
+    for path in folder.glob('*.events'):
+        events += [json.loads(line) for line in path.read_text().splitlines()]
+    return sorted(events, key=lambda e: e['unix'])
+
+
+def run_schedule(tracker, plans, command, folder, port):
+    scheduler = RecordingScheduler(tracker, command, folder=str(folder), port=port, step_s=STEP_S,
+                                   log=lambda message: None)
+    started = time.time()
+    scheduler.start(plans)
+    scheduler.wait()
+    return scheduler, started
+
+
+def test_handover_late_start_and_skip(clock_tracker, listener, tmp_path, capsys):
+    tracker = clock_tracker
+    names = tracker.catalog.names
+    passes = {
+        names[0]: [make_pass(tracker, 1.0, 2.5)],
+        names[1]: [make_pass(tracker, 3.2, 5.0)],   # Paddings overlap A's: handover at 2.85 s
+        names[2]: [make_pass(tracker, 4.8, 7.0)],   # Rises before B sets: starts late, when B stops
+        names[3]: [make_pass(tracker, 6.0, 6.9)],   # Entirely inside C's recording: skipped
+    }
+    frequencies = {name: FREQUENCY_HZ for name in passes}
+    plans = plan_recordings(tracker, passes, frequencies, padding_s=0.5, step_s=STEP_S)
+    assert 'inside the' in capsys.readouterr().out
+
+    assert [plan['satellite'] for plan in plans] == names[:3]
+    assert [plan['late_start'] for plan in plans] == [False, False, True]
+    for previous, plan in zip(plans, plans[1:]):
+        assert plan['start'] == previous['stop']  # Neither a gap nor an overlap
+    now = tracker.now().tt
+    assert (plans[1]['start'] - now) * DAY_S == pytest.approx(2.85, abs=0.05)
+    assert (plans[2]['start'] - now) * DAY_S == pytest.approx(5.5, abs=0.05)
+
+    port, messages = listener
+    scheduler, started = run_schedule(tracker, plans, stub_command(tmp_path, 'obey'), tmp_path, port)
+    assert [r['returncode'] for r in scheduler.results] == [0, 0, 0]
+
+    # Each recorder stopped (SIGTERM) before the next one started, about when planned
+    events = read_events(tmp_path)
+    assert [(e['event'], e['satellite']) for e in events] == [
+        (event, name) for name in names[:3] for event in ('start', 'sigterm')]
+    for stop, start in zip(events[1::2], events[2::2]):
+        assert 0 <= start['unix'] - stop['unix'] < 0.5
+    assert events[-1]['unix'] - started == pytest.approx(7.5, abs=0.5)
+
+    # Doppler datagrams for every recording, in order, consistent with the frequency
+    time.sleep(0.2)
+    received = [m['satellite'] for m in messages]
+    assert set(received) == set(names[:3])
+    assert received == sorted(received, key=names.index)
+    for message in messages:
+        assert message['frequency_hz'] == FREQUENCY_HZ
+        assert message['tuned_hz'] == pytest.approx(FREQUENCY_HZ + message['doppler_hz'], abs=0.1)
+        assert abs(message['doppler_hz']) < 5e3  # LEO at 137 MHz: a few kHz at most
+
+
+def test_stubborn_recorder_is_killed(clock_tracker, listener, tmp_path, monkeypatch):
+    monkeypatch.setattr(recording, 'RECORDER_STOP_TIMEOUT_S', 0.5)
+    tracker = clock_tracker
+    name = tracker.catalog.names[0]
+    plans = plan_recordings(tracker, {name: [make_pass(tracker, 0.5, 1.5)]}, {name: FREQUENCY_HZ},
+                            padding_s=0.5, step_s=STEP_S)
+    port, messages = listener
+    scheduler, started = run_schedule(tracker, plans, stub_command(tmp_path, 'stubborn'), tmp_path, port)
+
+    result, = scheduler.results
+    assert result['returncode'] == -9  # SIGKILL after the SIGTERM was ignored
+    events = read_events(tmp_path)
+    assert [e['event'] for e in events] == ['start', 'sigterm']
+    assert result['stop'] - events[1]['unix'] == pytest.approx(0.5, abs=0.3)
+
+
+def test_recorder_exiting_early_and_failing_to_start(clock_tracker, listener, tmp_path):
+    tracker = clock_tracker
+    names = tracker.catalog.names
+    passes = {names[0]: [make_pass(tracker, 0.5, 1.5)], names[1]: [make_pass(tracker, 2.5, 3.0)]}
+    plans = plan_recordings(tracker, passes, {name: FREQUENCY_HZ for name in passes},
+                            padding_s=0.25, step_s=STEP_S)
+    port, messages = listener
+
+    # Exits with code 3 early: recorded as such, and the schedule goes on
+    scheduler, started = run_schedule(tracker, plans, stub_command(tmp_path, 'crash'), tmp_path, port)
+    assert [r['returncode'] for r in scheduler.results] == [3, 3]
+
+    # Command not found: an error per recording, each waited out until its window ends
+    missing = str(tmp_path / 'no-such-recorder')
+    plans = plan_recordings(tracker, {names[0]: [make_pass(tracker, 0.5, 1.0)]},
+                            {names[0]: FREQUENCY_HZ}, padding_s=0.25, step_s=STEP_S)
+    scheduler, started = run_schedule(tracker, plans, missing + ' {output}', tmp_path, port)
+    result, = scheduler.results
+    assert result['returncode'] is None and result['error']
+    assert result['stop'] - started == pytest.approx(1.25, abs=0.4)
+
+
+def test_stop_ends_the_current_recording(clock_tracker, listener, tmp_path):
+    tracker = clock_tracker
+    name = tracker.catalog.names[0]
+    plans = plan_recordings(tracker, {name: [make_pass(tracker, 0.25, 30.0)]}, {name: FREQUENCY_HZ},
+                            padding_s=0.25, step_s=STEP_S)
+    port, messages = listener
+    scheduler = RecordingScheduler(tracker, stub_command(tmp_path, 'obey'), folder=str(tmp_path),
+                                   port=port, step_s=STEP_S, log=lambda message: None)
+    scheduler.start(plans)
+    time.sleep(1.0)
+    scheduler.stop()
+    result, = scheduler.results
+    assert result['returncode'] == 0
+    assert result['stop'] - result['start'] < 2.0
+    assert [e['event'] for e in read_events(tmp_path)] == ['start', 'sigterm']
@@ -0,0 +1,176 @@
+# tests/test_rotator.py
+"""
+Rotator planning on synthetic zenith, near-zenith and north-wrapping passes,
+and on real ISS passes. Limits are checked on the command streams themselves
+(differences, ranges, pointing vectors), not with the planner's simulator.
+"""
+
+import numpy as np
+import pytest
+
+from rotator import RotatorLimits, FLIP, NORMAL, pad, plan_commands, plan_schedule
+from propagation import DAY_S
+
+STEP_S = 1.0
+
+
+def line_pass(offset, heading_deg, half_s=300, height_km=500.0, min_el=5.0):
+    """Az/el (1 s samples) of a straight flat-Earth track at height_km, passing
+    offset x height_km beside the zenith (negative: left of the heading), from
+    min_el to min_el"""
+    t = np.arange(-half_s, half_s + 1.0)
+    along = t / half_s * height_km / np.tan(np.radians(min_el))
+    cross = offset * height_km
+    heading = np.radians(heading_deg)
+    east = along * np.sin(heading) + cross * np.cos(heading)
+    north = along * np.cos(heading) - cross * np.sin(heading)
+    el = np.degrees(np.arctan2(height_km, np.hypot(east, north)))
+    az = np.degrees(np.arctan2(east, north)) % 360
+    return az, el
+
+
+def direction(az, el):
+    """Unit pointing vectors (east, north, up); el above 90 points behind az"""
+    az, el = np.radians(az), np.radians(el)
+    return np.stack([np.cos(el) * np.sin(az), np.cos(el) * np.cos(az), np.sin(el)], axis=-1)
+
+
+def angle_between(az1, el1, az2, el2):
+    cos = (direction(az1, el1) * direction(az2, el2)).sum(axis=-1)
+    return np.degrees(np.arccos(np.clip(cos, -1.0, 1.0)))
+
+
+def assert_within_limits(az_cmd, el_cmd, limits, step_s=STEP_S):
+    """Every step reachable at the slew rates, every command inside the mechanical range"""
+    assert np.abs(np.diff(az_cmd)).max(initial=0) / step_s <= limits.az_rate + 1e-9
+    assert np.abs(np.diff(el_cmd)).max(initial=0) / step_s <= limits.el_rate + 1e-9
+    assert limits.az_min - 1e-9 <= az_cmd.min() and az_cmd.max() <= limits.az_max + 1e-9
+    assert limits.el_min - 1e-9 <= el_cmd.min() and el_cmd.max() <= limits.el_max + 1e-9
+
+
+def plan_one(az, el, limits):
+    """plan_commands for a single pass: (az_cmd, el_cmd, flipped, fits, max_error)"""
+    az_pad, valid = pad([az])
+    el_pad, _ = pad([el])
+    az_cmd, el_cmd, flipped, fits, error = plan_commands(az_pad, el_pad, valid, STEP_S, limits)
+    return az_cmd[0], el_cmd[0], bool(flipped[0]), bool(fits[0]), float(error[0])
+
+
+def tracking_error(az_cmd, el_cmd, az, el, limits):
+    """Worst angle between the commands and the (clipped) target, computed here"""
+    return angle_between(az_cmd, el_cmd, az, np.clip(el, limits.el_min, 90.0)).max()
+
+
+def test_zenith_pass_is_flipped():
+    limits = RotatorLimits()
+    az, el = line_pass(0.0, 0)  # South to north through the zenith
+    az_cmd, el_cmd, flipped, fits, error = plan_one(az, el, limits)
+    assert_within_limits(az_cmd, el_cmd, limits)
+    assert flipped and fits
+    # No half turn in azimuth: the elevation axis goes over the top instead
+    assert np.ptp(az_cmd) < 1.0
+    assert el_cmd.max() > 170
+    assert tracking_error(az_cmd, el_cmd, az, el, limits) < 0.5
+    assert error == pytest.approx(tracking_error(az_cmd, el_cmd, az, el, limits), abs=1e-6)
+
+
+def test_near_zenith_pass_flip_beats_normal():
+    az, el = line_pass(0.05, 30)  # Culminates near 87°
+    assert 85 < el.max() < 90
+
+    limits = RotatorLimits()
+    az_cmd, el_cmd, flipped, fits, error = plan_one(az, el, limits)
+    assert_within_limits(az_cmd, el_cmd, limits)
+    assert flipped
+    flip_error = tracking_error(az_cmd, el_cmd, az, el, limits)
+
+    # Same pass on a rotator without flip: the azimuth half turn lags the satellite
+    no_flip = RotatorLimits(el_max=90)
+    az_cmd, el_cmd, flipped, fits, error = plan_one(az, el, no_flip)
+    assert_within_limits(az_cmd, el_cmd, no_flip)
+    assert not flipped
+    normal_error = tracking_error(az_cmd, el_cmd, az, el, no_flip)
+    assert flip_error < 6.0 < 20.0 < normal_error
+
+
+def test_high_pass_stays_normal_when_flip_is_worse():
+    limits = RotatorLimits()
+    az, el = line_pass(0.2, 30)  # Culminates near 79°: above flip_elevation
+    assert el.max() > limits.flip_elevation
+    az_cmd, el_cmd, flipped, fits, error = plan_one(az, el, limits)
+    assert_within_limits(az_cmd, el_cmd, limits)
+    assert not flipped
+    assert el_cmd.max() <= 90
+    assert error == pytest.approx(tracking_error(az_cmd, el_cmd, az, el, limits), abs=1e-6)
+
+
+def test_north_wrap_uses_the_overlap():
+    limits = RotatorLimits()
+    az, el = line_pass(-3.0, 90)  # West to east north of the station: 285° -> 0° -> 75°
+    assert az.max() - az.min() > 300  # Crosses north
+    az_cmd, el_cmd, flipped, fits, error = plan_one(az, el, limits)
+    assert_within_limits(az_cmd, el_cmd, limits)
+    assert fits and not flipped
+    assert az_cmd.max() > 360  # Through the 360-450° overlap, no unwinding
+    assert tracking_error(az_cmd, el_cmd, az, el, limits) < 1e-4
+
+
+def test_wrap_outside_the_range_is_flipped():
+    limits = RotatorLimits()
+    az, el = line_pass(-2.0, 135)  # 325° clockwise to 125°: not within 0-450° either way
+    az_cmd, el_cmd, flipped, fits, error = plan_one(az, el, limits)
+    assert_within_limits(az_cmd, el_cmd, limits)
+    assert flipped and fits
+    assert tracking_error(az_cmd, el_cmd, az, el, limits) < 1e-4
+
+
+def test_wrap_without_overlap_or_flip_unwinds_within_limits():
+    limits = RotatorLimits(az_max=360, el_max=90)
+    az, el = line_pass(-2.0, 135)
+    az_cmd, el_cmd, flipped, fits, error = plan_one(az, el, limits)
+    # The unwinding move itself is rate limited and the error reported honestly
+    assert_within_limits(az_cmd, el_cmd, limits)
+    assert not fits and not flipped
+    measured = tracking_error(az_cmd, el_cmd, az, el, limits)
+    assert measured > 10
+    assert error == pytest.approx(measured, abs=1e-6)
+
+
+@pytest.fixture(scope='module')
+def iss_plans(tracker):
+    from predictor import PassPredictor
+    name = 'ISS (ZARYA)'
+    passes = PassPredictor(tracker).find_passes(name, 1, start_time=tracker.now())
+    assert passes
+    return tracker, plan_schedule(tracker, {name: passes}, RotatorLimits(), STEP_S)
+
+
+def test_schedule_commands_within_limits(iss_plans):
+    tracker, plans = iss_plans
+    limits = RotatorLimits()
+    previous_end = None
+    for plan in plans:
+        commands = plan['commands']
+        assert np.allclose(np.diff(commands['jd']) * DAY_S, STEP_S, atol=1e-3)
+        assert_within_limits(commands['az'], commands['el'], limits)
+        assert plan['mode'] in (NORMAL, FLIP)
+        assert (plan['mode'] == FLIP) == (commands['el'].max() > 90)
+
+        # Prepositioning leaves time for the slowest axis to reach the first command
+        start = plan['preposition_time'].tt
+        lead_s = (commands['jd'][0] - start) * DAY_S
+        from_az, from_el = limits.park if previous_end is None else previous_end
+        assert lead_s * limits.az_rate >= abs(commands['az'][0] - from_az) - 1e-3  # jd resolution
+        assert lead_s * limits.el_rate >= abs(commands['el'][0] - from_el) - 1e-3
+        previous_end = commands['az'][-1], commands['el'][-1]
+
+
+def test_schedule_tracks_skyfield_positions(iss_plans):
+    tracker, plans = iss_plans
+    for plan in plans:
+        commands = plan['commands'][::10]
+        t = tracker.ts.tt_jd(commands['jd'])
+        satellite = tracker.satellite_for_time(plan['satellite'], t[len(t) // 2])
+        alt, az, distance = (satellite - tracker.observer).at(t).altaz()
+        error = angle_between(commands['az'], commands['el'], az.degrees, np.maximum(alt.degrees, 0.0))
+        assert error.max() <= plan['max_error_deg'] + 0.05
@@ -0,0 +1,60 @@
+# tests/test_skyfield_data.py
+"""
+Timescale loading from a bundle folder: a small finals2000A.all around the
+2016-12-31 leap second, a file that no longer matches its checksum, and no
+file at all.
+"""
+
+import pytest
+
+import skyfield_data
+
+
+def finals_line(year, month, day, mjd, dut1):
+    """One finals2000A.all row (IERS fixed-width columns, polar motion made up)"""
+    return (f"{year % 100:2d}{month:2d}{day:2d} {mjd:8.2f} I "
+            f"{0.05:9.6f}{0.00005:9.6f} {0.26:9.6f}{0.00005:9.6f}  "
+            f"I{dut1:10.7f}{0.0000063:10.7f}\n")
+
+
+# UT1-UTC jumps by one second on 2017-01-01: the leap second
+FINALS = ''.join(finals_line(*row) for row in [
+    (2016, 12, 30, 57752, -0.4003),
+    (2016, 12, 31, 57753, -0.4010),
+    (2017, 1, 1, 57754, 0.5927),
+    (2017, 1, 2, 57755, 0.5920),
+])
+
+
+@pytest.fixture
+def bundle(tmp_path, monkeypatch):
+    monkeypatch.setattr(skyfield_data, 'DATA_FOLDER', str(tmp_path))
+    monkeypatch.setattr(skyfield_data, '_timescale', None)
+    return tmp_path
+
+
+def test_timescale_from_finals_file(bundle):
+    (bundle / skyfield_data.IERS_FILE).write_text(FINALS)
+    ts = skyfield_data.get_timescale()
+
+    assert ts.leap_dates[-1] == 2457754.5  # Found from the UT1-UTC jump
+    assert ts.utc(2017, 1, 1).dut1 == pytest.approx(0.5927)
+    assert ts.utc(2016, 12, 31).dut1 == pytest.approx(-0.4010)
+    assert skyfield_data.IERS_FILE in skyfield_data.read_manifest()
+    assert skyfield_data.get_timescale() is ts
+
+
+def test_changed_finals_file_falls_back_to_builtin(bundle, capsys):
+    path = bundle / skyfield_data.IERS_FILE
+    path.write_text(FINALS)
+    skyfield_data.record_file(skyfield_data.IERS_FILE)
+    path.write_text(FINALS.replace('0.5927', '0.9927'))
+
+    ts = skyfield_data.get_timescale()
+    assert 'checksum' in capsys.readouterr().out
+    assert len(ts.leap_dates) > 20  # Skyfield's own table, not the 3 of the file
+
+
+def test_builtin_timescale_without_finals_file(bundle):
+    ts = skyfield_data.get_timescale()
+    assert len(ts.leap_dates) > 20
@@ -0,0 +1,121 @@
+# tests/test_tle_history.py
+"""
+TLE history archive: closest-epoch selection over several downloads spread
+across shards, and downloads with a corrupt element set, fed directly and
+through TLEManager.download_tles with a stubbed HTTP request.
+"""
+
+import os
+import numpy as np
+import pytest
+
+from conftest import DATA_DIR
+from catalog import epoch_to_jd
+from tle_history import TLEHistory
+
+ISS_ID = 25544
+
+
+def checksum(line):
+    """Line with its last column replaced by the modulo-10 checksum"""
+    total = sum(int(c) if c.isdigit() else c == '-' for c in line[:68])
+    return line[:68] + str(total % 10)
+
+
+@pytest.fixture(scope='module')
+def stations_text():
+    with open(os.path.join(DATA_DIR, 'stations.tle')) as f:
+        return f.read()
+
+
+def with_epoch(entry, day):
+    """Element set (name + 2 lines) moved to another epoch day of 2026"""
+    name, line1, line2 = entry
+    return [name, checksum(f"{line1[:18]}26{day:012.8f}{line1[32:]}"), line2]
+
+
+def day_jd(day):
+    whole, fraction = epoch_to_jd(np.array([26]), np.array([day]))
+    return float(whole[0] + fraction[0])
+
+
+@pytest.fixture(scope='module')
+def entries(stations_text):
+    lines = stations_text.strip().split('\n')
+    return {int(lines[i + 1][2:7]): lines[i:i + 3] for i in range(0, len(lines), 3)}
+
+
+def test_closest_epoch_across_shards(tmp_path, stations_text, entries):
+    history = TLEHistory(str(tmp_path))
+    assert history.add_tle_text(stations_text) == len(entries)
+    later = with_epoch(entries[ISS_ID], 290.5) + with_epoch(entries[60000], 287.0)
+    assert history.add_tle_text('\n'.join(later)) == 2
+    assert history.add_tle_text('\n'.join(with_epoch(entries[ISS_ID], 286.0))) == 1
+    assert history.add_tle_text('\n'.join(later)) == 0  # Already archived
+    assert sorted(os.listdir(tmp_path)) == ['00025.tle.gz', '00060.tle.gz']
+
+    iss_epochs = [day_jd(day) for day in (286.0, 288.5, 290.5)]
+    np.testing.assert_allclose(history.epochs(ISS_ID), iss_epochs, atol=1e-8)
+    np.testing.assert_allclose(history.epochs(60000), [day_jd(285.39389278), day_jd(287.0)], atol=1e-8)
+
+    for day, expected in [(280.0, 286.0), (287.2, 286.0), (289.4, 288.5), (289.6, 290.5), (300.0, 290.5)]:
+        closest = history.closest(ISS_ID, day_jd(day))
+        assert closest['name'] == 'ISS (ZARYA)'
+        assert closest['epoch_jd'] == pytest.approx(day_jd(expected), abs=1e-8)
+        assert closest['line1'] == with_epoch(entries[ISS_ID], expected)[1]
+    assert history.closest(60000, day_jd(290.0))['line1'] == with_epoch(entries[60000], 287.0)[1]
+    assert history.closest(60001, day_jd(290.0))['line1'] == entries[60001][1]
+    assert history.closest(99999, day_jd(290.0)) is None
+
+    # Each download appended a gzip member: a new archive reads them all back
+    reopened = TLEHistory(str(tmp_path))
+    np.testing.assert_array_equal(reopened.epochs(ISS_ID), history.epochs(ISS_ID))
+    assert reopened.closest(ISS_ID, day_jd(289.6)) == history.closest(ISS_ID, day_jd(289.6))
+
+
+@pytest.fixture(scope='module')
+def corrupt_text(stations_text):
+    """stations.tle with a letter in the ISS B* term (valid checksum, unparseable field)"""
+    lines = stations_text.strip().split('\n')
+    assert lines[1][53:61] == ' 30118-3'
+    lines[1] = checksum(lines[1][:54] + '3O118-3' + lines[1][61:])
+    return '\n'.join(lines) + '\n'
+
+
+def test_corrupt_entry_is_not_archived(tmp_path, stations_text, corrupt_text):
+    history = TLEHistory(str(tmp_path))
+    total = len(stations_text.strip().split('\n')) // 3
+
+    assert history.add_tle_text(corrupt_text) == total - 1
+    assert history.closest(ISS_ID, 2461330.0) is None
+    # The clean element set is still accepted later
+    assert history.add_tle_text(stations_text) == 1
+    assert history.closest(ISS_ID, 2461330.0)['name'] == 'ISS (ZARYA)'
+
+
+class FakeResponse:
+    def __init__(self, text):
+        self.text = text
+
+    def raise_for_status(self):
+        pass
+
+
+def test_download_with_corrupt_entry(tmp_path, monkeypatch, tracker, stations_text, corrupt_text):
+    import requests
+    import tle_manager
+    from tle_manager import TLEManager
+
+    monkeypatch.setattr(tle_manager, 'DATA_FOLDER', str(tmp_path))
+    monkeypatch.setattr(requests, 'get', lambda url, timeout: FakeResponse(corrupt_text))
+    manager = TLEManager.parser(tracker.clock)
+    manager.history = TLEHistory(str(tmp_path / 'history'))
+
+    satellites = manager.download_tles('stations')
+    names = [satellite['name'] for satellite in satellites]
+    total = len(stations_text.strip().split('\n')) // 3
+    assert len(names) == total - 1 and 'ISS (ZARYA)' not in names
+    assert manager.reports['stations']['dropped'] == 1
+    assert len(manager.history.epochs(ISS_ID)) == 0
+    assert sum(len(manager.history.epochs(int(line[2:7])))
+               for line in corrupt_text.split('\n')[1::3]) == total - 1
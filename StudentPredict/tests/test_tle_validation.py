@@ -0,0 +1,129 @@
+# tests/test_tle_validation.py
+"""
+TLE checks: line verdicts on malformed entries, SGP4 verdicts on decayed and
+invalid orbits, epoch age and mean motion jumps, and TLEManager.parse_tle
+checking epochs at its clock's time rather than the system time.
+"""
+
+import os
+import numpy as np
+import pytest
+
+from conftest import DATA_DIR
+from tle_validation import (BAD_FORMAT, BAD_CHECKSUM, SGP4_ERROR, DECAYED, EXPIRED, STALE,
+                            MEAN_MOTION_JUMP, check_lines, check_records, validate_tle_text,
+                            keep, summarize, print_report)
+from catalog import parse_tle_records
+
+
+def checksum(line):
+    """Line with its last column replaced by the modulo-10 checksum"""
+    total = sum(int(c) if c.isdigit() else c == '-' for c in line[:68])
+    return line[:68] + str(total % 10)
+
+
+@pytest.fixture(scope='module')
+def stations_text():
+    with open(os.path.join(DATA_DIR, 'stations.tle')) as f:
+        return f.read()
+
+
+@pytest.fixture(scope='module')
+def records(stations_text):
+    return parse_tle_records(stations_text)
+
+
+def epochs(records):
+    return records['epoch_jd'] + records['epoch_fraction']
+
+
+def test_line_verdicts(stations_text):
+    name, line1, line2 = stations_text.strip().split('\n')[:3]
+    entries = [
+        [name, line1, line2],
+        ['WRONG CHECKSUM', line1, line2[:-1] + str((int(line2[-1]) + 1) % 10)],
+        ['LINE NUMBER', checksum('3' + line1[1:]), line2],
+        ['OTHER NORAD ID', line1, checksum(line2[:2] + '25545' + line2[7:])],
+        ['BAD FIELD', checksum(line1[:54] + '3O118-3' + line1[61:]), line2],
+        ['SHORT LINE', line1[:40], line2],  # Padded with blanks: no checksum digit
+    ]
+    records, flags = check_lines('\n'.join('\n'.join(entry) for entry in entries))
+
+    assert flags.tolist() == [0, BAD_CHECKSUM, BAD_FORMAT, BAD_FORMAT, BAD_FORMAT, BAD_CHECKSUM]
+    assert [n.decode() for n in records['name']] == [entry[0] for entry in entries]
+    assert records['norad_id'].tolist() == [25544, 0, 0, 0, 0, 0]  # Bad entries stay zeroed
+
+
+def test_sgp4_verdicts(records):
+    iss = np.repeat(records[:1], 3)
+    iss[1]['bstar'] = 0.05          # Drag brings it down within days
+    iss[2]['eccentricity'] = 1.5    # Not an ellipse: SGP4 rejects it
+    jd = float(epochs(iss)[0]) + 10
+
+    flags = check_records(iss, jd)
+    assert flags.tolist() == [STALE, STALE | DECAYED, STALE | SGP4_ERROR]
+    assert keep(flags).tolist() == [True, False, False]
+    # Cached SGP4 flags replace the propagation
+    cached = np.array([DECAYED, 0, 0], dtype=np.uint8)
+    assert check_records(iss, jd, sgp4=cached).tolist() == [STALE | DECAYED, STALE, STALE]
+
+
+def test_epoch_age(records):
+    iss = records[:1]
+    no_sgp4 = np.zeros(1, dtype=np.uint8)
+    epoch = float(epochs(iss)[0])
+
+    assert check_records(iss, epoch + 6, sgp4=no_sgp4).tolist() == [0]
+    assert check_records(iss, epoch + 8, sgp4=no_sgp4).tolist() == [STALE]
+    assert check_records(iss, epoch + 31, sgp4=no_sgp4).tolist() == [STALE | EXPIRED]
+    assert not keep(np.array([STALE | EXPIRED]))[0] and keep(np.array([STALE]))[0]
+
+
+def test_mean_motion_jumps(records):
+    current = records[:2].copy()
+    previous = records[:2].copy()
+    previous['epoch_jd'] -= 10
+    previous['ndot'] = [0.0, 0.001]  # 10 days of drag explain +0.02 rev/day
+    current['mean_motion'] = previous['mean_motion'] + [0.05, 0.02]
+    no_sgp4 = np.zeros(2, dtype=np.uint8)
+    jd = float(epochs(current).max())
+
+    flags = check_records(current, jd, previous[::-1], sgp4=no_sgp4)
+    assert flags.tolist() == [MEAN_MOTION_JUMP, 0]
+    assert keep(flags).all()  # Only flagged
+    # Satellites missing from the previous download are not compared
+    assert check_records(current, jd, previous[1:], sgp4=no_sgp4).tolist() == [0, 0]
+
+
+def test_report(stations_text, records, capsys):
+    lines = stations_text.strip().split('\n')
+    lines[2] = lines[2][:-1] + str((int(lines[2][-1]) + 1) % 10)
+    jd = float(epochs(records).max()) + 7.5
+    records, flags = validate_tle_text('\n'.join(lines), jd)
+
+    report = summarize(records, flags, jd)
+    assert (report['total'], report['kept'], report['dropped']) == (len(records), len(records) - 1, 1)
+    assert report['names']['bad checksum'] == ['ISS (ZARYA)']
+    assert report['counts']['stale'] == len(records) - 1
+
+    print_report(report, 'stations')
+    output = capsys.readouterr().out
+    assert output.startswith(f"✗ stations: {len(records) - 1}/{len(records)} kept, 1 dropped")
+    assert '   bad checksum: ISS (ZARYA)\n' in output
+
+    # Only flagged entries: nothing dropped, reported with ✓
+    print_report(summarize(records[1:], flags[1:], jd), 'stations')
+    assert capsys.readouterr().out.startswith(f"✓ stations: {len(records) - 1}/{len(records) - 1} kept")
+
+
+def test_parse_tle_checks_at_clock_time(tracker, stations_text):
+    from sim_clock import FixedClock
+    from tle_manager import TLEManager
+
+    satellites = TLEManager.parser(tracker.clock).parse_tle(stations_text, 'stations')
+    assert len(satellites) == len(stations_text.strip().split('\n')) // 3
+
+    later = FixedClock(tracker.ts.utc(2026, 12, 1))
+    manager = TLEManager.parser(later)
+    assert manager.parse_tle(stations_text, 'stations') == []
+    assert manager.reports['stations']['counts']['expired'] == len(satellites)
@@ -0,0 +1,133 @@
+# tle_history.py
+"""
+Append-only archive of past TLE element sets
+Every download is added to gzip shards (one per block of 1000 NORAD IDs),
+so older element sets stay available for propagating far from the latest epoch.
+"""
+
+import gzip
+import os
+import threading
+import numpy as np
+from config import HISTORY_FOLDER
+from catalog import parse_tle_records
+from tle_validation import check_lines, LINE_ERRORS
+
+SHARD_SIZE = 1000  # NORAD IDs per shard file
+
+
+class _Shard:
+    """In-memory index of one shard: element sets sorted by (NORAD ID, epoch)"""
+
+    def __init__(self, lines):
+        self.lines = lines
+        records = parse_tle_records('\n'.join(lines))
+        epochs = records['epoch_jd'] + records['epoch_fraction']
+        order = np.lexsort((epochs, records['norad_id']))
+        self.norad_ids = records['norad_id'][order]
+        self.epochs = epochs[order]
+        self.rows = order
+        self.keys = set(zip(records['norad_id'].tolist(), np.round(epochs, 8).tolist()))
+
+    def closest(self, norad_id, jd):
+        start = np.searchsorted(self.norad_ids, norad_id, side='left')
+        stop = np.searchsorted(self.norad_ids, norad_id, side='right')
+        if start == stop:
+            return None
+
+        epochs = self.epochs[start:stop]
+        i = np.searchsorted(epochs, jd)
+        # Pick the nearer of the two neighbours around jd
+        if i == len(epochs) or (i > 0 and jd - epochs[i - 1] < epochs[i] - jd):
+            i -= 1
+        row = self.rows[start + i]
+        return {
+            'name': self.lines[3 * row].strip(),
+            'line1': self.lines[3 * row + 1].strip(),
+            'line2': self.lines[3 * row + 2].strip(),
+            'epoch_jd': float(epochs[i]),
+        }
+
+
+class TLEHistory:
+    """Deduplicated, compressed history of element sets keyed by NORAD ID and epoch"""
+
+    def __init__(self, folder=HISTORY_FOLDER):
+        self.folder = folder
+        self._shards = {}
+        # Categories are downloaded in parallel and share shards (ISS and NOAA 15 are both in
+        # shard 25): loading, deduplication and gzip appends happen one thread at a time
+        self._lock = threading.RLock()
+
+        if not os.path.exists(folder):
+            os.makedirs(folder)
+
+    def _shard_path(self, shard_id):
+        return os.path.join(self.folder, f'{shard_id:05d}.tle.gz')
+
+    def _load_shard(self, shard_id):
+        if shard_id not in self._shards:
+            path = self._shard_path(shard_id)
+            lines = []
+            if os.path.exists(path):
+                # Shards are concatenated gzip members, gzip reads them as one stream
+                with gzip.open(path, 'rt') as f:
+                    lines = f.read().strip().split('\n')
+                lines = lines[:len(lines) // 3 * 3]
+            self._shards[shard_id] = _Shard(lines)
+        return self._shards[shard_id]
+
+    def add_tle_text(self, tle_data):
+        """Archive the element sets of a TLE file, return the number of new ones
+
+        Entries failing check_lines (bad format or checksum) are left out, so
+        one corrupt entry in a download does not stop the others from being archived.
+        """
+        lines = [line.strip() for line in tle_data.strip().split('\n')]
+        lines = lines[:len(lines) // 3 * 3]
+        records, flags = check_lines('\n'.join(lines))
+        rows = np.flatnonzero((flags & LINE_ERRORS) == 0)
+        if len(rows) == 0:
+            return 0
+        lines = [line for row in rows.tolist() for line in lines[3 * row:3 * row + 3]]
+        records = records[rows]
+
+        epochs = np.round(records['epoch_jd'] + records['epoch_fraction'], 8)
+        shard_ids = records['norad_id'] // SHARD_SIZE
+        with self._lock:
+            return self._add_records(lines, records, epochs, shard_ids)
+
+    def _add_records(self, lines, records, epochs, shard_ids):
+        added = 0
+        for shard_id in np.unique(shard_ids).tolist():
+            shard = self._load_shard(shard_id)
+            new_lines = []
+            for row in np.flatnonzero(shard_ids == shard_id).tolist():
+                key = (int(records['norad_id'][row]), float(epochs[row]))
+                if key in shard.keys:
+                    continue
+                shard.keys.add(key)
+                new_lines += lines[3 * row:3 * row + 3]
+
+            if new_lines:
+                # Append-only: each download adds one gzip member to the shard
+                with open(self._shard_path(shard_id), 'ab') as f:
+                    f.write(gzip.compress(('\n'.join(new_lines) + '\n').encode('utf-8')))
+                self._shards[shard_id] = _Shard(shard.lines + new_lines)
+                added += len(new_lines) // 3
+
+        return added
+
+    def closest(self, norad_id, jd):
+        """Element set of a satellite whose epoch is closest to a Julian date (UTC)"""
+        with self._lock:
+            shard = self._load_shard(int(norad_id) // SHARD_SIZE)
+        return shard.closest(int(norad_id), jd)
+
+    def epochs(self, norad_id):
+        """All archived epochs (Julian dates) for a satellite"""
+        with self._lock:
+            shard = self._load_shard(int(norad_id) // SHARD_SIZE)
+        start = np.searchsorted(shard.norad_ids, norad_id, side='left')
+        stop = np.searchsorted(shard.norad_ids, norad_id, side='right')
+        return shard.epochs[start:stop]
@@ -3,52 +3,103 @@
 Manages TLE (Two-Line Element) data downloads and parsing
 """
 
-import requests
 import os
+import threading
+import time
 from datetime import datetime
-from config import TLE_SOURCES, DATA_FOLDER
+import numpy as np
+from config import TLE_SOURCES, DATA_FOLDER, TLE_CACHE_HOURS, TLE_RECHECK_DAYS
+from catalog import TLECatalog, UnifiedCatalog, load_snapshot, save_flags, load_flags
+from tle_history import TLEHistory
+from tle_validation import (LINE_ERRORS, SGP4_CHECKS, check_lines, check_records, validate_tle_text,
+                            keep, summarize, print_report, now_jd)
+from instrumentation import instrumented, record_error
 
 class TLEManager:
-    def __init__(self):
-        self.tle_sources = TLE_SOURCES
-        self.satellites = {}
+    def __init__(self, clock=None):
+        self._init_state(clock)
         
         # Create data folder if it doesn't exist
         if not os.path.exists(DATA_FOLDER):
             os.makedirs(DATA_FOLDER)
+        
+        self.history = TLEHistory()
+    
+    def _init_state(self, clock):
+        self.tle_sources = TLE_SOURCES
+        self.satellites = {}
+        self.catalogs = {}
+        self.unified = None  # (catalogs it was merged from, UnifiedCatalog)
+        self.previous = {}  # Records of the download before the last one, per category
+        self.reports = {}   # Last validation report per category
+        self.clock = clock  # Epoch age checks refer to its time (system time without one)
+        # Downloads run in parallel (main.py, cli.py fetch); saving, parsing and archiving don't
+        self._lock = threading.RLock()
+    
+    @classmethod
+    def parser(cls, clock=None):
+        """Manager for parse_tle only: no data folder, no history archive"""
+        manager = cls.__new__(cls)
+        manager._init_state(clock)
+        return manager
     
+    def now_jd(self):
+        """Julian date (UTC) the validation checks refer to"""
+        return now_jd(self.clock)
+    
+    @instrumented('download_tles')
     def download_tles(self, category='active'):
         """Download TLEs from CelesTrak"""
         print(f"Downloading {category} satellites...")
         
         try:
+            import requests  # Deferred: only needed when actually downloading
+            
             url = self.tle_sources[category]
             response = requests.get(url, timeout=10)
             response.raise_for_status()
             
-            # Save to file
-            filename = os.path.join(DATA_FOLDER, f'{category}.tle')
-            with open(filename, 'w') as f:
-                f.write(response.text)
-            
-            # Parse and store
-            satellites = self.parse_tle(response.text)
-            self.satellites[category] = satellites
+            with self._lock:
+                # Keep the element sets being replaced, to detect mean motion jumps
+                previous = self._current_records(category)
+                if previous is not None:
+                    self.previous[category] = previous
+                
+                # Save to file
+                filename = os.path.join(DATA_FOLDER, f'{category}.tle')
+                with open(filename, 'w') as f:
+                    f.write(response.text)
+                
+                # Parse and store
+                satellites = self.parse_tle(response.text, category)
+                self.satellites[category] = satellites
+                self.catalogs.pop(category, None)
+                self._write_snapshot(category, self._checked_catalog(response.text))
+                
+                # Keep older element sets for propagation far from the latest epoch
+                archived = self.history.add_tle_text(response.text)
             
-            print(f"✓ Downloaded {len(satellites)} satellites")
+            print(f"✓ Downloaded {len(satellites)} satellites ({archived} new element sets archived)")
             return satellites
             
         except Exception as e:
+            record_error('download_tles', e)
             print(f"✗ Error downloading TLEs: {e}")
             return []
     
-    def parse_tle(self, tle_data):
-        """Parse TLE data into list of satellites"""
+    @instrumented('parse_tle')
+    def parse_tle(self, tle_data, category=None):
+        """Parse TLE data into list of satellites, without the ones failing validation"""
         lines = tle_data.strip().split('\n')
         satellites = []
         
+        jd = self.now_jd()
+        records, flags = validate_tle_text(tle_data, jd, self.previous.get(category))
+        kept = keep(flags)
+        self._report(category, records, flags, jd)
+        
         for i in range(0, len(lines), 3):
-            if i + 2 < len(lines):
+            if i + 2 < len(lines) and kept[i // 3]:
                 satellites.append({
                     'name': lines[i].strip(),
                     'line1': lines[i + 1].strip(),
@@ -57,16 +108,165 @@ class TLEManager:
         
         return satellites
     
+    def file_age_hours(self, category):
+        """Age of the local TLE file of a category, None if there is none"""
+        filename = os.path.join(DATA_FOLDER, f'{category}.tle')
+        if not os.path.exists(filename):
+            return None
+        return (time.time() - os.path.getmtime(filename)) / 3600
+    
+    def ensure_tles(self, category, max_age_hours=TLE_CACHE_HOURS):
+        """Download a category only if its local file is missing or too old
+        (without parsing a recent file); True if TLEs are available"""
+        age_hours = self.file_age_hours(category)
+        if age_hours is not None and age_hours < max_age_hours:
+            return True
+        self.download_tles(category)
+        return self.file_age_hours(category) is not None
+    
+    def get_tles(self, category, max_age_hours=TLE_CACHE_HOURS):
+        """Get TLEs from the local file if it is recent enough, download otherwise"""
+        filename = os.path.join(DATA_FOLDER, f'{category}.tle')
+        
+        age_hours = self.file_age_hours(category)
+        if age_hours is not None and age_hours < max_age_hours:
+            satellites = self.load_from_file(category)
+            self.satellites[category] = satellites
+            print(f"✓ Loaded {len(satellites)} {category} satellites from cache ({age_hours:.1f} h old)")
+            return satellites
+        
+        satellites = self.download_tles(category)
+        if not satellites and os.path.exists(filename):
+            # Offline: fall back to the stale file rather than nothing
+            satellites = self.load_from_file(category)
+            self.satellites[category] = satellites
+            print(f"✓ Using cached {category} TLEs ({len(satellites)} satellites)")
+        return satellites
+    
     def load_from_file(self, category):
         """Load TLEs from saved file"""
         filename = os.path.join(DATA_FOLDER, f'{category}.tle')
         
         if os.path.exists(filename):
+            with self._lock:
+                with open(filename, 'r') as f:
+                    tle_data = f.read()
+                return self.parse_tle(tle_data, category)
+        else:
+            return None
+    
+    def snapshot_path(self, category):
+        """Binary snapshot stored next to the text TLE file"""
+        return os.path.join(DATA_FOLDER, f'{category}.tlebin')
+    
+    def _write_snapshot(self, category, catalog):
+        try:
+            filename = os.path.join(DATA_FOLDER, f'{category}.tle')
+            catalog.save_snapshot(self.snapshot_path(category), filename)
+        except OSError as e:
+            print(f"✗ Error writing snapshot for {category}: {e}")
+    
+    def flags_path(self, category):
+        """Cached SGP4 checks of the snapshot records"""
+        return os.path.join(DATA_FOLDER, f'{category}.tleflags')
+    
+    def _write_flags(self, category, flags, jd):
+        try:
+            filename = os.path.join(DATA_FOLDER, f'{category}.tle')
+            save_flags(flags & SGP4_CHECKS, jd, self.flags_path(category), filename)
+        except OSError as e:
+            print(f"✗ Error writing validation cache for {category}: {e}")
+    
+    def _checked_catalog(self, tle_data):
+        """Catalog of the element sets with well-formed lines and valid checksums"""
+        records, flags = check_lines(tle_data)
+        return TLECatalog(records[(flags & LINE_ERRORS) == 0])
+    
+    def _current_records(self, category):
+        """Copy of the element sets currently stored for a category, or None"""
+        records = load_snapshot(self.snapshot_path(category))
+        if records is None:
+            filename = os.path.join(DATA_FOLDER, f'{category}.tle')
+            if not os.path.exists(filename):
+                return None
             with open(filename, 'r') as f:
-                tle_data = f.read()
-            return self.parse_tle(tle_data)
+                records = self._checked_catalog(f.read()).records
+        return np.array(records)
+    
+    def _report(self, category, records, flags, jd):
+        """Store the validation report of a category, print it when there are issues"""
+        report = summarize(records, flags, jd)
+        self.reports[category] = report
+        if report['dropped'] or any(report['counts'].values()):
+            print_report(report, f"{category or 'TLE'} checks")
+        return report
+    
+    def load_catalog(self, category):
+        """Load a category as a compact array-backed TLECatalog
+        
+        Uses the memory-mapped binary snapshot when it matches the text file,
+        otherwise parses the text once and writes a fresh snapshot. SGP4
+        checks are cached next to it (reused within TLE_RECHECK_DAYS).
+        Element sets failing tle_validation are dropped; catalog.flags holds
+        the flags of the kept ones (stale, mean motion jump).
+        """
+        if category in self.catalogs:
+            return self.catalogs[category]
+        
+        filename = os.path.join(DATA_FOLDER, f'{category}.tle')
+        if not os.path.exists(filename):
+            return None
+        
+        jd = self.now_jd()
+        previous = self.previous.get(category)
+        catalog = TLECatalog.from_snapshot(self.snapshot_path(category), filename)
+        if catalog is not None:
+            # Snapshots only hold well-formed element sets; epoch age and decay change with time.
+            # The SGP4 checks (one propagation per record) are reused from a load close in time
+            cached, checked_jd = load_flags(self.flags_path(category), filename, len(catalog))
+            if cached is not None and abs(jd - checked_jd) < TLE_RECHECK_DAYS:
+                flags = check_records(catalog.records, jd, previous, sgp4=cached)
+            else:
+                flags = check_records(catalog.records, jd, previous)
+                self._write_flags(category, flags, jd)
         else:
+            with open(filename, 'r') as f:
+                records, flags = validate_tle_text(f.read(), jd, previous)
+            catalog = TLECatalog(records)
+            well_formed = (flags & LINE_ERRORS) == 0
+            self._write_snapshot(category, catalog.subset(well_formed))
+            self._write_flags(category, flags[well_formed], jd)
+        
+        self._report(category, catalog.records, flags, jd)
+        kept = keep(flags)
+        if not kept.all():
+            catalog = catalog.subset(kept)
+            flags = flags[kept]
+        catalog.flags = flags
+        
+        self.catalogs[category] = catalog
+        return catalog
+    
+    def load_unified(self):
+        """Every category with local TLEs merged into one UnifiedCatalog
+        
+        Objects listed in several groups (ISS in stations and active...) keep
+        their newest element set; membership bits follow TLE_SOURCES order.
+        Rebuilt only when one of the category catalogs changed.
+        """
+        catalogs = {category: self.load_catalog(category) for category in self.tle_sources}
+        sources = tuple(catalogs.values())
+        if self.unified is not None and all(a is b for a, b in zip(self.unified[0], sources)):
+            return self.unified[1]
+        unified = UnifiedCatalog.merge(catalogs)
+        self.unified = (sources, unified)
+        return unified
+    
+    def category_view(self, category):
+        """Zero-copy view of one category in the unified catalog, or None without TLEs"""
+        if self.load_catalog(category) is None:
             return None
+        return self.load_unified().view(category)
     
     def get_satellite_by_name(self, name, category='active'):
         """Get specific satellite TLE by name"""
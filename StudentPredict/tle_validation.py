@@ -0,0 +1,202 @@
+# tle_validation.py
+"""
+Quality checks run on TLEs at ingest, over the whole catalog at once
+Malformed lines, wrong checksums, element sets SGP4 rejects (decayed orbits)
+and expired epochs are dropped before they reach the tracker. Stale epochs and
+mean motion jumps between two downloads (maneuvers, misidentified objects) are
+only flagged.
+"""
+
+import time
+import numpy as np
+from sgp4.api import SatrecArray
+from config import TLE_STALE_DAYS, TLE_EXPIRED_DAYS, TLE_MEAN_MOTION_JUMP
+from catalog import tle_line_arrays, records_from_arrays, satrec_from_record, TLE_DTYPE
+from propagation import DAY_S, EARTH_RADIUS_KM
+
+# Flag bits, combined per element set
+BAD_FORMAT = 1
+BAD_CHECKSUM = 2
+SGP4_ERROR = 4
+DECAYED = 8
+EXPIRED = 16
+STALE = 32
+MEAN_MOTION_JUMP = 64
+
+LINE_ERRORS = BAD_FORMAT | BAD_CHECKSUM
+SGP4_CHECKS = SGP4_ERROR | DECAYED  # The only checks needing a propagation
+DROP = LINE_ERRORS | SGP4_ERROR | DECAYED | EXPIRED
+
+ISSUES = [
+    (BAD_FORMAT, 'bad format'),
+    (BAD_CHECKSUM, 'bad checksum'),
+    (SGP4_ERROR, 'SGP4 error'),
+    (DECAYED, 'decayed'),
+    (EXPIRED, 'expired'),
+    (STALE, 'stale'),
+    (MEAN_MOTION_JUMP, 'mean motion jump'),
+]
+
+UNIX_EPOCH_JD = 2440587.5
+
+
+def now_jd(clock=None):
+    """Current Julian date (UTC): the clock's time (SimulationClock, FixedClock...)
+    or the system time without a clock"""
+    if clock is None:
+        return UNIX_EPOCH_JD + time.time() / DAY_S
+    return UNIX_EPOCH_JD + clock.now().utc_datetime().timestamp() / DAY_S
+
+
+def checksums_ok(chars):
+    """True where the last column of (N, 69) line characters is the modulo-10 checksum"""
+    codes = chars.view(np.uint8).astype(np.int64)
+    body = codes[:, :68]
+    digits = (body >= 48) & (body <= 57)
+    expected = (np.where(digits, body - 48, 0) + (body == 45)).sum(axis=1) % 10
+    return codes[:, 68] - 48 == expected
+
+
+def check_lines(tle_data):
+    """Parse TLE text, checking line structure and checksums
+
+    Returns (records, flags) with one entry per name + 2 lines group;
+    records of malformed entries are left zeroed.
+    """
+    names, chars1, chars2 = tle_line_arrays(tle_data)
+    count = len(names)
+    flags = np.zeros(count, dtype=np.uint8)
+    records = np.zeros(count, dtype=TLE_DTYPE)
+    if count == 0:
+        return records, flags
+
+    structure = ((chars1[:, 0] == b'1') & (chars2[:, 0] == b'2') &
+                 (chars1[:, 1] == b' ') & (chars2[:, 1] == b' ') &
+                 np.all(chars1[:, 2:7] == chars2[:, 2:7], axis=1))
+    flags[~structure] |= BAD_FORMAT
+    flags[~(checksums_ok(chars1) & checksums_ok(chars2))] |= BAD_CHECKSUM
+    records['name'] = names  # Kept even for bad entries, for the report
+
+    rows = np.flatnonzero(flags == 0)
+    try:
+        records[rows] = records_from_arrays([names[i] for i in rows], chars1[rows], chars2[rows])
+    except ValueError:
+        # Some field does not parse: find which entries, one by one
+        for i in rows.tolist():
+            try:
+                records[i] = records_from_arrays([names[i]], chars1[i:i + 1], chars2[i:i + 1])[0]
+            except ValueError:
+                flags[i] |= BAD_FORMAT
+    return records, flags
+
+
+def sgp4_flags(records, jd):
+    """SGP4_ERROR and DECAYED flags, from one vectorized SGP4 call at jd for the whole catalog"""
+    flags = np.zeros(len(records), dtype=np.uint8)
+    if len(records) == 0:
+        return flags
+    satrecs = [satrec_from_record(record) for record in records]
+    whole = np.floor(jd)
+    errors, r, v = SatrecArray(satrecs).sgp4(np.array([whole]), np.array([jd - whole]))
+    errors, r = errors[:, 0], r[:, 0]
+    radius = np.linalg.norm(r, axis=-1)
+    decayed = (errors == 6) | ((errors == 0) & (radius < EARTH_RADIUS_KM))
+    flags[decayed] |= DECAYED
+    flags[(errors != 0) & ~decayed] |= SGP4_ERROR
+    return flags
+
+
+def check_records(records, jd=None, previous=None, sgp4=None):
+    """Flags for parsed element sets: SGP4 errors, decay, epoch age, mean motion jumps
+
+    jd: Julian date (UTC) the checks refer to, now by default.
+    previous: records of the previous download, for mean motion jumps.
+    sgp4: SGP4 check flags computed earlier (cached with a snapshot), to skip the propagation.
+    """
+    if jd is None:
+        jd = now_jd()
+    flags = np.zeros(len(records), dtype=np.uint8)
+    if len(records) == 0:
+        return flags
+
+    age = jd - (records['epoch_jd'] + records['epoch_fraction'])
+    flags[age > TLE_STALE_DAYS] |= STALE
+    flags[age > TLE_EXPIRED_DAYS] |= EXPIRED
+    flags |= (sgp4 & SGP4_CHECKS) if sgp4 is not None else sgp4_flags(records, jd)
+
+    if previous is not None and len(previous):
+        flags[mean_motion_jumps(records, previous)] |= MEAN_MOTION_JUMP
+    return flags
+
+
+def mean_motion_jumps(records, previous, threshold=TLE_MEAN_MOTION_JUMP):
+    """True where the mean motion changed since the previous element set of the
+    same NORAD ID by more than drag (ndot) explains"""
+    order = np.argsort(previous['norad_id'], kind='stable')
+    ids = previous['norad_id'][order]
+    index = np.minimum(np.searchsorted(ids, records['norad_id']), len(ids) - 1)
+    found = ids[index] == records['norad_id']
+    before = previous[order[index]]
+
+    days = ((records['epoch_jd'] - before['epoch_jd']) +
+            (records['epoch_fraction'] - before['epoch_fraction']))
+    expected = 2 * before['ndot'] * days  # The ndot field holds half the derivative
+    change = records['mean_motion'] - before['mean_motion'] - expected
+    return found & (np.abs(change) > threshold)
+
+
+def validate_tle_text(tle_data, jd=None, previous=None):
+    """All checks on TLE text: returns (records, flags), one entry per element set"""
+    records, flags = check_lines(tle_data)
+    parsed = np.flatnonzero(flags == 0)
+    flags[parsed] |= check_records(records[parsed], jd, previous)
+    return records, flags
+
+
+def keep(flags):
+    """Boolean mask of the element sets to keep"""
+    return (flags & DROP) == 0
+
+
+def summarize(records, flags, jd=None):
+    """Report dict: total, kept, dropped, per-issue counts and names, epoch ages"""
+    if jd is None:
+        jd = now_jd()
+    kept = keep(flags)
+    names = records['name']
+    report = {
+        'total': len(flags),
+        'kept': int(kept.sum()),
+        'dropped': int((~kept).sum()),
+        'counts': {},
+        'names': {},
+    }
+    for bit, label in ISSUES:
+        hit = np.flatnonzero(flags & bit)
+        report['counts'][label] = len(hit)
+        report['names'][label] = [n.decode('utf-8', 'ignore') for n in names[hit].tolist()]
+
+    ages = jd - (records['epoch_jd'] + records['epoch_fraction'])[kept]
+    report['median_age_days'] = float(np.median(ages)) if len(ages) else None
+    report['oldest_age_days'] = float(ages.max()) if len(ages) else None
+    return report
+
+
+def print_report(report, label='TLEs', max_names=5):
+    """Print a report: one line, plus the affected entries when there are issues"""
+    issues = [(name, count) for name, count in report['counts'].items() if count]
+    if not issues:
+        print(f"✓ {label}: {report['total']} element sets passed the checks")
+        return
+
+    # Only flagged (stale, mean motion jump): everything was kept
+    marker = "✗" if report['dropped'] else "✓"
+    print(f"{marker} {label}: {report['kept']}/{report['total']} kept, {report['dropped']} dropped "
+          f"({', '.join(f'{count} {name}' for name, count in issues)})")
+    for name, count in issues:
+        shown = report['names'][name][:max_names]
+        more = f" (+{count - len(shown)})" if count > len(shown) else ''
+        print(f"   {name}: {', '.join(shown)}{more}")
+    if report['median_age_days'] is not None:
+        print(f"   Epoch age: median {report['median_age_days']:.1f} d, "
+              f"oldest kept {report['oldest_age_days']:.1f} d")
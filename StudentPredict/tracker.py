@@ -3,16 +3,22 @@
 Core satellite tracking functionality using Skyfield
 """
 
-from skyfield.api import load, EarthSatellite, wgs84
+from skyfield.api import EarthSatellite, wgs84
 from datetime import datetime, timedelta
 import numpy as np
-from config import OBSERVER_LAT, OBSERVER_LON, OBSERVER_ELEVATION
+from config import OBSERVER_LAT, OBSERVER_LON, OBSERVER_ELEVATION, HISTORY_EPOCH_THRESHOLD_DAYS
+from skyfield_data import get_timescale, get_ephemeris, MissingDataError, ChecksumError
+from instrumentation import instrumented, record_error
 
 class SatelliteTracker:
-    def __init__(self):
-        self.ts = load.timescale()
+    def __init__(self, clock=None):
+        self.ts = get_timescale()
         self.observer = wgs84.latlon(OBSERVER_LAT, OBSERVER_LON, OBSERVER_ELEVATION)
         self.satellites = {}
+        self.catalog = None
+        self.history = None
+        self._archived = {}
+        self.clock = clock  # Anything with now(): SimulationClock, FixedClock...
         
         print(f"Observer location: {OBSERVER_LAT}°N, {OBSERVER_LON}°E")
     
@@ -23,20 +29,80 @@ class SatelliteTracker:
             self.satellites[name] = sat
             return True
         except Exception as e:
+            record_error('add_satellite', e)
             print(f"Error adding satellite {name}: {e}")
             return False
     
+    def load_catalog(self, catalog):
+        """Track every satellite of a TLECatalog without building them all up front"""
+        catalog.ts = self.ts
+        self.catalog = catalog
+        print(f"✓ Catalog loaded: {len(catalog)} satellites")
+    
+    def get_satellite(self, sat_name):
+        """Get the EarthSatellite for a name, materialized (and kept) by the catalog if needed
+        
+        Catalog satellites are not copied into self.satellites, so loading a
+        newer catalog replaces them.
+        """
+        satellite = self.satellites.get(sat_name)
+        if satellite is None and self.catalog is not None:
+            satellite = self.catalog.get_satellite(sat_name)
+        return satellite
+    
+    def now(self):
+        """Current time: the simulation clock's if one is set, real time otherwise"""
+        if self.clock is not None:
+            return self.clock.now()
+        return self.ts.now()
+    
+    def use_history(self, history):
+        """Use a TLEHistory archive for times far from the latest epoch"""
+        self.history = history
+        self._archived = {}
+    
+    def satellite_for_time(self, sat_name, time):
+        """Get the element set to propagate at a given time
+        
+        This is the latest one, unless a history archive is set and has an
+        element set whose epoch is closer to the requested time.
+        """
+        satellite = self.get_satellite(sat_name)
+        if satellite is None or self.history is None:
+            return satellite
+        
+        model = satellite.model
+        latest_epoch = model.jdsatepoch + model.jdsatepochF
+        if abs(time.ut1 - latest_epoch) <= HISTORY_EPOCH_THRESHOLD_DAYS:
+            return satellite
+        
+        entry = self.history.closest(model.satnum, time.ut1)
+        if entry is None or abs(time.ut1 - entry['epoch_jd']) >= abs(time.ut1 - latest_epoch):
+            return satellite
+        
+        key = (model.satnum, entry['epoch_jd'])
+        if key not in self._archived:
+            self._archived[key] = EarthSatellite(entry['line1'], entry['line2'], sat_name, self.ts)
+        return self._archived[key]
+    
+    def satellite_names(self):
+        """Names of all tracked satellites (added one by one or from the catalog)"""
+        names = list(self.satellites.keys())
+        if self.catalog is not None:
+            names += [n for n in self.catalog.names if n not in self.satellites]
+        return names
+    
+    @instrumented('get_position')
     def get_position(self, sat_name, time=None):
         """Get satellite position at a given time"""
-        if sat_name not in self.satellites:
-            return None
-        
         if time is None:
-            time = self.ts.now()
+            time = self.now()
         
-        satellite = self.satellites[sat_name]
+        satellite = self.satellite_for_time(sat_name, time)
+        if satellite is None:
+            return None
         
-        # Get geocentric position
+        # Get geocentric position (computed once, reused below)
         geocentric = satellite.at(time)
         subpoint = wgs84.subpoint(geocentric)
         
@@ -45,8 +111,11 @@ class SatelliteTracker:
         topocentric = difference.at(time)
         alt, az, distance = topocentric.altaz()
         
-        # Check if in sunlight
-        sunlit = satellite.at(time).is_sunlit(load('de421.bsp'))
+        # Check if in sunlight (unknown without the ephemeris of the data bundle)
+        try:
+            sunlit = geocentric.is_sunlit(get_ephemeris())
+        except (MissingDataError, ChecksumError):
+            sunlit = None
         
         return {
             'time': time.utc_iso(),
@@ -58,12 +127,12 @@ class SatelliteTracker:
             'distance_km': distance.km,
             'is_visible': alt.degrees > 0,
             'sunlit': sunlit,
-            'velocity_km_s': satellite.at(time).velocity.km_per_s
+            'velocity_km_s': geocentric.velocity.km_per_s
         }
     
     def get_all_positions(self, time=None):
         """Get positions of all tracked satellites"""
         positions = {}
-        for sat_name in self.satellites.keys():
+        for sat_name in self.satellite_names():
             positions[sat_name] = self.get_position(sat_name, time)
         return positions
\ No newline at end of file
@@ -0,0 +1,136 @@
+# visibility.py
+"""
+Optical visibility of passes, for a whole pass table at once
+A satellite is visible when it is sunlit while the observer is in darkness.
+Every pass is sampled on one shared time grid: the Sun is computed once on
+that grid, and each satellite is propagated once over all its pass samples.
+"""
+
+import numpy as np
+from config import OBSERVER_LAT, OBSERVER_LON, OBSERVER_ELEVATION, SUN_ALTITUDE_DARK, VISIBILITY_STEP_S
+from propagation import DAY_S, EARTH_RADIUS_KM, propagate_itrs, observer_frame, look_angles
+from skyfield_data import get_ephemeris, MissingDataError, ChecksumError
+
+VISIBLE = 'visible'
+PARTLY_VISIBLE = 'partly visible'
+INVISIBLE = 'invisible'
+
+
+def sun_positions(t):
+    """Earth-fixed Sun positions (T, 3) in km
+
+    The full celestial -> terrestrial rotation (with nutation, which is slow
+    to evaluate) is computed at one instant only; other samples just add the
+    Earth rotation angle since then. Precession and nutation move the Sun
+    direction by well under an arcsecond over a week-long pass table.
+    """
+    from skyfield.framelib import itrs
+    eph = get_ephemeris()
+    sun = (eph['sun'] - eph['earth']).at(t).position.km.reshape(3, -1)
+
+    reference = t[len(sun[0]) // 2] if t.shape else t
+    x, y, z = itrs.rotation_at(reference) @ sun
+    theta = np.radians(np.atleast_1d(t.gmst - reference.gmst) * 15.0)
+    cos_t, sin_t = np.cos(theta), np.sin(theta)
+    return np.stack([cos_t * x + sin_t * y, -sin_t * x + cos_t * y, z], axis=-1)
+
+
+def sunlit(r_itrs, sun_itrs):
+    """True where the Earth does not block the Sun (spherical Earth, like Skyfield)
+
+    r_itrs (..., T, 3) satellite positions, sun_itrs (T, 3) Sun positions.
+    """
+    direction = sun_itrs / np.linalg.norm(sun_itrs, axis=-1, keepdims=True)
+    along = np.einsum('...i,...i', r_itrs, direction)
+    perpendicular = np.linalg.norm(r_itrs - along[..., None] * direction, axis=-1)
+    return (along > 0) | (perpendicular > EARTH_RADIUS_KM)
+
+
+def sun_altitude(sun_itrs, observer=(OBSERVER_LAT, OBSERVER_LON, OBSERVER_ELEVATION)):
+    """Sun elevation (deg) seen from the observer, shape (T,)"""
+    position, rotation = observer_frame(*observer)
+    az, el, distance = look_angles(sun_itrs, position[None], rotation[None])
+    return el[0]
+
+
+def pass_grid(passes_by_satellite, step_s):
+    """Shared grid of TT Julian dates covering every pass, and per-pass slices of it
+
+    The grid is aligned on `step_s` from the earliest rise, so passes of
+    different satellites that overlap in time share their samples.
+    """
+    spans = [(name, p, p['rise_time'].tt, p['set_time'].tt)
+             for name, passes in passes_by_satellite.items() for p in passes]
+    if not spans:
+        return np.empty(0), []
+    origin = min(rise for _, _, rise, _ in spans)
+    step = step_s / DAY_S
+
+    indices = []
+    for name, p, rise, set_ in spans:
+        first = int(np.ceil((rise - origin) / step - 1e-9))
+        last = int(np.floor((set_ - origin) / step + 1e-9))
+        indices.append(np.arange(first, max(last, first) + 1))
+    grid = np.unique(np.concatenate(indices))
+    samples = [(name, p, np.searchsorted(grid, i)) for (name, p, _, _), i in zip(spans, indices)]
+    return origin + grid * step, samples
+
+
+def label_passes(tracker, passes_by_satellite, step_seconds=VISIBILITY_STEP_S,
+                 observer=(OBSERVER_LAT, OBSERVER_LON, OBSERVER_ELEVATION),
+                 sun_altitude_dark=SUN_ALTITUDE_DARK):
+    """Label passes {sat_name: [pass, ...]} as visible / partly visible / invisible
+
+    Adds to each pass dict: 'visibility', 'visible_start' / 'visible_end'
+    (Skyfield Times, None when invisible), their '_str' versions and
+    'visible_seconds'. Returns passes_by_satellite.
+    """
+    jd, samples = pass_grid(passes_by_satellite, step_seconds)
+    if not samples:
+        return passes_by_satellite
+
+    ts = tracker.ts
+    t = ts.tt_jd(jd)
+    try:
+        sun = sun_positions(t)
+    except (MissingDataError, ChecksumError):
+        return passes_by_satellite  # No ephemeris in the data bundle: visibility unknown
+    dark = sun_altitude(sun, observer) <= sun_altitude_dark
+
+    by_satellite = {}
+    for name, p, index in samples:
+        by_satellite.setdefault(name, []).append((p, index))
+
+    for name, entries in by_satellite.items():
+        # One propagation over every sample of this satellite's passes
+        index = np.unique(np.concatenate([i for _, i in entries]))
+        middle = ts.tt_jd(jd[index[len(index) // 2]])
+        satellite = tracker.satellite_for_time(name, middle)
+        if satellite is None:
+            continue
+        r, v, errors = propagate_itrs([satellite.model], ts.tt_jd(jd[index]))
+        visible = np.zeros(len(jd), dtype=bool)
+        visible[index] = sunlit(r[0], sun[index]) & dark[index]
+
+        for p, i in entries:
+            _set_visibility(p, ts, jd[i], visible[i], step_seconds)
+
+    return passes_by_satellite
+
+
+def _set_visibility(p, ts, jd, visible, step_seconds):
+    seen = np.flatnonzero(visible)
+    if len(seen) == 0:
+        p.update({'visibility': INVISIBLE, 'visible_start': None, 'visible_end': None,
+                  'visible_start_str': None, 'visible_end_str': None, 'visible_seconds': 0})
+        return
+
+    start, end = ts.tt_jd(jd[seen[0]]), ts.tt_jd(jd[seen[-1]])
+    p.update({
+        'visibility': VISIBLE if len(seen) == len(visible) else PARTLY_VISIBLE,
+        'visible_start': start,
+        'visible_end': end,
+        'visible_start_str': start.utc_iso(),
+        'visible_end_str': end.utc_iso(),
+        'visible_seconds': len(seen) * step_seconds,
+    })